@@ -0,0 +1,75 @@
+"""
+*affapy* is a Python library for multiprecision Affine Arithmetic.
+
+The main classes can be imported from the package:
+
+.. code-block:: python
+
+    from affapy import Affine, Interval
+
+The modules are imported when they are used for the first time: importing
+the package does not import *mpmath*, and the submodules (for example
+``affapy.optimize``) are available as attributes of the package without
+importing them explicitly. Before Python 3.7, which does not support
+the attributes of modules computed at their first access (PEP 562), the
+exported names are imported with the package, and the submodules must be
+imported explicitly.
+
+"""
+import importlib
+import sys
+
+# Names exported by the package and their module
+_EXPORTS = {
+    "Affine": "affapy.aa",
+    "Interval": "affapy.ia",
+    "TaylorModel": "affapy.tm",
+    "Dual": "affapy.ad",
+    "affapyError": "affapy.error",
+    "affapyWarning": "affapy.error",
+    "affapyNoiseWarning": "affapy.error",
+}
+
+_SUBMODULES = (
+    "aa", "ia", "error", "precision", "parametrize", "box", "optimize",
+    "parallel", "storage", "stats", "monitor", "cache", "backend", "tm",
+    "ad", "statespace", "dataflow", "fixedpoint", "lazy",
+    "distributed", "stream", "aio", "mixed", "hybrid")
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    """
+    Import an exported name or a submodule at its first access.
+
+    Args:
+        name (str): name of the attribute
+
+    Returns:
+        class or module: the attribute
+
+    Raises:
+        AttributeError: no such attribute
+
+    """
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    if name in _SUBMODULES:
+        return importlib.import_module(__name__ + "." + name)
+    raise AttributeError("module {!r} has no attribute {!r}"
+                         .format(__name__, name))
+
+
+def __dir__() -> list:
+    """Return the exported names and the submodules."""
+    return sorted(set(globals()) | set(_EXPORTS) | set(_SUBMODULES))
+
+
+if sys.version_info < (3, 7):
+    for _name in _EXPORTS:
+        globals()[_name] = getattr(importlib.import_module(_EXPORTS[_name]),
+                                   _name)
+    del _name
@@ -60,11 +60,58 @@ Therefore, they are not equal.
 """
 import affapy.ia
 from affapy.error import affapyError
+from array import array
+import heapq
 import mpmath
 from mpmath import (
     mp, fdiv, fadd, fsub, fsum, fneg, fmul, fabs, sqrt, exp, log, sin)
 from mpmath.ctx_mp_python import _mpf as mpf
 
+# Types of the scalar operands: the numbers of the backend (see
+# affapy.backend) and of mpmath
+_SCALARS = (int, float, mpf, str)
+
+
+def _absSum(values) -> mpf:
+    """Return the sum of the absolute values, rounded upward."""
+    rad = mp.mpf(0)
+    for v in values:
+        rad = fadd(rad, fabs(v), rounding='u')
+    return rad
+
+
+def _readonly(values: array) -> memoryview:
+    """
+    Return a read-only view of an array: without copy from Python 3.8,
+    of a bytes copy before.
+    """
+    view = memoryview(values)
+    if hasattr(view, "toreadonly"):
+        return view.toreadonly()
+    return memoryview(values.tobytes()).cast(values.typecode)
+
+
+def _unpickleAffine(x0: tuple, ids: tuple, flat: tuple) -> "Affine":
+    """
+    Rebuild an affine form pickled by **Affine.__reduce__**.
+    The associated interval is computed again at the first access.
+
+    Args:
+        x0 (tuple): packed center
+        ids (tuple): sorted noise symbols
+        flat (tuple): packed coefficients of the noise symbols
+
+    Returns:
+        Affine: affine form
+
+    """
+    x = Affine.__new__(Affine)
+    x._x0 = affapy.ia._unpack(x0)[0]
+    x._xi = dict(zip(ids, affapy.ia._unpack(flat)))
+    x._rad = _absSum(x._xi.values())
+    x._interval = None
+    return x
+
 
 class Affine:
     """
@@ -75,7 +122,14 @@ class Affine:
     * **x0**: the center
     * **xi**: the dictionnary of noise symbols
 
+    The radius :math:`\\sum |x_i|` is maintained by the operations, so
+    the associated interval is computed in constant time.
+
+    The affine forms are immutable and hashable: they can be used as keys
+    of dictionaries and as elements of sets.
+
     """
+    __slots__ = ("_x0", "_xi", "_rad", "_interval", "_hash", "_buffers")
     _weightCount = 1
 
     def __init__(self, interval=None, x0=None, xi=None):
@@ -139,18 +193,19 @@ class Affine:
             else:
                 raise affapyError("interval must be list, tuple or Interval")
             self._x0 = (inf + sup) / 2
-            self._xi = {Affine._getNewXi(): fdiv(
-                fsub(inf, sup, rounding='u'), 2, rounding='u')}
+            xk = fdiv(fsub(inf, sup, rounding='u'), 2, rounding='u')
+            self._xi = {Affine._getNewXi(): xk}
+            self._rad = fabs(xk)
             self._interval = affapy.ia.Interval(inf, sup)
         elif x0 is not None and xi is not None:
             self._x0 = mp.mpf(x0)
             self._xi = {i: mp.mpf(xi[i], rounding='u') for i in xi}
-            self._interval = affapy.ia.Interval(
-                fadd(self._x0, self.rad()),
-                fsub(self._x0, self.rad()))
+            self._rad = _absSum(self._xi.values())
+            self._interval = None
         else:
             self._x0 = mp.mpf(0)
             self._xi = {}
+            self._rad = mp.mpf(0)
             self._interval = affapy.ia.Interval(0, 0)
 
     # Getter
@@ -166,27 +221,101 @@ class Affine:
 
     @property
     def interval(self) -> "affapy.ia.Interval":
-        """Return interval associated to the affine form."""
-        return self._interval.copy()
+        """
+        Return interval associated to the affine form.
+        It is computed at the first access.
+        """
+        if self._interval is None:
+            self._interval = affapy.ia.Interval(
+                fsub(self._x0, self._rad, rounding='f'),
+                fadd(self._x0, self._rad, rounding='c'))
+        return self._interval
 
     # Setter
     @x0.setter
-    def x0(self, val: "Affine | int | float | mpf | str"):
+    def x0(self, val):
         """
-        Set the center x0.
-        It updates the interval associated to the affine form.
+        The affine forms are immutable.
+
+        Raises:
+            affapyError: Affine is immutable
+
         """
-        self._x0 = mp.mpf(val)
-        self._interval = self.convert()
+        raise affapyError("Affine is immutable")
 
     @xi.setter
-    def xi(self, val: dict):
+    def xi(self, val):
         """
-        Set the dictionnary of noice symbols xi.
-        It updates the interval associated to the affine form.
+        The affine forms are immutable.
+
+        Raises:
+            affapyError: Affine is immutable
+
         """
-        self._xi = {i: mp.mpf(val[i], rounding='u') for i in val}
-        self._interval = self.convert()
+        raise affapyError("Affine is immutable")
+
+    @staticmethod
+    def _make(x0: mpf, xi: dict, rad: mpf) -> "Affine":
+        """
+        Create an affine form from its fields, without conversion.
+        The radius must be an upper bound of the sum of abs(xi).
+        """
+        x = Affine.__new__(Affine)
+        x._x0, x._xi, x._rad, x._interval = x0, xi, rad, None
+        return x
+
+    @staticmethod
+    def _merge(xi: dict, rad: mpf, other: dict, negate: bool) -> mpf:
+        """
+        Add the noise symbols of other (or subtract them if negate is
+        True) to the dictionary xi, whose radius is rad. The radius is
+        updated with the modified symbols only, unless a coefficient
+        shrinks: the rounding error of the former radius would then be
+        kept, so the radius is computed again from the coefficients.
+
+        Returns:
+            mpf: radius of the result
+
+        """
+        shrunk = False
+        for i, v in other.items():
+            if negate:
+                v = fneg(v, rounding='u')
+            u = xi.get(i)
+            if u is None:
+                xi[i] = v
+                rad = fadd(rad, fabs(v), rounding='u')
+                continue
+            w = fadd(u, v, rounding='u')
+            if fabs(w) < fabs(u):
+                shrunk = True
+            elif not shrunk:
+                rad = fadd(fsub(rad, fabs(u), rounding='u'), fabs(w),
+                           rounding='u')
+            if w != 0:
+                xi[i] = w
+            else:
+                del xi[i]
+        if shrunk:
+            return _absSum(xi.values())
+        return rad if xi else mp.mpf(0)
+
+    @staticmethod
+    def _linear(terms, const: mpf) -> "Affine":
+        """
+        Return the affine form const + sum(c * x) of the pairs (x, c) of
+        terms, in a single pass over the noise symbols.
+        """
+        x0, xi = const, {}
+        for x, c in terms:
+            x0 += c * x._x0
+            for i, v in x._xi.items():
+                v = fmul(c, v, rounding='u')
+                u = xi.get(i)
+                xi[i] = v if u is None else fadd(u, v, rounding='u')
+        if 0 in xi.values():
+            xi = {i: v for i, v in xi.items() if v != 0}
+        return Affine._make(x0, xi, _absSum(xi.values()))
 
     @staticmethod
     def _getNewXi() -> int:
@@ -201,6 +330,9 @@ class Affine:
         .. math ::
             rad(x) = \\sum_{i=1}^{n} |x_i|
 
+        The radius is maintained by the operations, rounded upward, so it
+        is returned in constant time.
+
         Args:
             self (Affine): operand
 
@@ -213,7 +345,44 @@ class Affine:
             mpf('1.0')
 
         """
-        return fsum(self.xi.values(), absolute=True)
+        return self._rad
+
+    def condense(self, n: int) -> "Affine":
+        """
+        Return an affine form with at most n noise symbols: the n - 1
+        noise symbols with the largest coefficients are kept, and the
+        others are replaced by a new noise symbol whose coefficient is the
+        sum of the absolute values of their coefficients.
+
+        The associated interval is kept, but the dependencies on the
+        replaced noise symbols are lost.
+
+        Args:
+            self (Affine): operand
+            n (int): maximal number of noise symbols
+
+        Returns:
+            Affine: condensed affine form (self if it has at most n noise
+            symbols)
+
+        Raises:
+            affapyError: n must be positive
+
+        Examples:
+            >>> x = Affine(x0=1, xi={1: 3, 2: -1, 3: 0.5})
+            >>> x.condense(2).interval == x.interval
+            True
+
+        """
+        if n < 1:
+            raise affapyError("n must be positive")
+        if len(self._xi) <= n:
+            return self
+        xi = dict(heapq.nlargest(n - 1, self._xi.items(),
+                                 key=lambda item: abs(item[1])))
+        delta = _absSum(v for i, v in self._xi.items() if i not in xi)
+        xi[Affine._getNewXi()] = delta
+        return Affine._make(self._x0, xi, _absSum(xi.values()))
 
     # Unary operator
     def __neg__(self) -> "Affine":
@@ -236,9 +405,8 @@ class Affine:
             -1.5 + 0.5e1
 
         """
-        x0 = -self.x0
-        xi = {i: fneg(self.xi[i], rounding='u') for i in self.xi}
-        return Affine(x0=x0, xi=xi)
+        xi = {i: fneg(v, rounding='u') for i, v in self._xi.items()}
+        return Affine._make(-self._x0, xi, self._rad)
 
     # Affine operations
     def __add__(self, other: "Affine | int | float | mpf | str") -> "Affine":
@@ -274,24 +442,17 @@ class Affine:
             4.5 + -0.5e1
 
         """
-        if isinstance(other, self.__class__):
-            x0 = self.x0 + other.x0
-            xi = {}
-            for i in self.xi:
-                if i in other.xi:
-                    val = fadd(self.xi[i], other.xi[i], rounding='u')
-                    if val != 0:
-                        xi[i] = val
-                else:
-                    xi[i] = self.xi[i]
-            for i in other.xi:
-                if i not in self.xi:
-                    xi[i] = other.xi[i]
-            return Affine(x0=x0, xi=xi)
-        if isinstance(other, (int, float, mpmath.mpf, str)):
-            x0 = self.x0 + mp.mpf(other)
-            xi = self.xi.copy()
-            return Affine(x0=x0, xi=xi)
+        if isinstance(other, Affine):
+            x0 = self._x0 + other._x0
+            # Only the noise symbols of the smallest form are visited
+            if len(self._xi) < len(other._xi):
+                self, other = other, self
+            xi = self._xi.copy()
+            rad = Affine._merge(xi, self._rad, other._xi, False)
+            return Affine._make(x0, xi, rad)
+        if isinstance(other, _SCALARS):
+            x0 = self._x0 + mp.mpf(other)
+            return Affine._make(x0, self._xi.copy(), self._rad)
         raise affapyError("other must be Affine, int, float, mpf")
 
     def __radd__(self, other: "Affine | int | float | mpf | str") -> "Affine":
@@ -351,24 +512,16 @@ class Affine:
             -1.5 + -0.5e6
 
         """
-        if isinstance(other, self.__class__):
-            x0 = self.x0 - other.x0
-            xi = {}
-            for i in self.xi:
-                if i in other.xi:
-                    val = fsub(self.xi[i], other.xi[i], rounding='u')
-                    if val != 0:
-                        xi[i] = val
-                else:
-                    xi[i] = self.xi[i]
-            for i in other.xi:
-                if i not in self.xi:
-                    xi[i] = fneg(other.xi[i], rounding='u')
-            return Affine(x0=x0, xi=xi)
-        if isinstance(other, (int, float, mpf, str)):
-            x0 = self.x0 - mp.mpf(other)
-            xi = self.xi.copy()
-            return Affine(x0=x0, xi=xi)
+        if isinstance(other, Affine):
+            if len(self._xi) < len(other._xi):
+                return -other + self
+            x0 = self._x0 - other._x0
+            xi = self._xi.copy()
+            rad = Affine._merge(xi, self._rad, other._xi, True)
+            return Affine._make(x0, xi, rad)
+        if isinstance(other, _SCALARS):
+            x0 = self._x0 - mp.mpf(other)
+            return Affine._make(x0, self._xi.copy(), self._rad)
         raise affapyError("other must be Affine, int, float, mpf")
 
     def __rsub__(self, other: "Affine | int | float | mpf | str") -> "Affine":
@@ -429,31 +582,30 @@ class Affine:
             5.25 + -1.75e2 + -0.75e3 + 0.25e4
 
         """
-        if isinstance(other, self.__class__):
-            x0 = self.x0 * other.x0
-            xi = {}
-            keyMax = max(max(self.xi) if self.xi else 0,
-                         max(other.xi) if other.xi else 0)
-            for i in range(keyMax + 1):
-                v = 0
-                if i in self.xi and i not in other.xi:
-                    v = fmul(self.xi[i], other.x0, rounding='u')
-                elif i not in self.xi and i in other.xi:
-                    v = fmul(other.xi[i], self.x0, rounding='u')
-                elif i in self.xi and i in other.xi:
-                    v = fadd(fmul(self.xi[i], other.x0, rounding='u'),
-                             fmul(other.xi[i], self.x0, rounding='u'),
-                             rounding='u')
+        if isinstance(other, Affine):
+            x0, y0 = self._x0, other._x0
+            sxi, oxi = self._xi, other._xi
+            xi, rad = {}, mp.mpf(0)
+            for i, v in sxi.items():
+                v = fmul(v, y0, rounding='u')
+                if i in oxi:
+                    v = fadd(v, fmul(oxi[i], x0, rounding='u'), rounding='u')
                 if v != 0:
                     xi[i] = v
-            xi[Affine._getNewXi()] = fmul(self.rad(),
-                                          other.rad(), rounding='u')
-            return Affine(x0=x0, xi=xi)
-        if isinstance(other, (int, float, mpf, str)):
-            x0 = mp.mpf(other) * self.x0
-            xi = {i: fmul(mp.mpf(other),
-                          self.xi[i], rounding='u') for i in self.xi}
-            return Affine(x0=x0, xi=xi)
+                    rad = fadd(rad, fabs(v), rounding='u')
+            for i, v in oxi.items():
+                if i not in sxi:
+                    v = fmul(v, x0, rounding='u')
+                    if v != 0:
+                        xi[i] = v
+                        rad = fadd(rad, fabs(v), rounding='u')
+            delta = fmul(self._rad, other._rad, rounding='u')
+            xi[Affine._getNewXi()] = delta
+            rad = fadd(rad, delta, rounding='u')
+            return Affine._make(x0 * y0, xi, rad)
+        if isinstance(other, _SCALARS):
+            y0 = mp.mpf(other)
+            return self._scale(y0 * self._x0, y0, None)
         raise affapyError("other must be Affine, int, float, mpf")
 
     def __rmul__(self, other: "Affine | int | float | mpf | str") -> "Affine":
@@ -500,10 +652,23 @@ class Affine:
             Affine: construction of an affine form
 
         """
-        x0 = alpha * self.x0 + dzeta
-        xi = {i: fmul(alpha, self.xi[i], rounding='u') for i in self.xi}
-        xi[Affine._getNewXi()] = delta
-        return Affine(x0=x0, xi=xi)
+        return self._scale(alpha * self._x0 + dzeta, alpha, delta)
+
+    def _scale(self, x0: mpf, alpha: mpf, delta: mpf) -> "Affine":
+        """
+        Return the affine form of center x0, with the noise symbols of
+        self multiplied by alpha, and a new noise symbol with the
+        coefficient delta unless delta is None.
+        """
+        xi, rad = {}, mp.mpf(0)
+        for i, v in self._xi.items():
+            v = fmul(alpha, v, rounding='u')
+            xi[i] = v
+            rad = fadd(rad, fabs(v), rounding='u')
+        if delta is not None:
+            xi[Affine._getNewXi()] = delta
+            rad = fadd(rad, fabs(delta), rounding='u')
+        return Affine._make(x0, xi, rad)
 
     def inv(self) -> "Affine":
         """
@@ -544,17 +709,22 @@ class Affine:
 
         """
         if 0 not in self.interval:
-            inf, sup = self.interval.inf, self.interval.sup
-            a, b = min(fabs(inf), fabs(sup)), max(fabs(inf), fabs(sup))
-            alpha = -1 / b**2
-            i = affapy.ia.Interval(1/a - alpha*a, 2/b)
-            dzeta = i.mid()
-            if inf < 0:
-                dzeta = -dzeta
-            delta = i.radius()
-            return self._affineConstructor(alpha, dzeta, delta)
+            return self._affineConstructor(
+                *Affine._invTriple(self.interval.inf, self.interval.sup))
         return Affine(x0=mp.nan, xi={})
 
+    @staticmethod
+    def _invTriple(inf: mpf, sup: mpf) -> tuple:
+        """Return (alpha, dzeta, delta) of inv on [inf, sup]."""
+        a, b = min(fabs(inf), fabs(sup)), max(fabs(inf), fabs(sup))
+        alpha = -1 / b**2
+        i = affapy.ia.Interval(1/a - alpha*a, 2/b)
+        dzeta = i.mid()
+        if inf < 0:
+            dzeta = -dzeta
+        delta = i.radius()
+        return alpha, dzeta, delta
+
     def __truediv__(self, other: "Affine | int | float | mpf | str") -> "Affine":
         """
         **Operator /**
@@ -581,10 +751,10 @@ class Affine:
             0.0156249999999999e13 + 0.0208333333333333e14
 
         """
-        if isinstance(other, self.__class__):
+        if isinstance(other, Affine):
             return self * other.inv()
-        if isinstance(other, (int, float, mpf, str)):
-            return self * (1 / mpmath.mpf(other))
+        if isinstance(other, _SCALARS):
+            return self * (1 / mp.mpf(other))
         raise affapyError("other must be Affine, int, float, mpf")
 
     def __rtruediv__(self, other: "Affine | int | float | mpf | str") -> "Affine":
@@ -609,8 +779,8 @@ class Affine:
             1.5 + 0.25e15 + 0.25e16
 
         """
-        if (isinstance(other, self.__class__) or
-                isinstance(other, (int, float, mpmath.mpf, str))):
+        if (isinstance(other, Affine) or
+                isinstance(other, _SCALARS)):
             return other * self.inv()
         raise affapyError("other must be Affine, int, float, mpf")
 
@@ -674,7 +844,7 @@ class Affine:
                     x = x * x
                     n = (n - 1) / 2
             return x * y
-        elif isinstance(n, self.__class__):
+        elif isinstance(n, Affine):
             return (n * self.log()).exp()
         raise affapyError("type error: n must be Affine or int")
 
@@ -716,9 +886,7 @@ class Affine:
         if self.strictly_neg():
             return -self
         if self.straddles_zero():
-            x0 = fabs(self.x0 / 2)
-            xi = {i: fdiv(self.xi[i], 2, rounding='u') for i in self.xi}
-            return Affine(x0=x0, xi=xi)
+            return self._scale(fabs(self._x0 / 2), 0.5, None)
         return self.copy()
 
     def sqrt(self) -> "Affine":
@@ -753,16 +921,21 @@ class Affine:
 
         """
         if self.interval >= 0:
-            a, b = self.interval.inf, self.interval.sup
-            t = fadd(sqrt(a), sqrt(b), rounding='f')
-            alpha = 1 / t
-            dzeta = fadd(fdiv(t, 8), fmul(0.5, fdiv(sqrt(fmul(a, b)), t)))
-            rdelta = fsub(sqrt(b), sqrt(a), rounding='u')
-            delta = fdiv(fmul(rdelta, rdelta, rounding='u'),
-                         fmul(8, t, rounding='f'), rounding='u')
-            return self._affineConstructor(alpha, dzeta, delta)
+            return self._affineConstructor(
+                *Affine._sqrtTriple(self.interval.inf, self.interval.sup))
         return Affine(x0=mp.nan, xi={})
 
+    @staticmethod
+    def _sqrtTriple(a: mpf, b: mpf) -> tuple:
+        """Return (alpha, dzeta, delta) of sqrt on [a, b]."""
+        t = fadd(sqrt(a), sqrt(b), rounding='f')
+        alpha = 1 / t
+        dzeta = fadd(fdiv(t, 8), fmul(0.5, fdiv(sqrt(fmul(a, b)), t)))
+        rdelta = fsub(sqrt(b), sqrt(a), rounding='u')
+        delta = fdiv(fmul(rdelta, rdelta, rounding='u'),
+                     fmul(8, t, rounding='f'), rounding='u')
+        return alpha, dzeta, delta
+
 
     def exp(self) -> "Affine":
         """
@@ -792,14 +965,21 @@ class Affine:
             4.47775520281461 + -2.3353871352358e29 + 4.95873115091173e30
 
         """
-        a, b = self.interval.inf, self.interval.sup
+        return self._affineConstructor(
+            *Affine._expTriple(self.interval.inf, self.interval.sup))
+
+    @staticmethod
+    def _expTriple(a: mpf, b: mpf) -> tuple:
+        """Return (alpha, dzeta, delta) of exp on [a, b]."""
         ea, eb = exp(a), exp(b)
+        if a == b:
+            return 0, ea, 0
         alpha = fdiv(fsub(eb, ea), fsub(b, a))
         xs = log(alpha)
         maxdelta = fadd(fmul(alpha, fsub(xs, fsub(1, a))), ea)
         dzeta = fmul(alpha, fsub(1, xs))
         delta = fdiv(maxdelta, 2)
-        return self._affineConstructor(alpha, dzeta, delta)
+        return alpha, dzeta, delta
 
     def log(self) -> "Affine":
         """
@@ -813,7 +993,7 @@ class Affine:
             \\alpha = \\frac{log(b) - log(a)}{b - a}
 
         .. math ::
-            \\zeta = \\frac{-\\alpha x_s}{\\frac{log(x_s) + y_s}{2}}
+            \\zeta = \\frac{log(x_s) + y_s}{2} - \\alpha x_s
 
         .. math ::
             \\delta = \\frac{log(x_s) - y_s}{2}
@@ -835,21 +1015,28 @@ class Affine:
 
         Examples:
             >>> print(Affine([1, 2]).log())
-            -1.93043330907435 + -0.346573590279973e31 + 0.0298300505708048e32
+            0.376403640850777 + -0.346573590279973e31 + 0.0298300505708048e32
 
         """
         if self.interval > 0:
-            a, b = self.interval.inf, self.interval.sup
-            la, lb = log(a), log(b)
-            alpha = fdiv(fsub(lb, la), fsub(b, a))
-            xs = fdiv(1, alpha)
-            ys = fadd(fmul(alpha, fsub(xs, a)), la)
-            maxdelta = fsub(log(xs), ys)
-            dzeta = fdiv(fmul(alpha, fneg(xs)), fdiv(fadd(log(xs), ys), 2))
-            delta = fdiv(maxdelta, 2)
-            return self._affineConstructor(alpha, dzeta, delta)
+            return self._affineConstructor(
+                *Affine._logTriple(self.interval.inf, self.interval.sup))
         return Affine(x0=mp.nan, xi={})
 
+    @staticmethod
+    def _logTriple(a: mpf, b: mpf) -> tuple:
+        """Return (alpha, dzeta, delta) of log on [a, b]."""
+        la, lb = log(a), log(b)
+        if a == b:
+            return 0, la, 0
+        alpha = fdiv(fsub(lb, la), fsub(b, a))
+        xs = fdiv(1, alpha)
+        ys = fadd(fmul(alpha, fsub(xs, a)), la)
+        maxdelta = fsub(log(xs), ys)
+        dzeta = fsub(fdiv(fadd(log(xs), ys), 2), fmul(alpha, xs))
+        delta = fdiv(maxdelta, 2)
+        return alpha, dzeta, delta
+
 
     # Trigo
     def sin(self, npts: int = 8) -> "Affine":
@@ -874,10 +1061,17 @@ class Affine:
 
 
         """
-        w = self.interval.width()
-        a, b = self.interval.inf, self.interval.sup
-        if w >= 2 * mp.pi:
+        if self.interval.width() >= 2 * mp.pi:
             return Affine(interval=[-1, 1])
+        return self._affineConstructor(
+            *Affine._sinTriple(self.interval.inf, self.interval.sup, npts))
+
+    @staticmethod
+    def _sinTriple(a: mpf, b: mpf, npts: int) -> tuple:
+        """Return (alpha, dzeta, delta) of sin on [a, b] with npts points."""
+        w = fsub(b, a, rounding='c')
+        if w == 0:
+            return 0, sin(a), 0
         # Case of the least squares
         x, y = [a], [sin(a)]
         pas = w / (npts - 1)
@@ -901,7 +1095,7 @@ class Affine:
         r = [fabs(yi - (dzeta + alpha * xi)) for xi, yi in zip(x, y)]
         # The error delta is the maximum of the residues (in absolute values)
         delta = max(r)
-        return self._affineConstructor(alpha, dzeta, delta)
+        return alpha, dzeta, delta
 
     def cos(self) -> "Affine":
         """
@@ -1029,15 +1223,21 @@ class Affine:
             other (Affine): second operand
 
         Returns:
-            bool: self == other
-
-        Raises:
-            affapyError: other must be Affine
-
-        """
-        if isinstance(other, self.__class__):
-            return self.x0 == other.x0 and self.xi == other.xi
-        raise affapyError("other must be Affine")
+            bool: self == other (NotImplemented if other is not Affine)
+
+        """
+        if isinstance(other, Affine):
+            if self is other:
+                return True
+            if self._x0 != other._x0 or len(self._xi) != len(other._xi):
+                return False
+            try:
+                if self._hash != other._hash:
+                    return False
+            except AttributeError:
+                pass
+            return self._xi == other._xi
+        return NotImplemented
 
     def __ne__(self, other: "Affine") -> bool:
         """
@@ -1050,15 +1250,31 @@ class Affine:
             other (Affine): second operand
 
         Returns:
-            bool: self != other
+            bool: self != other (NotImplemented if other is not Affine)
 
-        Raises:
-            affapyError: other must be Affine
+        """
+        eq = self.__eq__(other)
+        return eq if eq is NotImplemented else not eq
 
+    def __hash__(self) -> int:
         """
-        if isinstance(other, self.__class__):
-            return self.x0 != other.x0 or self.xi != other.xi
-        raise affapyError("other must be Affine")
+        **Hash**
+
+        Return the hash of the center and the noise symbols. It is
+        computed at the first call.
+
+        Args:
+            self (Affine): arg
+
+        Returns:
+            int: hash
+
+        """
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash = hash((self._x0, frozenset(self._xi.items())))
+            return self._hash
 
     # Inclusion
     def __contains__(self, other: "Affine") -> bool:
@@ -1078,11 +1294,11 @@ class Affine:
             affapyError: other must be Affine, Interval, int, float, mpf
 
         """
-        if isinstance(other, self.__class__):
+        if isinstance(other, Affine):
             return other.interval in self.interval
         if isinstance(other, affapy.ia.Interval):
             return other in self.interval
-        if isinstance(other, (int, float, mpmath.mpf, str)):
+        if isinstance(other, _SCALARS):
             return other in self.interval
         raise affapyError("other must be Affine, Interval, int, float, mpf")
 
@@ -1131,8 +1347,8 @@ class Affine:
 
         """
         return " + ".join(
-            [str(self.x0)] +
-            ["".join([str(self.xi[i]), "e", str(i)]) for i in self.xi])
+            [str(self._x0)] +
+            ["".join([str(v), "e", str(i)]) for i, v in self._xi.items()])
 
     def __repr__(self) -> str:
         """
@@ -1149,18 +1365,38 @@ class Affine:
         """
         return "Affine({}, {})".format(self.x0, self.xi)
 
+    def __reduce__(self) -> tuple:
+        """
+        **Pickle format**
+
+        Pickle an affine form as a flat layout: the center, the sorted
+        noise symbols and the raw mantissas and exponents of their
+        coefficients. The associated interval is not pickled.
+
+        Args:
+            self (Affine): arg
+
+        Returns:
+            tuple: function rebuilding the affine form and its arguments
+
+        """
+        ids = tuple(sorted(self._xi))
+        return _unpickleAffine, (affapy.ia._pack((self._x0,)), ids,
+                                 affapy.ia._pack(self._xi[i] for i in ids))
+
     def copy(self) -> "Affine":
         """
-        Copy an affine form.
+        Copy an affine form. The affine forms are immutable, so it
+        returns the affine form itself.
 
         Args:
             self (Affine): arg
 
         Returns:
-            Affine: self copy
+            Affine: self
 
         """
-        return Affine(x0=self.x0, xi=self.xi.copy())
+        return self
 
     def convert(self) -> "affapy.ia.Interval":
         """
@@ -1181,7 +1417,38 @@ class Affine:
             Interval: interval associated to the affine form
 
         """
-        return self.interval.copy()
+        return self.interval
+
+    def xi_buffers(self) -> tuple:
+        """
+        Return the noise symbols and their coefficients as two read-only
+        buffers, in the order of xi: the noise symbols as int64 and the
+        coefficients rounded to float64 away from zero, so that the
+        magnitudes of the noise symbols are not reduced.
+
+        The buffers are computed at the first call: the next calls share
+        them without copy. They support the buffer protocol, for example:
+
+        .. code-block:: python
+
+            ids, coefs = x.xi_buffers()
+            numpy.frombuffer(coefs)
+
+        Args:
+            self (Affine): arg
+
+        Returns:
+            tuple: (memoryview of int64, memoryview of float64)
+
+        """
+        try:
+            ids, coefs = self._buffers
+        except AttributeError:
+            from affapy.backend import _away
+            ids = _readonly(array("q", self._xi))
+            coefs = _readonly(array("d", map(_away, self._xi.values())))
+            self._buffers = ids, coefs
+        return ids, coefs
 
     # Getter
     @property
@@ -0,0 +1,737 @@
+"""
+This module can compute derivative enclosures with forward-mode automatic
+differentiation, and use them to bound functions over boxes.
+
+A dual number carries a value and the gradient of this value with respect
+to the inputs. The value and the partial derivatives are intervals or
+affine forms: evaluating a function with dual numbers over a box gives in
+one pass an enclosure of the function and enclosures of its partial
+derivatives over the box.
+
+With the derivative enclosures :math:`g_i \\supseteq \\partial f /
+\\partial x_i(X)`, the mean value theorem gives the mean value form:
+
+.. math ::
+    f(X) \\subseteq f(m) + \\sum_{i} g_i (X_i - m_i)
+
+where :math:`m` is the center of the box :math:`X`. Its overestimation
+decreases quadratically with the width of the box, where the natural
+evaluation decreases linearly.
+
+The derivative enclosures also prove monotonicity: if
+:math:`g_i \\geq 0`, the minimum of the function is reached with
+:math:`x_i = inf(X_i)` and its maximum with :math:`x_i = sup(X_i)`, so
+the variable can be replaced by the endpoints of its interval.
+
+**Example**:
+
+.. code-block:: python
+
+    from affapy import ad
+
+    def f(x):
+        return x.exp() - 2 * x
+
+    ad.gradient(f, [[1, 2]])
+    ad.mean_value(f, [[1, 2]])
+    ad.enclosure(f, [[1, 2]])
+
+"""
+from affapy.error import affapyError
+from affapy.ia import Interval
+from affapy.aa import Affine
+from mpmath.ctx_mp_python import _mpf as mpf
+import affapy.box
+import affapy.ia
+
+
+def _pairs(d1: tuple, d2: tuple):
+    """Return the pairs of partial derivatives, the missing ones are 0."""
+    n = max(len(d1), len(d2))
+    d1 = d1 + (0,) * (n - len(d1))
+    d2 = d2 + (0,) * (n - len(d2))
+    return zip(d1, d2)
+
+
+def _sqr(x):
+    """Return the square of an interval or an affine form."""
+    if isinstance(x, Affine):
+        return x.sqr()
+    if isinstance(x, Interval):
+        x = abs(x)
+    return x * x
+
+
+def _symmetric(x, like):
+    """
+    Return the symmetric enclosure [-|x|, |x|] of a value, with the type
+    of like (Interval or Affine).
+    """
+    s = abs(affapy.box.bounds(x)).sup
+    if isinstance(like, Affine):
+        return Affine([-s, s])
+    return Interval(-s, s)
+
+
+def _intersect(x: Interval, y: Interval) -> Interval:
+    """Return the intersection of two intervals which intersect."""
+    return Interval(max(x.inf, y.inf), min(x.sup, y.sup))
+
+
+class Dual:
+    """
+    Representation of a dual number, i.e. a value and its gradient.
+
+    An instance of the class **Dual** is composed of two fields:
+
+    * **val**: the value, an interval or an affine form (or a number for
+      the constants)
+    * **der**: the gradient, a tuple of partial derivatives (intervals or
+      affine forms); the missing partial derivatives are 0
+
+    """
+
+    def __init__(self, val, der=()):
+        """
+        Create a dual number.
+
+        Args:
+            val (Interval or Affine or int or float or mpf): value
+            der (tuple or Interval or Affine or int or float or mpf):
+                gradient, or derivative for one input (default: constant)
+
+        Returns:
+            Dual: dual number
+
+        Raises:
+            affapyError: val must be Interval, Affine, int, float, mpf
+
+        Examples:
+            >>> from affapy.ad import Dual
+            >>> from affapy.ia import Interval
+            >>> x = Dual(Interval(1, 2), 1)
+            >>> print(x * x)
+            ([1.0, 4.0], ([2.0, 4.0],))
+
+        """
+        if not isinstance(val, (Interval, Affine, int, float, mpf,
+                                affapy.ia.mpf)):
+            raise affapyError("val must be Interval, Affine, int, float, mpf")
+        if not isinstance(der, tuple):
+            der = (der,)
+        self._val = val
+        self._der = der
+
+    # Getter
+    @property
+    def val(self):
+        """Return the value."""
+        return self._val
+
+    @property
+    def der(self) -> tuple:
+        """Return the gradient."""
+        return self._der
+
+    def _chain(self, val, factor) -> "Dual":
+        """Return the dual number val with the gradient factor * der."""
+        return Dual(val, tuple(factor * d for d in self._der))
+
+    @staticmethod
+    def _constant(other) -> "Dual":
+        """
+        Convert an operand into a dual number.
+
+        Raises:
+            affapyError: other must be Dual, Interval, Affine, int, float,
+                mpf
+
+        """
+        if isinstance(other, Dual):
+            return other
+        if isinstance(other, (Interval, Affine, int, float, mpf,
+                              affapy.ia.mpf)):
+            return Dual(other)
+        raise affapyError(
+            "other must be Dual, Interval, Affine, int, float, mpf")
+
+    # Arithmetic operators
+    def __neg__(self) -> "Dual":
+        """
+        **Operator -** (unary)
+
+        Args:
+            self (Dual): operand
+
+        Returns:
+            Dual: -self
+
+        """
+        return Dual(-self._val, tuple(-d for d in self._der))
+
+    def __add__(self, other) -> "Dual":
+        """
+        **Operator +**
+
+        Args:
+            self (Dual): first operand
+            other (Dual or Interval or Affine or int or float or mpf):
+                second operand
+
+        Returns:
+            Dual: self + other
+
+        Raises:
+            affapyError: other must be Dual, Interval, Affine, int, float,
+                mpf
+
+        """
+        other = Dual._constant(other)
+        return Dual(self._val + other._val,
+                    tuple(a + b for a, b in _pairs(self._der, other._der)))
+
+    def __radd__(self, other) -> "Dual":
+        """
+        **Operator +** (reflected)
+
+        Args:
+            self (Dual): second operand
+            other (Interval or Affine or int or float or mpf): first operand
+
+        Returns:
+            Dual: other + self
+
+        """
+        return self + other
+
+    def __sub__(self, other) -> "Dual":
+        """
+        **Operator -**
+
+        Args:
+            self (Dual): first operand
+            other (Dual or Interval or Affine or int or float or mpf):
+                second operand
+
+        Returns:
+            Dual: self - other
+
+        Raises:
+            affapyError: other must be Dual, Interval, Affine, int, float,
+                mpf
+
+        """
+        other = Dual._constant(other)
+        return Dual(self._val - other._val,
+                    tuple(a - b for a, b in _pairs(self._der, other._der)))
+
+    def __rsub__(self, other) -> "Dual":
+        """
+        **Operator -** (reflected)
+
+        Args:
+            self (Dual): second operand
+            other (Interval or Affine or int or float or mpf): first operand
+
+        Returns:
+            Dual: other - self
+
+        """
+        return Dual._constant(other) - self
+
+    def __mul__(self, other) -> "Dual":
+        """
+        **Operator ***
+
+        Return the product of two dual numbers, with:
+
+        .. math ::
+            (uv)' = u'v + uv'
+
+        Args:
+            self (Dual): first operand
+            other (Dual or Interval or Affine or int or float or mpf):
+                second operand
+
+        Returns:
+            Dual: self * other
+
+        Raises:
+            affapyError: other must be Dual, Interval, Affine, int, float,
+                mpf
+
+        """
+        other = Dual._constant(other)
+        u, v = self._val, other._val
+        return Dual(u * v, tuple(a * v + u * b for a, b in
+                                 _pairs(self._der, other._der)))
+
+    def __rmul__(self, other) -> "Dual":
+        """
+        **Operator *** (reflected)
+
+        Args:
+            self (Dual): second operand
+            other (Interval or Affine or int or float or mpf): first operand
+
+        Returns:
+            Dual: other * self
+
+        """
+        return self * other
+
+    def __truediv__(self, other) -> "Dual":
+        """
+        **Operator /**
+
+        Return the quotient of two dual numbers, with:
+
+        .. math ::
+            \\left(\\frac{u}{v}\\right)' = \\frac{u' - \\frac{u}{v} v'}{v}
+
+        Args:
+            self (Dual): first operand
+            other (Dual or Interval or Affine or int or float or mpf):
+                second operand
+
+        Returns:
+            Dual: self / other
+
+        Raises:
+            affapyError: other must be Dual, Interval, Affine, int, float,
+                mpf
+
+        """
+        other = Dual._constant(other)
+        v = other._val
+        q = self._val / v
+        return Dual(q, tuple((a - q * b) / v for a, b in
+                             _pairs(self._der, other._der)))
+
+    def __rtruediv__(self, other) -> "Dual":
+        """
+        **Operator /** (reflected)
+
+        Args:
+            self (Dual): second operand
+            other (Interval or Affine or int or float or mpf): first operand
+
+        Returns:
+            Dual: other / self
+
+        """
+        return Dual._constant(other) / self
+
+    def __pow__(self, n: "Dual | int") -> "Dual":
+        """
+        **Operator ****
+
+        Return the power of a dual number with another dual number or an
+        integer. With a dual number, it uses the identity:
+
+        .. math ::
+            x^n = exp(n \\times log(x))
+
+        Args:
+            self (Dual): first operand
+            n (Dual or int): second operand (exponent)
+
+        Returns:
+            Dual: self ** n
+
+        Raises:
+            affapyError: type error: n must be Dual or int
+
+        """
+        if isinstance(n, Dual):
+            return (n * self.log()).exp()
+        if not isinstance(n, int):
+            raise affapyError("type error: n must be Dual or int")
+        if n < 0:
+            return self.inv() ** -n
+        if n == 0:
+            return Dual(1)
+        y, x, k = None, self, n
+        while k > 1:
+            if k % 2:
+                y = x if y is None else y * x
+            x = x.sqr()
+            k //= 2
+        return x if y is None else y * x
+
+    def __abs__(self) -> "Dual":
+        """
+        **Function abs**
+
+        Return the absolute value of a dual number. If the value contains
+        0, the partial derivatives are replaced by symmetric enclosures.
+
+        Args:
+            self (Dual): operand
+
+        Returns:
+            Dual: abs(self)
+
+        """
+        itv = affapy.box.bounds(self._val)
+        if itv >= 0:
+            return self.copy()
+        if itv <= 0:
+            return -self
+        return Dual(abs(self._val),
+                    tuple(_symmetric(d, self._val) for d in self._der))
+
+    # Elementary functions
+    def sqr(self) -> "Dual":
+        """
+        **Function sqr**
+
+        Args:
+            self (Dual): operand
+
+        Returns:
+            Dual: self ** 2
+
+        """
+        return self._chain(_sqr(self._val), 2 * self._val)
+
+    def inv(self) -> "Dual":
+        """
+        **Inverse**
+
+        Args:
+            self (Dual): operand
+
+        Returns:
+            Dual: 1 / self
+
+        """
+        y = 1 / self._val
+        return self._chain(y, -_sqr(y))
+
+    def sqrt(self) -> "Dual":
+        """
+        **Function sqrt**
+
+        Args:
+            self (Dual): operand
+
+        Returns:
+            Dual: sqrt(self)
+
+        """
+        y = self._val.sqrt()
+        return self._chain(y, 1 / (2 * y))
+
+    def exp(self) -> "Dual":
+        """
+        **Function exp**
+
+        Args:
+            self (Dual): operand
+
+        Returns:
+            Dual: exp(self)
+
+        """
+        y = self._val.exp()
+        return self._chain(y, y)
+
+    def log(self) -> "Dual":
+        """
+        **Function log**
+
+        Args:
+            self (Dual): operand
+
+        Returns:
+            Dual: log(self)
+
+        """
+        return self._chain(self._val.log(), 1 / self._val)
+
+    def sin(self) -> "Dual":
+        """
+        **Function sin**
+
+        Args:
+            self (Dual): operand
+
+        Returns:
+            Dual: sin(self)
+
+        """
+        return self._chain(self._val.sin(), self._val.cos())
+
+    def cos(self) -> "Dual":
+        """
+        **Function cos**
+
+        Args:
+            self (Dual): operand
+
+        Returns:
+            Dual: cos(self)
+
+        """
+        return self._chain(self._val.cos(), -self._val.sin())
+
+    def tan(self) -> "Dual":
+        """
+        **Function tan**
+
+        Args:
+            self (Dual): operand
+
+        Returns:
+            Dual: tan(self)
+
+        """
+        y = self._val.tan()
+        return self._chain(y, 1 + _sqr(y))
+
+    def cotan(self) -> "Dual":
+        """
+        **Function cotan**
+
+        Args:
+            self (Dual): operand
+
+        Returns:
+            Dual: cotan(self)
+
+        """
+        y = self._val.cotan()
+        return self._chain(y, -(1 + _sqr(y)))
+
+    def cosh(self) -> "Dual":
+        """
+        **Function cosh**
+
+        Args:
+            self (Dual): operand
+
+        Returns:
+            Dual: cosh(self)
+
+        """
+        return self._chain(self._val.cosh(), self._val.sinh())
+
+    def sinh(self) -> "Dual":
+        """
+        **Function sinh**
+
+        Args:
+            self (Dual): operand
+
+        Returns:
+            Dual: sinh(self)
+
+        """
+        return self._chain(self._val.sinh(), self._val.cosh())
+
+    def tanh(self) -> "Dual":
+        """
+        **Function tanh**
+
+        Args:
+            self (Dual): operand
+
+        Returns:
+            Dual: tanh(self)
+
+        """
+        y = self._val.tanh()
+        return self._chain(y, 1 - _sqr(y))
+
+    # Formats
+    def __str__(self) -> str:
+        """
+        Return the dual number as a string: (val, der).
+
+        Args:
+            self (Dual): operand
+
+        Returns:
+            str: dual number
+
+        """
+        return "({}, ({}))".format(
+            self._val, "".join(str(d) + ", " for d in self._der).rstrip())
+
+    def __repr__(self) -> str:
+        """
+        Return the representation of a dual number.
+
+        Args:
+            self (Dual): operand
+
+        Returns:
+            str: Dual(val, der)
+
+        """
+        return "Dual({!r}, {!r})".format(self._val, self._der)
+
+    def copy(self) -> "Dual":
+        """
+        Copy a dual number.
+
+        Args:
+            self (Dual): operand
+
+        Returns:
+            Dual: copy of self
+
+        """
+        return Dual(self._val.copy(), self._der)
+
+
+def variables(box, model: str = "ia") -> list:
+    """
+    Build the dual numbers of the inputs of a function over a box: the
+    gradient of the input i is the unit vector i.
+
+    Args:
+        box (list or tuple): the box, a sequence of intervals
+        model (str): *aa* or *ia* (default: *ia*)
+
+    Returns:
+        list: list of Dual
+
+    Raises:
+        affapyError: model must be 'aa' or 'ia'
+
+    """
+    if model not in ("aa", "ia"):
+        raise affapyError("model must be 'aa' or 'ia'")
+    args = affapy.box.inputs(affapy.box.normalize(box), model)
+    n = len(args)
+    return [Dual(x, (0,) * i + (1,) + (0,) * (n - i - 1))
+            for i, x in enumerate(args)]
+
+
+def _evaluate(fn, box: tuple, model: str) -> tuple:
+    """
+    Evaluate a function over a normalized box with dual numbers, and
+    return the inputs and the result with a complete gradient.
+    """
+    args = variables(box, model)
+    value = Dual._constant(fn(*args))
+    der = value.der + (0,) * (len(args) - len(value.der))
+    return args, Dual(value.val, der)
+
+
+def gradient(fn, box, model: str = "ia") -> tuple:
+    """
+    Evaluate a function over a box with dual numbers.
+
+    Args:
+        fn (function): evaluated function
+        box (list or tuple): the box, a sequence of intervals
+        model (str): *aa* or *ia* (default: *ia*)
+
+    Returns:
+        tuple: enclosure of fn over the box (Interval) and tuple of the
+        enclosures of its partial derivatives (Interval)
+
+    Raises:
+        affapyError: model must be 'aa' or 'ia'
+
+    Examples:
+        >>> gradient(lambda x, y: x * y, [[1, 2], [3, 4]])
+        (Interval(3.0, 8.0), (Interval(3.0, 4.0), Interval(1.0, 2.0)))
+
+    """
+    _, value = _evaluate(fn, affapy.box.normalize(box), model)
+    return (affapy.box.bounds(value.val),
+            tuple(affapy.box.bounds(d) for d in value.der))
+
+
+def _meanValue(fn, box: tuple, args: list, value: Dual) -> Interval:
+    """
+    Return the mean value form of a function over a normalized box,
+    intersected with its natural evaluation, from the result of
+    _evaluate. With the model aa, the partial derivatives and the inputs
+    share their noise symbols.
+    """
+    center = affapy.box.midpoint(box)
+    fm = affapy.box.bounds(fn(*[Interval(m, m) for m in center]))
+    terms = 0
+    for d, x, m in zip(value.der, args, center):
+        terms = terms + d * (x.val - m)
+    mv = fm + affapy.box.bounds(terms)
+    natural = affapy.box.bounds(value.val)
+    if mv.sup < natural.inf or natural.sup < mv.inf:
+        return natural
+    return _intersect(mv, natural)
+
+
+def mean_value(fn, box, model: str = "ia") -> Interval:
+    """
+    Bound a function over a box with the mean value form, intersected with
+    the natural evaluation. The function must accept dual numbers and
+    degenerate intervals.
+
+    Args:
+        fn (function): evaluated function
+        box (list or tuple): the box, a sequence of intervals
+        model (str): *aa* or *ia* (default: *ia*)
+
+    Returns:
+        Interval: enclosure of fn over the box
+
+    Raises:
+        affapyError: model must be 'aa' or 'ia'
+
+    """
+    box = affapy.box.normalize(box)
+    return _meanValue(fn, box, *_evaluate(fn, box, model))
+
+
+def enclosure(fn, box, model: str = "ia") -> Interval:
+    """
+    Bound a function over a box with the derivative enclosures.
+
+    The inputs whose partial derivative has a constant sign are replaced
+    by the endpoints of their intervals: the lower bound is evaluated over
+    the box where the function is minimal along these inputs, and the
+    upper bound over the box where it is maximal. The other inputs are
+    bounded with the mean value form. The function must accept dual
+    numbers and degenerate intervals.
+
+    Args:
+        fn (function): evaluated function
+        box (list or tuple): the box, a sequence of intervals
+        model (str): *aa* or *ia* (default: *ia*)
+
+    Returns:
+        Interval: enclosure of fn over the box
+
+    Raises:
+        affapyError: model must be 'aa' or 'ia'
+
+    Examples:
+        >>> enclosure(lambda x: x.exp() - x, [[1, 2]])
+        Interval(1.71828182845905, 5.38905609893065)
+
+    """
+    box = affapy.box.normalize(box)
+    args, value = _evaluate(fn, box, model)
+    lower, upper = list(box), list(box)
+    monotonic = False
+    for i, d in enumerate(value.der):
+        d = affapy.box.bounds(d)
+        inf = Interval(box[i].inf, box[i].inf)
+        sup = Interval(box[i].sup, box[i].sup)
+        if d >= 0:
+            lower[i], upper[i] = inf, sup
+        elif d <= 0:
+            lower[i], upper[i] = sup, inf
+        else:
+            continue
+        monotonic = True
+    if not monotonic:
+        return _meanValue(fn, box, args, value)
+    lo = mean_value(fn, lower, model)
+    hi = mean_value(fn, upper, model)
+    return _intersect(Interval(lo.inf, hi.sup), affapy.box.bounds(value.val))
@@ -0,0 +1,388 @@
+"""
+This module evaluates functions over boxes from *asyncio* code.
+
+The arithmetic of *affapy* is CPU-bound: an evaluation in a coroutine
+blocks the event loop. The evaluations of this module are offloaded to a
+managed pool of processes (**AsyncPool**), and awaited:
+
+* each request has its own model and precision: the workers evaluate each
+  chunk in a precision context (:func:`mpmath.mp.workprec`), so requests
+  with different precisions can share the pool
+* the chunks of all the requests share a bounded number of slots of the
+  pool (*concurrency*), given in the order of the requests, and each
+  request has at most *window* chunks in progress: an expensive request
+  cannot fill the pool and stall the other ones
+* the enclosures of the chunks are yielded as soon as they are evaluated
+  (**AsyncPool.map**)
+* cancelling a request cancels its chunks which are not started
+
+The functions **evaluate** and **map** use a default pool, created at
+their first call (see **configure** and **shutdown**, or **aconfigure**
+and **ashutdown** in a coroutine). As with **affapy.parallel**, the
+function must be picklable.
+
+This module requires Python 3.7.
+
+**Example**:
+
+.. code-block:: python
+
+    import affapy.aio
+
+    async def handler(boxes):
+        return await affapy.aio.evaluate(fct, boxes, model="aa", dps=30)
+
+    async def stream(boxes):
+        async for start, itvs in affapy.aio.map(fct, boxes):
+            ...
+
+"""
+import asyncio
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from affapy.error import affapyError
+import affapy.parallel
+from mpmath import mp
+from mpmath.libmp import dps_to_prec
+
+
+def _evalTask(fn, model: str, prec: int, order: int, start: int,
+              boxes: list) -> tuple:
+    """
+    Evaluate a chunk of boxes in a worker process, with a precision.
+
+    Args:
+        fn (function): evaluated function
+        model (str): *aa*, *ia* or *tm*
+        prec (int): binary precision
+        order (int): order of the Taylor models
+        start (int): index of the first box of the chunk
+        boxes (list): list of boxes
+
+    Returns:
+        tuple: start and the list of enclosures
+
+    """
+    with mp.workprec(prec):
+        return start, affapy.parallel._evalBoxes(fn, model, boxes, order)
+
+
+def _release(loop, slots: asyncio.Semaphore):
+    """Release a slot from the thread of a process pool."""
+    try:
+        loop.call_soon_threadsafe(slots.release)
+    except RuntimeError:
+        # The event loop is closed
+        pass
+
+
+class AsyncPool:
+    """
+    Pool of processes evaluating functions over boxes for coroutines. It
+    can be used with the *async with* statement, which shutdowns the
+    pool at the exit.
+
+    It contains the fields:
+
+    * **workers**: number of processes
+    * **concurrency**: maximal number of chunks in progress, for all the
+      requests
+    * **window**: maximal number of chunks in progress of a request
+
+    """
+
+    def __init__(self, workers: int = None, concurrency: int = None,
+                 window: int = None):
+        """
+        Init the pool. The processes are created at the first request.
+
+        Args:
+            workers (int): number of processes (default: number of cores)
+            concurrency (int): maximal number of chunks in progress
+                (default: twice the number of processes)
+            window (int): maximal number of chunks in progress of a
+                request (default: number of processes)
+
+        Raises:
+            affapyError: workers, concurrency and window must be positive
+
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.concurrency = concurrency or 2 * self.workers
+        self.window = window or self.workers
+        if min(self.workers, self.concurrency, self.window) < 1:
+            raise affapyError(
+                "workers, concurrency and window must be positive")
+        self._pool = None
+        self._slots = None
+        self._loop = None
+        self._futures = set()
+
+    async def __aenter__(self):
+        """Return the pool."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Shutdown the pool without blocking the event loop."""
+        await self.aclose()
+        return False
+
+    def _start(self) -> ProcessPoolExecutor:
+        """Create the processes and the slots of the current event loop."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.concurrency)
+        return self._pool
+
+    def _detach(self) -> ProcessPoolExecutor:
+        """Cancel the chunks which are not started and detach the pool."""
+        for future in list(self._futures):
+            future.cancel()
+        pool, self._pool = self._pool, None
+        return pool
+
+    def shutdown(self):
+        """
+        Cancel the chunks which are not started and stop the pool. It
+        waits for the chunks in progress: use **aclose** in a coroutine.
+        The requests in progress raise :class:`asyncio.CancelledError`.
+        """
+        pool = self._detach()
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    async def aclose(self):
+        """
+        Cancel the chunks which are not started and stop the pool. The
+        chunks in progress are awaited without blocking the event loop,
+        and the requests in progress raise :class:`asyncio.CancelledError`.
+        """
+        pool = self._detach()
+        if pool is not None:
+            await asyncio.get_running_loop().run_in_executor(
+                None, pool.shutdown)
+
+    async def map(self, fn, boxes, model: str = "aa",
+                  chunksize: int = 16, dps: int = None, prec: int = None,
+                  order: int = 5):
+        """
+        Evaluate a function over boxes. It is an asynchronous generator
+        which yields the chunks as soon as they are evaluated, not in
+        order. The boxes are read chunk by chunk.
+
+        The precision is the current *mpmath* precision unless dps or
+        prec is given.
+
+        Args:
+            fn (function): picklable function
+            boxes (iterable): boxes
+            model (str): *aa*, *ia* or *tm* (default: *aa*)
+            chunksize (int): number of boxes per chunk
+            dps (int): decimal precision
+            prec (int): binary precision
+            order (int): order of the Taylor models of the model *tm*
+
+        Yields:
+            tuple: index of the first box of the chunk and the list of
+            its enclosures (Interval)
+
+        Raises:
+            affapyError: model must be 'aa', 'ia' or 'tm'
+            affapyError: chunksize must be positive
+
+        """
+        if model not in ("aa", "ia", "tm"):
+            raise affapyError("model must be 'aa', 'ia' or 'tm'")
+        if chunksize < 1:
+            raise affapyError("chunksize must be positive")
+        if prec is None:
+            prec = mp.prec
+            if dps is not None:
+                prec = dps_to_prec(dps)
+        pool = self._start()
+        loop, slots = self._loop, self._slots
+        it = iter(boxes)
+        pending = set()
+        start = 0
+        try:
+            while True:
+                while len(pending) < self.window:
+                    chunk = list(itertools.islice(it, chunksize))
+                    if not chunk:
+                        break
+                    await slots.acquire()
+                    if self._pool is not pool:
+                        # The pool was shut down during the request
+                        slots.release()
+                        raise asyncio.CancelledError()
+                    task = pool.submit(_evalTask, fn, model, prec, order,
+                                       start, chunk)
+                    self._futures.add(task)
+                    task.add_done_callback(self._futures.discard)
+                    # The slot is released when the chunk ends in its
+                    # process, not when the request stops waiting for it
+                    task.add_done_callback(lambda t: _release(loop, slots))
+                    future = asyncio.wrap_future(task, loop=loop)
+                    pending.add(future)
+                    start += len(chunk)
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def evaluate(self, fn, boxes, model: str = "aa",
+                       chunksize: int = 16, dps: int = None,
+                       prec: int = None, order: int = 5) -> list:
+        """
+        Evaluate a function over boxes.
+
+        Args:
+            fn (function): picklable function
+            boxes (iterable): boxes
+            model (str): *aa*, *ia* or *tm* (default: *aa*)
+            chunksize (int): number of boxes per chunk
+            dps (int): decimal precision
+            prec (int): binary precision
+            order (int): order of the Taylor models of the model *tm*
+
+        Returns:
+            list: list of Interval, the enclosures in the order of the boxes
+
+        Raises:
+            affapyError: model must be 'aa', 'ia' or 'tm'
+            affapyError: chunksize must be positive
+
+        """
+        result = {}
+        gen = self.map(fn, boxes, model, chunksize, dps, prec, order)
+        try:
+            async for start, itvs in gen:
+                result[start] = itvs
+        finally:
+            await gen.aclose()
+        return [itv for start in sorted(result) for itv in result[start]]
+
+
+# Pool of evaluate and map (None before the first call)
+_default = None
+
+
+def configure(workers: int = None, concurrency: int = None,
+              window: int = None) -> AsyncPool:
+    """
+    Replace the default pool of **evaluate** and **map**. It waits for the
+    chunks in progress of the previous pool: use **aconfigure** in a
+    coroutine.
+
+    Args:
+        workers (int): number of processes (default: number of cores)
+        concurrency (int): maximal number of chunks in progress
+        window (int): maximal number of chunks in progress of a request
+
+    Returns:
+        AsyncPool: the default pool
+
+    """
+    global _default
+    shutdown()
+    _default = AsyncPool(workers, concurrency, window)
+    return _default
+
+
+def shutdown():
+    """
+    Stop the default pool. It waits for the chunks in progress: use
+    **ashutdown** in a coroutine.
+    """
+    if _default is not None:
+        _default.shutdown()
+
+
+async def aconfigure(workers: int = None, concurrency: int = None,
+                     window: int = None) -> AsyncPool:
+    """
+    Replace the default pool of **evaluate** and **map**, without blocking
+    the event loop while the chunks of the previous pool end.
+
+    Args:
+        workers (int): number of processes (default: number of cores)
+        concurrency (int): maximal number of chunks in progress
+        window (int): maximal number of chunks in progress of a request
+
+    Returns:
+        AsyncPool: the default pool
+
+    """
+    global _default
+    await ashutdown()
+    _default = AsyncPool(workers, concurrency, window)
+    return _default
+
+
+async def ashutdown():
+    """Stop the default pool without blocking the event loop."""
+    if _default is not None:
+        await _default.aclose()
+
+
+def _pool() -> AsyncPool:
+    """Return the default pool."""
+    if _default is None:
+        configure()
+    return _default
+
+
+async def evaluate(fn, boxes, model: str = "aa", chunksize: int = 16,
+                   dps: int = None, prec: int = None,
+                   order: int = 5) -> list:
+    """
+    Evaluate a function over boxes with the default pool (see
+    **AsyncPool.evaluate**).
+
+    Args:
+        fn (function): picklable function
+        boxes (iterable): boxes
+        model (str): *aa*, *ia* or *tm* (default: *aa*)
+        chunksize (int): number of boxes per chunk
+        dps (int): decimal precision
+        prec (int): binary precision
+        order (int): order of the Taylor models of the model *tm*
+
+    Returns:
+        list: list of Interval, the enclosures in the order of the boxes
+
+    """
+    return await _pool().evaluate(fn, boxes, model, chunksize, dps, prec,
+                                    order)
+
+
+def map(fn, boxes, model: str = "aa", chunksize: int = 16,
+        dps: int = None, prec: int = None, order: int = 5):
+    """
+    Evaluate a function over boxes with the default pool (see
+    **AsyncPool.map**).
+
+    Args:
+        fn (function): picklable function
+        boxes (iterable): boxes
+        model (str): *aa*, *ia* or *tm* (default: *aa*)
+        chunksize (int): number of boxes per chunk
+        dps (int): decimal precision
+        prec (int): binary precision
+        order (int): order of the Taylor models of the model *tm*
+
+    Returns:
+        async generator: index of the first box and enclosures of each
+        chunk
+
+    """
+    return _pool().map(fn, boxes, model, chunksize, dps, prec, order)
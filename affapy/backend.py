@@ -0,0 +1,622 @@
+"""
+This module manages the numeric backend of *affapy*.
+
+The modules **ia** and **aa** compute with a small set of functions with
+directed rounding (*fadd*, *fmul*, *sqrt*, *exp*, ...) and a context *mp*
+providing the conversions (*mp.mpf*) and the constants (*mp.pi*,
+*mp.nan*). A backend provides this set of functions with the signatures
+of *mpmath*: the functions take an optional argument *rounding* among
+'n' (nearest), 'f' (floor), 'c' (ceiling), 'd' (toward zero) and 'u'
+(away from zero).
+
+The available backends are:
+
+* **mpmath**: multiprecision numbers of *mpmath* with the precision
+  *mp.prec* (default)
+* **float64**: hardware floating-point numbers. The rounding of the
+  operations is exact for *+*, *-*, *\\**, */* and *sqrt*, which are
+  corrected with error-free transformations, and outward (one unit in
+  the last place) for the elementary functions, which assumes that the
+  *math* functions are faithfully rounded
+* **gmpy2**: multiprecision numbers of *MPFR* with the precision
+  *mp.prec*, available if the module *gmpy2* is installed
+
+The backend is selected globally with **set_backend**, or in a portion of
+code with the **use** class. The selection rebinds the functions of the
+modules **ia** and **aa**: it is a state of the process, shared by all
+the threads, and not a setting of a thread or of a context. Select the
+backend before starting threads which compute with *affapy*.
+
+The intervals and affine forms hold numbers of the backend used to create
+them: do not mix objects created with different backends. The numbers of
+*mpmath* (such as *mp.pi*) are accepted as operands with all the
+backends, and converted. The modules **tm**, **ad** and **box** compute
+with intervals and affine forms, so they follow the backend too.
+
+**Example**:
+
+.. code-block:: python
+
+    from affapy.backend import use
+
+    with use("float64"):
+        x = Affine([1, 2])
+        y = x * x + x.exp()
+
+"""
+import importlib
+import importlib.util
+import math
+import struct
+from contextlib import ContextDecorator
+from fractions import Fraction
+import mpmath
+from mpmath import mp
+from affapy.error import affapyError
+import affapy.aa
+import affapy.ia
+
+# Names of the backend used by each module
+_BINDINGS = {
+    affapy.ia: ("mp", "mpf", "fadd", "fsub", "fmul", "fdiv", "fneg", "fabs",
+                "floor", "ceil", "sqrt", "exp", "ln", "cos", "fmod",
+                "_SCALARS"),
+    affapy.aa: ("mp", "mpf", "fdiv", "fadd", "fsub", "fsum", "fneg", "fmul",
+                "fabs", "sqrt", "exp", "log", "sin", "_SCALARS"),
+}
+
+
+class Backend:
+    """
+    Numeric backend. A backend defines the scalar type **type**, the
+    context **mp** (with the method *mpf* and the constants *pi*, *nan*
+    and *inf*) and the functions:
+
+    * **fadd**, **fsub**, **fmul**, **fdiv** (x, y, rounding)
+    * **fneg**, **fabs**, **floor**, **ceil**, **sqrt**, **exp**, **log**,
+      **sin**, **cos** (x, rounding)
+    * **fmod** (x, y)
+    * **fsum** (terms, absolute)
+
+    """
+
+    name = None
+    FUNCTIONS = ("fadd", "fsub", "fmul", "fdiv", "fneg", "fabs", "floor",
+                 "ceil", "sqrt", "exp", "log", "sin", "cos", "fmod", "fsum")
+
+    def namespace(self) -> dict:
+        """
+        Return the names provided to the modules **ia** and **aa**.
+
+        Returns:
+            dict: name -> object
+
+        """
+        names = {name: getattr(self, name) for name in self.FUNCTIONS}
+        names["ln"] = getattr(self, "ln", names["log"])
+        names["mp"] = self.mp
+        names["mpf"] = self.type
+        # The numbers of mpmath (e.g. mp.pi) are accepted as operands
+        names["_SCALARS"] = (int, float, mpmath.ctx_mp_python._mpf,
+                             self.type, str)
+        return names
+
+    def __repr__(self) -> str:
+        return "Backend({!r})".format(self.name)
+
+
+class MpmathBackend(Backend):
+    """Backend of *mpmath* (default)."""
+
+    name = "mpmath"
+
+    def __init__(self):
+        self.mp = mp
+        self.type = mpmath.ctx_mp_python._mpf
+        for name in self.FUNCTIONS + ("ln",):
+            setattr(self, name, getattr(mpmath, name))
+
+
+# Float64 backend helpers
+_INF = math.inf
+_SPLITTER = 134217729.0  # 2**27 + 1
+_HUGE = 2. ** 995
+_TINY = 2. ** -969
+
+
+def _nextFloat(x: float, y: float) -> float:
+    """Return the float next to x in the direction of y, from the bit
+    pattern of x."""
+    if x != x or y != y:
+        return x + y
+    if x == y:
+        return y
+    if x == 0:
+        return math.copysign(5e-324, y)
+    n = struct.unpack('<q', struct.pack('<d', x))[0]
+    n += 1 if (y > x) == (x > 0) else -1
+    return struct.unpack('<d', struct.pack('<q', n))[0]
+
+
+try:
+    from math import nextafter as _nextafter
+except ImportError:  # Python < 3.9
+    _nextafter = _nextFloat
+
+
+def _down(v) -> float:
+    """Return the largest float lower or equal to v."""
+    f = float(v)
+    return _nextafter(f, -_INF) if f > v else f
+
+
+def _up(v) -> float:
+    """Return the smallest float greater or equal to v."""
+    f = float(v)
+    return _nextafter(f, _INF) if f < v else f
+
+
+def _away(v) -> float:
+    """Return v rounded to a float away from zero."""
+    return _up(v) if v > 0 else _down(v)
+
+
+def _outward(r: float, rounding: str) -> float:
+    """Round r of one ulp in the direction of rounding."""
+    if rounding == 'n' or r != r:
+        return r
+    if rounding == 'c':
+        return _nextafter(r, _INF)
+    if rounding == 'f':
+        return _nextafter(r, -_INF)
+    if rounding == 'u':
+        return _nextafter(r, math.copysign(_INF, r))
+    return _nextafter(r, 0.)
+
+
+def _adjust(r: float, e, rounding: str) -> float:
+    """
+    Round r, the float nearest to an exact value, in the direction of
+    rounding. e has the sign of (exact value - r), or is None if it is
+    unknown.
+    """
+    if e is None:
+        return _outward(r, rounding)
+    if rounding == 'n' or not e or r != r:
+        return r
+    if rounding == 'c':
+        step = e > 0
+    elif rounding == 'f':
+        step = e < 0
+    elif rounding == 'u':
+        step = r == 0 or (e > 0) == (r > 0)
+    else:
+        step = r != 0 and (e > 0) != (r > 0)
+    return _nextafter(r, math.copysign(_INF, e)) if step else r
+
+
+def _split(a: float) -> tuple:
+    """Veltkamp split of a into two halves of 26 bits."""
+    c = _SPLITTER * a
+    h = c - (c - a)
+    return h, a - h
+
+
+def _twoProduct(a: float, b: float) -> tuple:
+    """Return the product p = a * b and the exact error a * b - p
+    (None if it cannot be computed)."""
+    p = a * b
+    if a == 0 or b == 0:
+        return p, 0.
+    if not (_TINY < abs(p) < _HUGE) or abs(a) >= _HUGE or abs(b) >= _HUGE:
+        return p, None
+    ah, al = _split(a)
+    bh, bl = _split(b)
+    return p, ((ah * bh - p) + ah * bl + al * bh) + al * bl
+
+
+def _overflow(r: float, *args) -> bool:
+    """Return True if r is infinite and the operands are finite."""
+    return math.isinf(r) and all(math.isfinite(a) for a in args)
+
+
+class Float64Backend(Backend):
+    """Backend of the hardware floating-point numbers."""
+
+    name = "float64"
+
+    def __init__(self):
+        self.mp = self
+        self.type = float
+        self.pi = math.pi
+        self.nan = math.nan
+        self.inf = math.inf
+
+    def __getattr__(self, name: str):
+        # Other attributes of mp (e.g. prec) are the ones of mpmath
+        return getattr(mp, name)
+
+    @staticmethod
+    def mpf(x, rounding: str = 'n') -> float:
+        """Convert x to a float rounded in the direction of rounding."""
+        if isinstance(x, float):
+            return x
+        if isinstance(x, str):
+            r = float(x)
+            try:
+                exact = Fraction(x.strip())
+            except ValueError:
+                return r
+        else:
+            try:
+                r = float(x)
+            except OverflowError:
+                r = math.copysign(_INF, x)
+            exact = x
+        if rounding == 'n' or r != r:
+            return r
+        return _adjust(r, (exact > r) - (exact < r), rounding)
+
+    @staticmethod
+    def fadd(x, y, rounding: str = 'n') -> float:
+        x, y = float(x), float(y)
+        s = x + y
+        if not math.isfinite(s):
+            return _adjust(s, -s if _overflow(s, x, y) else 0, rounding)
+        bb = s - x
+        return _adjust(s, (x - (s - bb)) + (y - bb), rounding)
+
+    @staticmethod
+    def fsub(x, y, rounding: str = 'n') -> float:
+        return Float64Backend.fadd(x, -float(y), rounding)
+
+    @staticmethod
+    def fmul(x, y, rounding: str = 'n') -> float:
+        x, y = float(x), float(y)
+        p, e = _twoProduct(x, y)
+        if _overflow(p, x, y):
+            e = -p
+        return _adjust(p, e, rounding)
+
+    @staticmethod
+    def fdiv(x, y, rounding: str = 'n') -> float:
+        x, y = float(x), float(y)
+        try:
+            q = x / y
+        except ZeroDivisionError:
+            return math.nan if x == 0 or x != x else math.copysign(
+                _INF, x) * math.copysign(1., y)
+        if not math.isfinite(q):
+            return _adjust(q, -q if _overflow(q, x, y) else 0, rounding)
+        p, pe = _twoProduct(q, y)
+        if pe is None:
+            return _outward(q, rounding)
+        residual = (x - p) - pe
+        return _adjust(q, residual if y > 0 else -residual, rounding)
+
+    @staticmethod
+    def fneg(x, rounding: str = 'n') -> float:
+        return -float(x)
+
+    @staticmethod
+    def fabs(x, rounding: str = 'n') -> float:
+        return abs(float(x))
+
+    @staticmethod
+    def floor(x, rounding: str = 'n') -> float:
+        x = float(x)
+        return float(math.floor(x)) if math.isfinite(x) else x
+
+    @staticmethod
+    def ceil(x, rounding: str = 'n') -> float:
+        x = float(x)
+        return float(math.ceil(x)) if math.isfinite(x) else x
+
+    @staticmethod
+    def sqrt(x, rounding: str = 'n') -> float:
+        x = float(x)
+        if x < 0 or x != x:
+            return math.nan
+        s = math.sqrt(x)
+        if math.isinf(s):
+            return s
+        p, pe = _twoProduct(s, s)
+        return _adjust(s, None if pe is None else (x - p) - pe, rounding)
+
+    @staticmethod
+    def exp(x, rounding: str = 'n') -> float:
+        x = float(x)
+        if x == 0:
+            return 1.
+        try:
+            r = math.exp(x)
+        except OverflowError:
+            return _nextafter(_INF, 0.) if rounding in 'fd' else _INF
+        if r == 0:
+            return _nextafter(0., _INF) if rounding in 'cu' else 0.
+        return _outward(r, rounding)
+
+    @staticmethod
+    def log(x, rounding: str = 'n') -> float:
+        x = float(x)
+        if x == 1:
+            return 0.
+        if x < 0 or x != x:
+            return math.nan
+        if x == 0:
+            return -_INF
+        return _outward(math.log(x), rounding)
+
+    @staticmethod
+    def sin(x, rounding: str = 'n') -> float:
+        x = float(x)
+        if x == 0:
+            return x
+        if not math.isfinite(x):
+            return math.nan
+        r = _outward(math.sin(x), rounding)
+        return min(max(r, -1.), 1.)
+
+    @staticmethod
+    def cos(x, rounding: str = 'n') -> float:
+        x = float(x)
+        if x == 0:
+            return 1.
+        if not math.isfinite(x):
+            return math.nan
+        r = _outward(math.cos(x), rounding)
+        return min(max(r, -1.), 1.)
+
+    @staticmethod
+    def fmod(x, y) -> float:
+        x, y = float(x), float(y)
+        if y == 0 or math.isinf(x):
+            return math.nan
+        return math.fmod(x, y)
+
+    @staticmethod
+    def fsum(terms, absolute: bool = False) -> float:
+        if absolute:
+            return math.fsum(abs(float(t)) for t in terms)
+        return math.fsum(float(t) for t in terms)
+
+
+class Gmpy2Backend(Backend):
+    """
+    Backend of *MPFR* through the module *gmpy2*. The precision is the
+    precision of *mpmath* (*mp.prec*).
+
+    Raises:
+        affapyError: gmpy2 is not installed
+
+    """
+
+    name = "gmpy2"
+
+    def __init__(self):
+        try:
+            self._gmpy2 = importlib.import_module("gmpy2")
+        except ImportError:
+            raise affapyError("the gmpy2 backend requires gmpy2")
+        self.mp = self
+        self.type = type(self._gmpy2.mpfr(0))
+        self._prec = None
+        self._contexts = None
+
+    def __getattr__(self, name: str):
+        # Other attributes of mp (e.g. prec) are the ones of mpmath
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(mp, name)
+
+    def _ctx(self, rounding: str):
+        """Return the gmpy2 context of a rounding mode at mp.prec."""
+        if self._prec != mp.prec:
+            g = self._gmpy2
+            modes = {'n': g.RoundToNearest, 'f': g.RoundDown,
+                     'c': g.RoundUp, 'd': g.RoundToZero,
+                     'u': g.RoundAwayZero}
+            self._contexts = {r: g.context(precision=mp.prec, round=m)
+                              for r, m in modes.items()}
+            self._prec = mp.prec
+            # Operators (+, *, ...) use the global context of gmpy2
+            g.get_context().precision = mp.prec
+        return self._contexts[rounding]
+
+    @property
+    def pi(self):
+        return self._ctx('n').const_pi()
+
+    @property
+    def nan(self):
+        return self._gmpy2.nan()
+
+    @property
+    def inf(self):
+        return self._gmpy2.inf()
+
+    def mpf(self, x, rounding: str = 'n'):
+        """Convert x to a MPFR number rounded in the direction of rounding."""
+        ctx = self._ctx(rounding)
+        if isinstance(x, mpmath.ctx_mp_python._mpf):
+            # mpf or constant (e.g. mp.pi), rounded at mp.prec
+            x = mp.mpf(x, rounding=rounding)
+            if not mpmath.isfinite(x):
+                return self._gmpy2.mpfr(float(x))
+            man, exp = x.man_exp
+            return ctx.mul_2exp(self._gmpy2.mpz(int(man)), int(exp))
+        return self._gmpy2.mpfr(x, context=ctx)
+
+    def fadd(self, x, y, rounding: str = 'n'):
+        return self._ctx(rounding).add(x, y)
+
+    def fsub(self, x, y, rounding: str = 'n'):
+        return self._ctx(rounding).sub(x, y)
+
+    def fmul(self, x, y, rounding: str = 'n'):
+        return self._ctx(rounding).mul(x, y)
+
+    def fdiv(self, x, y, rounding: str = 'n'):
+        return self._ctx(rounding).div(x, y)
+
+    def fneg(self, x, rounding: str = 'n'):
+        return self._ctx(rounding).minus(x)
+
+    def fabs(self, x, rounding: str = 'n'):
+        return self._ctx(rounding).abs(x)
+
+    def floor(self, x, rounding: str = 'n'):
+        return self._ctx(rounding).floor(x)
+
+    def ceil(self, x, rounding: str = 'n'):
+        return self._ctx(rounding).ceil(x)
+
+    def sqrt(self, x, rounding: str = 'n'):
+        return self._ctx(rounding).sqrt(x)
+
+    def exp(self, x, rounding: str = 'n'):
+        return self._ctx(rounding).exp(x)
+
+    def log(self, x, rounding: str = 'n'):
+        return self._ctx(rounding).log(x)
+
+    def sin(self, x, rounding: str = 'n'):
+        return self._ctx(rounding).sin(x)
+
+    def cos(self, x, rounding: str = 'n'):
+        return self._ctx(rounding).cos(x)
+
+    def fmod(self, x, y):
+        return self._ctx('n').fmod(x, y)
+
+    def fsum(self, terms, absolute: bool = False):
+        ctx = self._ctx('n')
+        if absolute:
+            return ctx.fsum([ctx.abs(t) for t in terms])
+        return ctx.fsum(list(terms))
+
+
+BACKENDS = {
+    "mpmath": MpmathBackend,
+    "float64": Float64Backend,
+    "gmpy2": Gmpy2Backend,
+}
+
+# Instances of the backends, created at their first use
+_instances = {}
+_current = None
+
+
+def available() -> list:
+    """
+    Return the names of the available backends.
+
+    Returns:
+        list: names of the backends whose dependencies are installed
+
+    """
+    names = ["mpmath", "float64"]
+    if importlib.util.find_spec("gmpy2") is not None:
+        names.append("gmpy2")
+    return names
+
+
+def get(name: "str | Backend") -> Backend:
+    """
+    Return a backend.
+
+    Args:
+        name (str or Backend): name of the backend, or backend
+
+    Returns:
+        Backend: the backend
+
+    Raises:
+        affapyError: unknown backend, or its dependency is not installed
+
+    """
+    if isinstance(name, Backend):
+        return name
+    if name not in BACKENDS:
+        raise affapyError("unknown backend: {}".format(name))
+    if name not in _instances:
+        _instances[name] = BACKENDS[name]()
+    return _instances[name]
+
+
+def current() -> Backend:
+    """Return the current backend."""
+    return _current
+
+
+def set_backend(name: "str | Backend"):
+    """
+    Set the current backend of the modules **ia** and **aa**.
+
+    Args:
+        name (str or Backend): name of the backend, or backend
+
+    Raises:
+        affapyError: unknown backend, or its dependency is not installed
+
+    """
+    global _current
+    backend = get(name)
+    names = backend.namespace()
+    for module, bindings in _BINDINGS.items():
+        for binding in bindings:
+            setattr(module, binding, names[binding])
+    _current = backend
+
+
+class use(ContextDecorator):
+    """
+    Use a backend in a portion of code. You can use it:
+
+    * As decorator of a function
+    * Using the *with* statement
+
+    The previous backend is restored at the exit of the context.
+
+    **Example**:
+
+    .. code-block:: python
+
+        from affapy.backend import use
+
+        with use("float64"):
+            x * y
+
+        @use("gmpy2")
+        def eval_fct(x, y):
+            return x * y
+
+    """
+
+    def __init__(self, name: "str | Backend"):
+        """
+        Init the context manager.
+
+        Args:
+            name (str or Backend): name of the backend, or backend
+
+        Raises:
+            affapyError: unknown backend, or its dependency is not installed
+
+        """
+        self.backend = get(name)
+        self._old = []
+
+    def __enter__(self):
+        """Set the backend."""
+        self._old.append(current())
+        set_backend(self.backend)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Restore the previous backend."""
+        set_backend(self._old.pop())
+        return False
+
+
+set_backend("mpmath")
@@ -0,0 +1,159 @@
+"""
+This module manage boxes, i.e. cartesian products of intervals, used as
+inputs of the evaluation engines of *affapy*.
+
+A box is a sequence of intervals, one per argument of the evaluated function.
+Each interval can be given as an **Interval** or as a list or tuple of
+length 2:
+
+.. code-block:: python
+
+    box = [[1, 2], Interval(3, 4)]
+
+"""
+from affapy.error import affapyError
+from affapy.ia import Interval
+from affapy.aa import Affine
+from affapy.tm import TaylorModel
+from mpmath.ctx_mp_python import _mpf as mpf
+import affapy.ia
+
+
+def normalize(box) -> tuple:
+    """
+    Convert a box into a tuple of intervals.
+
+    Args:
+        box (list or tuple of Interval or list or tuple): the box
+
+    Returns:
+        tuple: tuple of Interval
+
+    Raises:
+        affapyError: box must be a sequence of intervals
+
+    """
+    if isinstance(box, Interval):
+        return (box,)
+    if not isinstance(box, (list, tuple)) or not box:
+        raise affapyError("box must be a sequence of intervals")
+    itvs = []
+    for itv in box:
+        if isinstance(itv, Interval):
+            itvs.append(itv)
+        elif isinstance(itv, (list, tuple)) and len(itv) == 2:
+            itvs.append(Interval(itv[0], itv[1]))
+        else:
+            raise affapyError("box must be a sequence of intervals")
+    return tuple(itvs)
+
+
+def inputs(box: tuple, model: str = "aa", order: int = 5) -> list:
+    """
+    Build the arguments of a function from a box.
+
+    With the model *aa*, each interval is converted into an affine form
+    with its own noise symbol. With the model *ia*, the intervals are
+    used as they are. With the model *tm*, each interval is converted into
+    a Taylor model of the given order with its own variable.
+
+    Args:
+        box (tuple of Interval): normalized box
+        model (str): *aa*, *ia* or *tm*
+        order (int): order of the Taylor models (default: 5)
+
+    Returns:
+        list: list of Affine, Interval or TaylorModel
+
+    Raises:
+        affapyError: model must be 'aa', 'ia' or 'tm'
+
+    """
+    if model == "aa":
+        return [Affine(interval=itv) for itv in box]
+    if model == "ia":
+        return list(box)
+    if model == "tm":
+        return [TaylorModel(itv, order=order) for itv in box]
+    raise affapyError("model must be 'aa', 'ia' or 'tm'")
+
+
+def bounds(value) -> Interval:
+    """
+    Return the enclosure of an evaluation result as an interval.
+    A NaN bound is replaced by an infinite one.
+
+    Args:
+        value (Affine or Interval or TaylorModel or int or float or mpf):
+            result
+
+    Returns:
+        Interval: enclosure of value
+
+    Raises:
+        affapyError: result must be Affine, Interval, TaylorModel, int,
+            float, mpf
+
+    """
+    if isinstance(value, (Affine, TaylorModel)):
+        itv = value.interval
+    elif isinstance(value, Interval):
+        itv = value
+    elif isinstance(value, (int, float, mpf, affapy.ia.mpf)):
+        itv = Interval(value, value)
+    else:
+        raise affapyError(
+            "result must be Affine, Interval, TaylorModel, int, float, mpf")
+    inf, sup = itv.inf, itv.sup
+    if inf != inf or sup != sup:
+        # NaN bound
+        inf = affapy.ia.mp.inf
+        return Interval(-inf, inf)
+    return itv
+
+
+def widths(box: tuple) -> list:
+    """
+    Return the widths of the intervals of a box.
+
+    Args:
+        box (tuple of Interval): normalized box
+
+    Returns:
+        list: list of mpf
+
+    """
+    return [itv.width() for itv in box]
+
+
+def midpoint(box: tuple) -> tuple:
+    """
+    Return the center of a box.
+
+    Args:
+        box (tuple of Interval): normalized box
+
+    Returns:
+        tuple: tuple of mpf
+
+    """
+    return tuple(itv.mid() for itv in box)
+
+
+def split(box: tuple, k: int) -> tuple:
+    """
+    Bisect a box along its k-th interval.
+
+    Args:
+        box (tuple of Interval): normalized box
+        k (int): index of the interval to bisect
+
+    Returns:
+        tuple: the two halves of the box
+
+    """
+    itv = box[k]
+    mid = itv.mid()
+    left = box[:k] + (Interval(itv.inf, mid),) + box[k + 1:]
+    right = box[:k] + (Interval(mid, itv.sup),) + box[k + 1:]
+    return left, right
@@ -0,0 +1,307 @@
+"""
+This module can memoize the elementary functions of **Affine** and
+**Interval**.
+
+Evaluating the same expression several times, for example over the same
+grid at different stages of a computation, computes the same elementary
+functions on the same inputs again. When the cache is enabled:
+
+* the non-affine functions of **Affine** (*inv*, *sqrt*, *exp*, *log*,
+  *sin*, and the functions built on them) cache the triple
+  :math:`(\\alpha, \\zeta, \\delta)` of the affine constructor
+* the elementary functions of **Interval** (*sqrt*, *exp*, *log*, *sin*,
+  *cos*, *tan*, *cotan*, *cosh*, *sinh*, *tanh*) cache their result
+
+The triple of the affine constructor only depends on the interval
+associated to the affine form, so the keys are the function, the bounds
+of the interval, the precision *mp.prec* and the numeric backend (see
+**affapy.backend**): two affine forms with different noise symbols but
+the same interval share the same entry. The affine constructor is still
+called for each result, so each result gets its own new noise symbol.
+
+The cache is a LRU cache with a bounded number of entries, shared by
+**Affine** and **Interval**. The functions are instrumented only while
+the cache is enabled.
+
+**Example**:
+
+.. code-block:: python
+
+    from affapy import cache
+
+    cache.enable(maxsize=10000)
+    for _ in range(10):
+        f(x)
+    print(cache.info())
+    cache.disable()
+
+    with cache.memoize():
+        f(x)
+
+"""
+import functools
+from collections import OrderedDict
+from contextlib import ContextDecorator
+from mpmath import mp
+from affapy.aa import Affine
+from affapy.ia import Interval
+from affapy.error import affapyError
+import affapy.ia
+import affapy.stats
+
+AFFINE_FUNCTIONS = (
+    "_invTriple", "_sqrtTriple", "_expTriple", "_logTriple", "_sinTriple")
+
+INTERVAL_FUNCTIONS = (
+    "sqrt", "exp", "log", "sin", "cos", "tan", "cotan", "cosh", "sinh",
+    "tanh")
+
+
+class LRUCache:
+    """
+    Least recently used cache with a bounded number of entries.
+
+    It contains the fields:
+
+    * **maxsize**: maximal number of entries
+    * **hits**: number of successful lookups
+    * **misses**: number of failed lookups
+
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        """
+        Init the cache.
+
+        Args:
+            maxsize (int): maximal number of entries
+
+        Raises:
+            affapyError: maxsize must be positive
+
+        """
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self.resize(maxsize)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key, default=None):
+        """
+        Return the value of a key and mark it as recently used.
+
+        Args:
+            key (hashable): key
+            default: value returned if the key is missing
+
+        Returns:
+            the value of the key, or default
+
+        """
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """
+        Store the value of a key, and remove the least recently used entry
+        if the cache is full.
+
+        Args:
+            key (hashable): key
+            value: value
+
+        """
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def resize(self, maxsize: int):
+        """
+        Change the maximal number of entries, and remove the least
+        recently used entries in excess.
+
+        Args:
+            maxsize (int): maximal number of entries
+
+        Raises:
+            affapyError: maxsize must be positive
+
+        """
+        if maxsize <= 0:
+            raise affapyError("maxsize must be positive")
+        self.maxsize = maxsize
+        while len(self._data) > maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        """Remove all the entries and reset the hit/miss statistics."""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> dict:
+        """
+        Return the statistics of the cache.
+
+        Returns:
+            dict: fields *hits*, *misses*, *size* and *maxsize*
+
+        """
+        return {"hits": self.hits, "misses": self.misses,
+                "size": len(self._data), "maxsize": self.maxsize}
+
+
+# Cache used by the instrumented functions (None when disabled)
+_cache = None
+
+# Marker of a missing entry
+_MISSING = object()
+
+
+def _triple(name: str, func):
+    """Wrap a triple function of Affine to cache its result."""
+    @functools.wraps(func)
+    def wrapper(*args):
+        # affapy.ia.mpf is the scalar type of the current backend
+        key = (name, mp.prec, affapy.ia.mpf) + args
+        triple = _cache.get(key, _MISSING)
+        if triple is _MISSING:
+            triple = func(*args)
+            _cache.put(key, triple)
+        return triple
+    return wrapper
+
+
+def _interval(name: str, func):
+    """Wrap a function of Interval to cache its result."""
+    @functools.wraps(func)
+    def wrapper(self):
+        key = (name, mp.prec, affapy.ia.mpf, self.inf, self.sup)
+        result = _cache.get(key, _MISSING)
+        if result is _MISSING:
+            result = func(self)
+            _cache.put(key, result)
+        return result
+    return wrapper
+
+
+def enable(maxsize: int = 4096):
+    """
+    Enable the cache. If it is already enabled, its entries are kept and
+    its size bound is updated.
+
+    Args:
+        maxsize (int): maximal number of entries
+
+    Raises:
+        affapyError: maxsize must be positive
+
+    """
+    global _cache
+    if _cache is not None:
+        _cache.resize(maxsize)
+        return
+    _cache = LRUCache(maxsize)
+    for name in AFFINE_FUNCTIONS:
+        affapy.stats._install(__name__, Affine, name,
+                              functools.partial(_triple, name))
+    for name in INTERVAL_FUNCTIONS:
+        affapy.stats._install(__name__, Interval, name,
+                              functools.partial(_interval, name))
+
+
+def disable():
+    """Disable the cache and remove its entries."""
+    global _cache
+    affapy.stats._uninstall(__name__)
+    _cache = None
+
+
+def is_enabled() -> bool:
+    """Return True if the cache is enabled."""
+    return _cache is not None
+
+
+def clear():
+    """Remove the entries of the cache and reset its statistics."""
+    if _cache is not None:
+        _cache.clear()
+
+
+def info() -> dict:
+    """
+    Return the statistics of the cache. The dictionary contains the fields:
+
+    * **hits**: number of results found in the cache
+    * **misses**: number of results computed
+    * **size**: number of entries
+    * **maxsize**: maximal number of entries
+
+    Returns:
+        dict: statistics (zeros if the cache is disabled)
+
+    """
+    if _cache is None:
+        return {"hits": 0, "misses": 0, "size": 0, "maxsize": 0}
+    return _cache.info()
+
+
+class memoize(ContextDecorator):
+    """
+    Enable the cache in a portion of code. You can use it:
+
+    * As decorator of a function
+    * Using the *with* statement
+
+    The cache is disabled at the exit of the context, unless it was
+    already enabled at the entry. The statistics of the cache are stored
+    in the field **info** at the exit of the context.
+
+    **Example**:
+
+    .. code-block:: python
+
+        from affapy.cache import memoize
+
+        with memoize(maxsize=1000) as m:
+            f(x)
+            f(x)
+
+        m.info["hits"]
+
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        """
+        Init the context manager.
+
+        Args:
+            maxsize (int): maximal number of entries
+
+        """
+        self.maxsize = maxsize
+        self.info = None
+        self._enabled = False
+
+    def __enter__(self):
+        """Enable the cache."""
+        self._enabled = is_enabled()
+        if not self._enabled:
+            enable(self.maxsize)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Store the statistics and restore the state of the cache."""
+        self.info = info()
+        if not self._enabled:
+            disable()
+        return False
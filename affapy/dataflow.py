@@ -0,0 +1,357 @@
+"""
+This module traces a function into a dataflow graph, and evaluates the
+graph with affine forms, intervals or Taylor models.
+
+The function is called once with symbolic inputs (**Node**): each
+operator and each elementary function applied to a node adds a node to
+the graph, which records the operation and its arguments. The constants
+are kept in the arguments of the nodes. The nodes are recorded in
+topological order: the arguments of a node are before it.
+
+An evaluation of the graph keeps the value of each node. When some
+inputs change (see **Evaluation.update**), or after a change which only
+concerns some nodes (see **Evaluation.refresh**), only these nodes and the
+nodes depending on them are computed again: the values of the other
+nodes, with their noise symbols, are kept. A node whose new value is
+equal to its old value (same interval, or same affine form) keeps its old
+value, and the nodes depending only on unchanged nodes are not computed.
+
+The function must not depend on the values of its arguments (no
+comparison, no branch on a node).
+
+**Example**:
+
+.. code-block:: python
+
+    from affapy.dataflow import trace
+    from affapy.aa import Affine
+
+    graph = trace(lambda x, y: (x * y + 1).sqrt(), 2)
+    ev = graph.evaluate(Affine([1, 2]), Affine([3, 4]))
+    ev.outputs[0].interval
+    ev.update({1: Affine([3, 5])})  # number of computed nodes
+
+"""
+from affapy.aa import Affine
+from affapy.ia import Interval
+from affapy.error import affapyError
+
+# Operators and functions which can be traced
+OPERATORS = (
+    "__add__", "__radd__", "__sub__", "__rsub__", "__mul__", "__rmul__",
+    "__truediv__", "__rtruediv__", "__pow__", "__neg__", "__abs__")
+
+FUNCTIONS = (
+    "sqr", "inv", "sqrt", "exp", "log", "sin", "cos", "tan", "cotan",
+    "cosh", "sinh", "tanh")
+
+
+class Node:
+    """
+    Node of a dataflow graph. It contains the fields:
+
+    * **graph**: graph of the node
+    * **index**: position of the node in the graph
+    * **op**: name of the operation ("input", "const" or the name of the
+      method applied to the first argument)
+    * **args**: arguments of the operation (nodes or constants)
+    * **users**: nodes using this node as argument
+
+    The operators and the elementary functions of **Affine** applied to a
+    node return a new node of the same graph.
+
+    """
+
+    __slots__ = ("graph", "index", "op", "args", "users")
+
+    def __init__(self, graph: "Graph", op: str, args: tuple = ()):
+        """
+        Create a node and add it to a graph. Prefer the operators, or
+        **Graph.input** for the inputs.
+
+        Args:
+            graph (Graph): graph of the node
+            op (str): name of the operation
+            args (tuple): arguments
+
+        Raises:
+            affapyError: nodes of different graphs
+
+        """
+        for arg in args:
+            if isinstance(arg, Node):
+                if arg.graph is not graph:
+                    raise affapyError("nodes of different graphs")
+                arg.users.append(self)
+        self.graph = graph
+        self.index = len(graph.nodes)
+        self.op = op
+        self.args = args
+        self.users = []
+        graph.nodes.append(self)
+
+    def _unknown(self, *args):
+        """
+        Raises:
+            affapyError: the value of a node is unknown while tracing
+
+        """
+        raise affapyError("the value of a node is unknown while tracing")
+
+    __bool__ = __lt__ = __le__ = __gt__ = __ge__ = _unknown
+
+    def __repr__(self) -> str:
+        args = ", ".join("n{}".format(a.index) if isinstance(a, Node)
+                         else repr(a) for a in self.args)
+        return "n{} = {}({})".format(self.index, self.op.strip("_"), args)
+
+
+def _traced(name: str):
+    """Return a method of Node recording the operation name."""
+    def method(self, *args):
+        return Node(self.graph, name, (self,) + args)
+    method.__name__ = name
+    method.__doc__ = "Record the operation {}.".format(name)
+    return method
+
+
+for _name in OPERATORS + FUNCTIONS:
+    setattr(Node, _name, _traced(_name))
+
+
+class Graph:
+    """
+    Dataflow graph. It contains the fields:
+
+    * **nodes**: list of the nodes, in topological order
+    * **inputs**: list of the input nodes
+    * **outputs**: list of the output nodes
+
+    """
+
+    def __init__(self):
+        """Create an empty graph."""
+        self.nodes = []
+        self.inputs = []
+        self.outputs = []
+
+    def __len__(self) -> int:
+        """Return the number of nodes."""
+        return len(self.nodes)
+
+    def input(self) -> Node:
+        """
+        Add an input to the graph.
+
+        Returns:
+            Node: input node
+
+        """
+        node = Node(self, "input")
+        self.inputs.append(node)
+        return node
+
+    def downstream(self, nodes) -> list:
+        """
+        Return the nodes and the nodes depending on them, in topological
+        order.
+
+        Args:
+            nodes (iterable of Node): nodes
+
+        Returns:
+            list: list of Node
+
+        """
+        seen = set()
+        stack = list(nodes)
+        while stack:
+            node = stack.pop()
+            if node.index not in seen:
+                seen.add(node.index)
+                stack.extend(node.users)
+        return [self.nodes[i] for i in sorted(seen)]
+
+    def evaluate(self, *args, hook=None) -> "Evaluation":
+        """
+        Evaluate the graph.
+
+        Args:
+            args: values of the inputs
+            hook (function): function called with each node and its value,
+                which returns the value kept for the node (default: None)
+
+        Returns:
+            Evaluation: values of the nodes
+
+        Raises:
+            affapyError: wrong number of inputs
+
+        """
+        return Evaluation(self, args, hook)
+
+
+def _same(x, y) -> bool:
+    """Return True if two values of a node are known to be equal."""
+    if x is y:
+        return True
+    if type(x) is not type(y) or not isinstance(x, (Affine, Interval)):
+        return False
+    return x == y
+
+
+def trace(fn, n: int) -> Graph:
+    """
+    Trace a function into a dataflow graph.
+
+    Args:
+        fn (function): function of n arguments, which returns a value or a
+            tuple of values
+        n (int): number of arguments
+
+    Returns:
+        Graph: graph of the function
+
+    """
+    graph = Graph()
+    result = fn(*[graph.input() for _ in range(n)])
+    if not isinstance(result, (tuple, list)):
+        result = (result,)
+    for value in result:
+        if not isinstance(value, Node):
+            value = Node(graph, "const", (value,))
+        graph.outputs.append(value)
+    return graph
+
+
+class Evaluation:
+    """
+    Evaluation of a dataflow graph. It contains the fields:
+
+    * **graph**: graph
+    * **values**: list of the values of the nodes
+    * **hook**: function applied to the value of each node, or None
+    * **computed**: number of nodes computed by the last update (or by
+      the evaluation)
+    * **total**: number of nodes computed since the evaluation
+
+    """
+
+    def __init__(self, graph: Graph, args, hook=None):
+        """
+        Evaluate a graph.
+
+        Args:
+            graph (Graph): graph
+            args (sequence): values of the inputs
+            hook (function): function called with each node and its value,
+                which returns the value kept for the node (default: None)
+
+        Raises:
+            affapyError: wrong number of inputs
+
+        """
+        if len(args) != len(graph.inputs):
+            raise affapyError("the graph has {} inputs"
+                              .format(len(graph.inputs)))
+        self.graph = graph
+        self.hook = hook
+        self.values = [None] * len(graph.nodes)
+        self._args = dict(zip((x.index for x in graph.inputs), args))
+        for node in graph.nodes:
+            self._compute(node)
+        self.computed = self.total = len(graph.nodes)
+
+    def _compute(self, node: Node):
+        """Compute the value of a node from the values of its arguments."""
+        if node.op == "input":
+            value = self._args[node.index]
+        elif node.op == "const":
+            value = node.args[0]
+        else:
+            values = self.values
+            args = [values[a.index] if isinstance(a, Node) else a
+                    for a in node.args]
+            value = getattr(args[0], node.op)(*args[1:])
+        if self.hook is not None:
+            value = self.hook(node, value)
+        self.values[node.index] = value
+
+    def __getitem__(self, node: Node):
+        """Return the value of a node."""
+        return self.values[node.index]
+
+    @property
+    def outputs(self) -> list:
+        """Return the values of the outputs."""
+        return [self.values[node.index] for node in self.graph.outputs]
+
+    def _propagate(self, nodes) -> int:
+        """
+        Compute again the nodes, and the nodes depending on a node whose
+        value changed, in topological order.
+        """
+        values = self.values
+        dirty = set(node.index for node in nodes)
+        count = 0
+        for node in self.graph.downstream(nodes):
+            if node.index not in dirty and not any(
+                    isinstance(a, Node) and a.index in dirty
+                    for a in node.args):
+                continue
+            old = values[node.index]
+            self._compute(node)
+            count += 1
+            if _same(old, values[node.index]):
+                values[node.index] = old
+                dirty.discard(node.index)
+            else:
+                dirty.add(node.index)
+        self.computed = count
+        self.total += count
+        return count
+
+    def update(self, inputs: dict) -> int:
+        """
+        Change the values of some inputs, and compute again the nodes
+        depending on them. The inputs whose value does not change are
+        ignored.
+
+        Args:
+            inputs (dict): new values (Affine, Interval, ...) indexed by the
+                input nodes or by the positions of the inputs
+
+        Returns:
+            int: number of computed nodes
+
+        Raises:
+            affapyError: the node is not an input of the graph
+
+        """
+        changed = []
+        for key, value in inputs.items():
+            if isinstance(key, Node):
+                node = key
+                if node.graph is not self.graph or node.op != "input":
+                    raise affapyError("{!r} is not an input of the graph"
+                                      .format(node))
+            else:
+                node = self.graph.inputs[key]
+            if not _same(self._args[node.index], value):
+                self._args[node.index] = value
+                changed.append(node)
+        return self._propagate(changed)
+
+    def refresh(self, nodes) -> int:
+        """
+        Compute again the nodes and the nodes depending on them, for
+        example after a change of the hook for these nodes.
+
+        Args:
+            nodes (iterable of Node): changed nodes
+
+        Returns:
+            int: number of computed nodes
+
+        """
+        return self._propagate(list(nodes))
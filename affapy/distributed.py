@@ -0,0 +1,508 @@
+"""
+This module evaluates a function over a grid of boxes with workers on
+several hosts.
+
+A **Coordinator** owns the boxes and a scheduler, served by a
+:class:`multiprocessing.managers.BaseManager` on a TCP address. The
+workers (**run_worker**) connect to this address from any host:
+
+* the function, the model and the precision are pickled once by the
+  coordinator and sent to each worker when it connects
+* the boxes are sent by chunks: a worker takes a chunk, evaluates it and
+  sends back its enclosures
+* each chunk taken by a worker is leased: the worker renews its leases
+  while it is alive, and the chunks of a lost worker (crash, network
+  failure) are given to the other workers when their lease expires
+* the enclosures are yielded as soon as a chunk is evaluated, and merged
+  in the order of the boxes by **Coordinator.evaluate**
+
+As with **affapy.parallel**, the function must be picklable, i.e. defined
+at the top level of a module which can be imported by the workers. The
+connections are authenticated with a shared key.
+
+**Example**:
+
+.. code-block:: python
+
+    from affapy.distributed import Coordinator
+
+    with Coordinator(fct, model="aa", address=("0.0.0.0", 5000),
+                     authkey=b"secret") as coord:
+        coord.spawn(4)  # local workers, optional
+        itvs = coord.evaluate(boxes)
+
+and on each other host:
+
+.. code-block:: python
+
+    from affapy.distributed import run_worker
+
+    run_worker(("coordinator-host", 5000), b"secret")
+
+"""
+import itertools
+import os
+import pickle
+import socket
+import threading
+import multiprocessing
+from collections import deque
+from multiprocessing.managers import BaseManager
+from time import monotonic
+from affapy.error import affapyError
+import affapy.box
+import affapy.parallel
+from mpmath import mp
+from mpmath.libmp import dps_to_prec
+
+
+class _Scheduler:
+    """
+    Queue of the chunks of boxes and of their enclosures, living in the
+    server process of the coordinator. The workers and the coordinator
+    use it through proxies, from several threads.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._job = None
+        self._lease = 10.
+        self._queue = deque()
+        self._chunks = {}
+        self._leases = {}
+        self._results = []
+        self._errors = []
+        self._workers = {}
+        self._requeued = 0
+        self._closed = False
+
+    def configure(self, job: bytes, lease: float):
+        """Set the pickled job (fn, model, prec, order) and the lease
+        duration."""
+        with self._cond:
+            self._job = job
+            self._lease = lease
+
+    def job(self) -> bytes:
+        """Return the pickled job."""
+        return self._job
+
+    def submit(self, chunk: int, boxes: list):
+        """Add a chunk of boxes to the queue."""
+        with self._cond:
+            self._chunks[chunk] = boxes
+            self._queue.append(chunk)
+            self._cond.notify_all()
+
+    def _expire(self):
+        """Give the chunks whose lease expired to the other workers."""
+        now = monotonic()
+        for chunk, (worker, deadline) in list(self._leases.items()):
+            if deadline < now:
+                del self._leases[chunk]
+                self._queue.appendleft(chunk)
+                self._requeued += 1
+                self._cond.notify_all()
+
+    def take(self, worker: str, timeout: float):
+        """
+        Lease a chunk to a worker, waiting at most timeout seconds.
+        Return (chunk, boxes), or None if no chunk is available.
+        """
+        end = monotonic() + timeout
+        with self._cond:
+            self._workers[worker] = monotonic()
+            while True:
+                self._expire()
+                while self._queue:
+                    chunk = self._queue.popleft()
+                    if chunk in self._chunks:
+                        self._leases[chunk] = (worker,
+                                               monotonic() + self._lease)
+                        return chunk, self._chunks[chunk]
+                left = end - monotonic()
+                if self._closed or left <= 0:
+                    return None
+                self._cond.wait(min(left, self._lease))
+
+    def renew(self, worker: str):
+        """Extend the leases of a worker."""
+        with self._cond:
+            now = monotonic()
+            self._workers[worker] = now
+            for chunk, (owner, deadline) in self._leases.items():
+                if owner == worker:
+                    self._leases[chunk] = (owner, now + self._lease)
+
+    def put(self, worker: str, chunk: int, itvs: list):
+        """Store the enclosures of a chunk (only the first ones)."""
+        with self._cond:
+            self._workers[worker] = monotonic()
+            if self._chunks.pop(chunk, None) is not None:
+                self._leases.pop(chunk, None)
+                self._results.append((chunk, itvs))
+                self._cond.notify_all()
+
+    def fail(self, worker: str, chunk: int, message: str):
+        """Report the failure of the evaluation of a chunk."""
+        with self._cond:
+            self._errors.append("worker {}, chunk {}: {}"
+                                .format(worker, chunk, message))
+            self._cond.notify_all()
+
+    def collect(self, timeout: float) -> tuple:
+        """
+        Wait at most timeout seconds for results. Return the list of
+        (chunk, enclosures) and the list of errors.
+        """
+        end = monotonic() + timeout
+        with self._cond:
+            while not self._results and not self._errors:
+                self._expire()
+                left = end - monotonic()
+                if left <= 0:
+                    break
+                self._cond.wait(min(left, self._lease))
+            results, self._results = self._results, []
+            errors, self._errors = self._errors, []
+            return results, errors
+
+    def cancel(self):
+        """Remove the chunks and the results which are not used yet."""
+        with self._cond:
+            self._results.clear()
+            self._errors.clear()
+            self._queue.clear()
+            self._chunks.clear()
+            self._leases.clear()
+
+    def close(self):
+        """Stop the workers when they ask for a chunk."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def closed(self) -> bool:
+        """Return True if the coordinator is closed."""
+        return self._closed
+
+    def stats(self) -> dict:
+        """Return the statistics of the scheduler."""
+        with self._cond:
+            return {"workers": len(self._workers),
+                    "pending": len(self._chunks),
+                    "leased": len(self._leases),
+                    "requeued": self._requeued}
+
+
+# Scheduler of the server process
+_scheduler = None
+
+
+def _getScheduler() -> _Scheduler:
+    """Return the scheduler of the server process."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = _Scheduler()
+    return _scheduler
+
+
+class _Manager(BaseManager):
+    """Manager serving the scheduler."""
+
+
+_Manager.register("scheduler", callable=_getScheduler)
+
+
+def _connect(address, authkey: bytes):
+    """Connect to a coordinator and return the proxy of its scheduler."""
+    manager = _Manager(address=tuple(address), authkey=authkey)
+    manager.connect()
+    return manager.scheduler()
+
+
+def run_worker(address, authkey: bytes, name: str = None,
+               poll: float = 1.) -> int:
+    """
+    Run a worker: evaluate the chunks of a coordinator until it is
+    closed or unreachable.
+
+    Args:
+        address (tuple): host and port of the coordinator
+        authkey (bytes): authentication key of the coordinator
+        name (str): name of the worker (default: host and pid)
+        poll (float): maximal waiting time for a chunk, in seconds
+
+    Returns:
+        int: number of evaluated chunks
+
+    """
+    name = name or "{}:{}".format(socket.gethostname(), os.getpid())
+    scheduler = _connect(address, authkey)
+    fn, model, prec, order, lease = pickle.loads(scheduler.job())
+    stop = threading.Event()
+
+    def heartbeat():
+        while not stop.wait(lease / 3):
+            try:
+                scheduler.renew(name)
+            except (OSError, EOFError):
+                return
+
+    thread = threading.Thread(target=heartbeat, daemon=True)
+    thread.start()
+    count = 0
+    try:
+        with mp.workprec(prec):
+            while True:
+                task = scheduler.take(name, poll)
+                if task is None:
+                    if scheduler.closed():
+                        break
+                    continue
+                chunk, boxes = task
+                try:
+                    itvs = affapy.parallel._evalBoxes(fn, model, boxes,
+                                                      order)
+                except Exception as exc:
+                    scheduler.fail(name, chunk, repr(exc))
+                    continue
+                scheduler.put(name, chunk, itvs)
+                count += 1
+    except (OSError, EOFError):
+        pass
+    finally:
+        stop.set()
+    return count
+
+
+class Coordinator:
+    """
+    Evaluate a function over boxes with remote workers.
+    It can be used with the *with* statement, which starts and shutdowns
+    the server.
+
+    It contains the fields:
+
+    * **fn**: the evaluated function
+    * **model**: *aa*, *ia* or *tm*
+    * **prec**: binary precision used by the workers
+    * **order**: order of the Taylor models of the model *tm*
+    * **address**: address of the server (the port is known once the
+      server is started)
+    * **authkey**: authentication key of the server
+    * **chunksize**: number of boxes sent to a worker at once
+    * **lease**: number of seconds before the chunk of a silent worker
+      is given to another worker
+    * **timeout**: maximal number of seconds without any result, or None
+
+    """
+
+    def __init__(self, fn, model: str = "aa", address=("127.0.0.1", 0),
+                 authkey: bytes = None, chunksize: int = 16,
+                 lease: float = 10., timeout: float = None,
+                 dps: int = None, prec: int = None, order: int = 5):
+        """
+        Init the coordinator. The precision is the current *mpmath*
+        precision unless dps or prec is given.
+
+        Args:
+            fn (function): picklable function
+            model (str): *aa*, *ia* or *tm* (default: *aa*)
+            address (tuple): host and port of the server (default: a free
+                port of localhost)
+            authkey (bytes): authentication key (default: random)
+            chunksize (int): number of boxes per chunk
+            lease (float): lease duration of a chunk in seconds
+            timeout (float): maximal number of seconds without any result
+                (default: no limit)
+            dps (int): decimal precision of the workers
+            prec (int): binary precision of the workers
+            order (int): order of the Taylor models of the model *tm*
+                (default: 5)
+
+        Raises:
+            affapyError: model must be 'aa', 'ia' or 'tm'
+            affapyError: chunksize and lease must be positive
+            affapyError: the function must be picklable
+
+        """
+        if model not in ("aa", "ia", "tm"):
+            raise affapyError("model must be 'aa', 'ia' or 'tm'")
+        if chunksize < 1 or lease <= 0:
+            raise affapyError("chunksize and lease must be positive")
+        if prec is None:
+            prec = mp.prec
+            if dps is not None:
+                prec = dps_to_prec(dps)
+        try:
+            self._job = pickle.dumps((fn, model, prec, order, lease))
+        except (pickle.PicklingError, AttributeError, TypeError) as exc:
+            raise affapyError("the function must be picklable: {}"
+                              .format(exc))
+        self.fn = fn
+        self.model = model
+        self.prec = prec
+        self.order = order
+        self.address = tuple(address)
+        self.authkey = authkey or os.urandom(16)
+        self.chunksize = chunksize
+        self.lease = lease
+        self.timeout = timeout
+        self._manager = None
+        self._scheduler = None
+        self._processes = []
+        self._chunks = itertools.count()
+
+    def __enter__(self):
+        """Start the server."""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Shutdown the server and the spawned workers."""
+        self.shutdown()
+        return False
+
+    def start(self):
+        """Start the server of the scheduler."""
+        if self._manager is None:
+            self._manager = _Manager(address=self.address,
+                                     authkey=self.authkey)
+            self._manager.start()
+            self.address = self._manager.address
+            self._scheduler = self._manager.scheduler()
+            self._scheduler.configure(self._job, self.lease)
+
+    def shutdown(self, wait: float = 5.):
+        """
+        Close the scheduler, wait for the spawned workers and stop the
+        server.
+
+        Args:
+            wait (float): maximal waiting time of each spawned worker
+
+        """
+        if self._manager is None:
+            return
+        self._scheduler.close()
+        for process in self._processes:
+            process.join(wait)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+        self._scheduler = None
+        self._manager.shutdown()
+        self._manager = None
+
+    def spawn(self, n: int = None) -> list:
+        """
+        Start workers on the local host.
+
+        Args:
+            n (int): number of workers (default: number of cores)
+
+        Returns:
+            list: list of multiprocessing.Process
+
+        """
+        self.start()
+        processes = []
+        for _ in range(n or os.cpu_count() or 1):
+            process = multiprocessing.Process(
+                target=run_worker, args=(self.address, self.authkey),
+                daemon=True)
+            process.start()
+            processes.append(process)
+        self._processes.extend(processes)
+        return processes
+
+    def stats(self) -> dict:
+        """
+        Return the statistics of the scheduler. The dictionary contains
+        the fields:
+
+        * **workers**: number of workers seen
+        * **pending**: number of chunks not evaluated yet
+        * **leased**: number of chunks being evaluated
+        * **requeued**: number of chunks given again after a lost lease
+
+        Returns:
+            dict: statistics
+
+        """
+        self.start()
+        return self._scheduler.stats()
+
+    def map(self, boxes, window: int = 64):
+        """
+        Evaluate the function over the boxes. The boxes can be given by
+        an iterator: at most window chunks are queued at once. The chunks
+        are yielded as soon as they are evaluated, not in order.
+
+        Args:
+            boxes (iterable): boxes
+            window (int): maximal number of queued chunks
+
+        Yields:
+            tuple: index of the first box of the chunk and the list of
+            its enclosures (Interval)
+
+        Raises:
+            affapyError: the evaluation of a chunk failed
+            affapyError: no result before the timeout
+
+        """
+        self.start()
+        scheduler = self._scheduler
+        it = iter(boxes)
+        starts = {}
+        start = 0
+        try:
+            while True:
+                while len(starts) < window:
+                    chunk = [affapy.box.normalize(box) for box in
+                             itertools.islice(it, self.chunksize)]
+                    if not chunk:
+                        break
+                    key = next(self._chunks)
+                    starts[key] = start
+                    scheduler.submit(key, chunk)
+                    start += len(chunk)
+                if not starts:
+                    break
+                results, errors, idle = [], [], monotonic()
+                while not results and not errors:
+                    results, errors = scheduler.collect(
+                        min(self.lease, 1.))
+                    if (self.timeout is not None and not results
+                            and monotonic() - idle > self.timeout):
+                        raise affapyError("no result before the timeout")
+                if errors:
+                    raise affapyError("evaluation failed: " + errors[0])
+                for key, itvs in results:
+                    if key in starts:
+                        yield starts.pop(key), itvs
+        finally:
+            if starts:
+                scheduler.cancel()
+
+    def evaluate(self, boxes) -> list:
+        """
+        Evaluate the function over the boxes.
+
+        Args:
+            boxes (iterable): boxes
+
+        Returns:
+            list: list of Interval, the enclosures in the order of the boxes
+
+        Raises:
+            affapyError: the evaluation of a chunk failed
+            affapyError: no result before the timeout
+
+        """
+        result = {}
+        for start, itvs in self.map(boxes):
+            result[start] = itvs
+        return [itv for start in sorted(result) for itv in result[start]]
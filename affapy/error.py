@@ -11,3 +11,8 @@ class affapyError(Exception):
 class affapyWarning(UserWarning):
     """Manage warnings."""
     pass
+
+
+class affapyNoiseWarning(affapyWarning):
+    """Manage warnings about the growth of noise symbols."""
+    pass
@@ -0,0 +1,365 @@
+"""
+This module computes the fixed-point formats of the signals of a dataflow
+graph (see **affapy.dataflow**) with a range analysis in affine
+arithmetic.
+
+A signal in the format *(msb, frac)* is a two's complement number with a
+sign bit, *msb* integer bits and *frac* fractional bits: its word length
+is *1 + msb + frac*, and it represents the numbers of
+:math:`[-2^{msb}, 2^{msb} - 2^{-frac}]` with the step :math:`2^{-frac}`.
+
+The rounding to nearest of a signal to *frac* fractional bits adds an
+error of :math:`[-2^{-frac-1}, 2^{-frac-1}]`, modeled by a noise symbol
+with the coefficient :math:`2^{-frac-1}`. The noise symbol of a signal is
+kept when its format changes.
+
+Each signal is represented by its exact value and its error (the
+difference between the quantized and the exact values), two affine forms.
+The errors are propagated with their correlations:
+
+* exactly by the linear operations
+* by :math:`Q_x E_y + V_y E_x` for a product, with the quantized values
+  :math:`Q`, the exact values :math:`V` and the errors :math:`E`
+* by the mean value theorem for the other operations: the derivatives
+  are enclosed (see **affapy.ad**) between the exact and the quantized
+  values
+
+The *msb* of each signal is computed from the enclosure of the quantized
+signal, and its error from the enclosure of its error.
+
+When the format of some signals changes, only the nodes depending on them
+are computed again.
+
+**Example**:
+
+.. code-block:: python
+
+    from affapy.dataflow import trace
+    from affapy.fixedpoint import search
+
+    graph = trace(lambda x, y: x * y - 2 * x, 2)
+    fp = search(graph, [[-1, 1], [0, 4]], error=1e-3)
+    fp.formats()
+
+"""
+import mpmath
+import affapy.aa
+from affapy.aa import Affine
+from affapy.ia import Interval
+from affapy.ad import Dual
+from affapy.dataflow import OPERATORS, FUNCTIONS
+from affapy.error import affapyError
+
+
+def _exponent(v, strict: bool) -> int:
+    """Return the smallest m with v < 2^m (strict) or v <= 2^m."""
+    man, exp = mpmath.frexp(mpmath.mpf(v))
+    if not strict and man == 0.5:
+        return int(exp) - 1
+    return int(exp)
+
+
+def msb(x: Interval) -> int:
+    """
+    Return the number of integer bits of a two's complement number
+    containing an interval: the smallest *m* such that
+    :math:`x \\subseteq [-2^m, 2^m)`.
+
+    Args:
+        x (Interval): range of the signal
+
+    Returns:
+        int: number of integer bits (can be negative), None if x = [0, 0]
+
+    Raises:
+        affapyError: the range must be bounded
+
+    Examples:
+        >>> msb(Interval(-4, 3.5))
+        2
+
+    """
+    if not (mpmath.isfinite(mpmath.mpf(x.inf))
+            and mpmath.isfinite(mpmath.mpf(x.sup))):
+        raise affapyError("the range must be bounded")
+    bits = []
+    if x.sup > 0:
+        bits.append(_exponent(x.sup, True))
+    if x.inf < 0:
+        bits.append(_exponent(-x.inf, False))
+    return max(bits) if bits else None
+
+
+def _affine(x) -> Affine:
+    """Convert an input (range, Interval or Affine) to an affine form."""
+    if isinstance(x, Affine):
+        return x
+    if isinstance(x, Interval):
+        return Affine([x.inf, x.sup])
+    return Affine(x)
+
+
+def _hull(x: Interval, y: Interval) -> Interval:
+    """Return the smallest interval containing x and y."""
+    return Interval(min(x.inf, y.inf), max(x.sup, y.sup))
+
+
+def _times(error: Affine, der) -> Affine:
+    """Multiply an error by the enclosure of a derivative."""
+    if isinstance(der, Interval):
+        der = Affine([der.inf, der.sup])
+    return error * der
+
+
+class _Signal:
+    """Exact value and error of a signal, two affine forms."""
+
+    __slots__ = ("exact", "error")
+
+    def __init__(self, exact: Affine, error: Affine):
+        self.exact = exact
+        self.error = error
+
+    @property
+    def value(self) -> Affine:
+        """Return the quantized value."""
+        return self.exact + self.error
+
+
+# Operations whose errors are the operations of the errors
+_LINEAR = ("__add__", "__radd__", "__sub__", "__rsub__", "__neg__")
+
+
+def _propagate(op: str, args: tuple) -> _Signal:
+    """Apply an operation to signals and constants."""
+    signals = [a for a in args if isinstance(a, _Signal)]
+    exact = [a.exact if isinstance(a, _Signal) else a for a in args]
+    value = getattr(exact[0], op)(*exact[1:])
+    if op in _LINEAR:
+        errors = [a.error if isinstance(a, _Signal) else 0 for a in args]
+        error = getattr(errors[0], op)(*errors[1:])
+    elif op in ("__mul__", "__rmul__") and len(signals) == 2:
+        x, y = args
+        error = x.value * y.error + y.exact * x.error
+    elif op in ("__mul__", "__rmul__", "__truediv__") and len(signals) == 1:
+        error = getattr(args[0].error, op)(args[1])
+    else:
+        duals, k = [], 0
+        for a in args:
+            if isinstance(a, _Signal):
+                unit = (0,) * k + (1,)
+                duals.append(Dual(_hull(a.exact.interval, a.value.interval),
+                                  unit))
+                k += 1
+            else:
+                duals.append(a)
+        der = getattr(duals[0], op)(*duals[1:]).der
+        error = Affine()
+        for d, x in zip(der, signals):
+            error += _times(x.error, d)
+    return _Signal(value, error)
+
+
+def _signalOp(name: str):
+    """Return a method of _Signal applying the operation name."""
+    def method(self, *args):
+        return _propagate(name, (self,) + args)
+    method.__name__ = name
+    return method
+
+
+for _name in OPERATORS + FUNCTIONS:
+    setattr(_Signal, _name, _signalOp(_name))
+
+
+class FixedPoint:
+    """
+    Fixed-point formats of the signals of a dataflow graph. It contains
+    the fields:
+
+    * **graph**: dataflow graph
+    * **frac**: dictionary of the fractional bits of the quantized nodes
+    * **evaluation**: evaluation of the graph with the quantization errors
+
+    The constants are not quantized.
+
+    """
+
+    def __init__(self, graph, inputs, frac=None):
+        """
+        Evaluate a graph with quantized signals.
+
+        Args:
+            graph (Graph): dataflow graph
+            inputs (list): ranges [inf, sup], Interval or Affine of the
+                inputs
+            frac (int or dict): fractional bits of all the signals, or
+                dictionary of the fractional bits of some nodes (default:
+                no quantization)
+
+        Raises:
+            affapyError: wrong number of inputs
+
+        """
+        self.graph = graph
+        self.frac = {}
+        self._symbols = {}
+        if isinstance(frac, int):
+            frac = dict.fromkeys(self.signals(), frac)
+        for node, bits in (frac or {}).items():
+            self._setFrac(node, bits)
+        self.evaluation = graph.evaluate(
+            *[_Signal(_affine(x), Affine()) for x in inputs],
+            hook=self._quantize)
+
+    def signals(self) -> list:
+        """Return the nodes which can be quantized (not constants)."""
+        return [node for node in self.graph.nodes if node.op != "const"]
+
+    def _setFrac(self, node, bits: int):
+        """Set the fractional bits of a node (None: not quantized)."""
+        if bits is None:
+            self.frac.pop(node, None)
+            return
+        if node.op == "const":
+            raise affapyError("the constants are not quantized")
+        if node not in self._symbols:
+            self._symbols[node] = Affine._getNewXi()
+        self.frac[node] = bits
+
+    def _quantize(self, node, value):
+        """Add the quantization error of a node to its error."""
+        bits = self.frac.get(node)
+        if bits is None:
+            return value
+        q = affapy.aa.mp.mpf(2) ** (-bits - 1)
+        return _Signal(value.exact,
+                       value.error + Affine(x0=0, xi={self._symbols[node]: q}))
+
+    def update(self, frac: dict) -> int:
+        """
+        Change the fractional bits of some nodes, and compute again the
+        nodes depending on them.
+
+        Args:
+            frac (dict): fractional bits of the nodes (None: not
+                quantized)
+
+        Returns:
+            int: number of computed nodes
+
+        Raises:
+            affapyError: the constants are not quantized
+
+        """
+        changed = [node for node, bits in frac.items()
+                   if self.frac.get(node) != bits]
+        for node in changed:
+            self._setFrac(node, frac[node])
+        return self.evaluation.refresh(changed)
+
+    def range(self, node) -> Interval:
+        """Return the range of the quantized value of a node."""
+        value = self.evaluation[node]
+        if isinstance(value, _Signal):
+            return value.value.interval
+        return Interval(value, value)
+
+    def msb(self, node) -> int:
+        """Return the number of integer bits of a node."""
+        return msb(self.range(node))
+
+    def error(self, node) -> mpmath.mpf:
+        """
+        Return the bound of the quantization error of a node.
+
+        Args:
+            node (Node): node
+
+        Returns:
+            mpf: bound of the absolute value of the error
+
+        """
+        value = self.evaluation[node]
+        if not isinstance(value, _Signal):
+            return 0
+        err = value.error.interval
+        return max(-err.inf, err.sup)
+
+    def formats(self) -> dict:
+        """
+        Return the formats of the quantized nodes.
+
+        Returns:
+            dict: (msb, frac) of each quantized node
+
+        """
+        return {node: (self.msb(node), bits)
+                for node, bits in self.frac.items()}
+
+    def bits(self) -> int:
+        """
+        Return the total word length of the quantized nodes. The signals
+        always equal to zero have no bit.
+
+        Returns:
+            int: sum of 1 + msb + frac
+
+        """
+        total = 0
+        for m, bits in self.formats().values():
+            if m is not None:
+                total += max(1 + m + bits, 1)
+        return total
+
+
+def search(graph, inputs, error, max_frac: int = 64,
+           min_frac: int = 0) -> FixedPoint:
+    """
+    Search the fractional bits of the signals of a graph such that the
+    quantization error of each output is lower than a bound:
+
+    * the smallest uniform number of fractional bits is found by
+      bisection
+    * then the fractional bits of each signal, from the outputs to the
+      inputs, are decreased while the bound holds: each trial only
+      computes again the nodes depending on the signal
+
+    Args:
+        graph (Graph): dataflow graph
+        inputs (list): ranges [inf, sup], Interval or Affine of the inputs
+        error (int or float or mpf): bound of the error of the outputs
+        max_frac (int): maximal number of fractional bits
+        min_frac (int): minimal number of fractional bits
+
+    Returns:
+        FixedPoint: formats of the signals
+
+    Raises:
+        affapyError: the bound cannot be reached with max_frac bits
+
+    """
+    fp = FixedPoint(graph, inputs, max_frac)
+    signals = fp.signals()
+
+    def valid():
+        return all(fp.error(node) <= error for node in graph.outputs)
+
+    if not valid():
+        raise affapyError("the bound cannot be reached with max_frac bits")
+    low, high = min_frac, max_frac
+    while low < high:
+        mid = (low + high) // 2
+        fp.update(dict.fromkeys(signals, mid))
+        if valid():
+            high = mid
+        else:
+            low = mid + 1
+    fp.update(dict.fromkeys(signals, high))
+    for node in reversed(signals):
+        while fp.frac[node] > min_frac:
+            fp.update({node: fp.frac[node] - 1})
+            if not valid():
+                fp.update({node: fp.frac[node] + 1})
+                break
+    return fp
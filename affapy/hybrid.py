@@ -0,0 +1,264 @@
+"""
+This module evaluates a function over boxes with the cheapest model, IA
+or AA, which gives the required accuracy.
+
+IA is faster than AA (see **example2**), but its enclosures widen faster
+with the width of the box (see **example4**): on small boxes, IA is often
+accurate enough, on large boxes AA is needed. The **HybridEvaluator**
+class evaluates each box:
+
+* with IA first: the enclosure is accepted if its width is lower than
+  :math:`atol + rtol \\cdot w`, where *w* is the largest width of the
+  intervals of the box
+* with AA otherwise: the result is the intersection of the IA and AA
+  enclosures, both valid
+
+and learns, for each function, the box width beyond which IA is not worth
+trying (**Crossover**). Trying IA first costs :math:`t_{IA}` more, and
+saves :math:`t_{AA}` with the probability *p* that IA is accurate
+enough: it is worth it while :math:`p > t_{IA} / t_{AA}`. The
+probabilities are estimated for each power of two of the box width, and
+the times of the models are measured. The boxes wider than the crossover
+are evaluated with AA directly, except one box in *explore*, which still
+tries IA so that the crossover follows the function.
+
+The crossovers are shared by the evaluators of the same function (see
+**learned**).
+
+**Example**:
+
+.. code-block:: python
+
+    from affapy.hybrid import HybridEvaluator
+
+    ev = HybridEvaluator(fct, atol=1e-3)
+    itvs = ev.evaluate(boxes)
+    print(ev.counts, ev.crossover.width())
+
+"""
+import math
+import weakref
+from time import perf_counter
+from affapy.error import affapyError
+from affapy.ia import Interval
+import affapy.box
+
+
+class Crossover:
+    """
+    Crossover box width between IA and AA, learned from the evaluations
+    of a function. It contains the fields:
+
+    * **bins**: dictionary exponent *e* -> [number of accurate IA
+      enclosures, number of IA evaluations] of the boxes with widths in
+      :math:`[2^e, 2^{e+1})`
+    * **times**: dictionary model -> [total time, number of evaluations]
+    * **min_samples**: number of IA evaluations needed to trust a bin
+
+    """
+
+    def __init__(self, min_samples: int = 4):
+        """
+        Init the crossover, without observations: IA is tried on all the
+        boxes.
+
+        Args:
+            min_samples (int): number of IA evaluations needed to trust
+                a bin
+
+        """
+        self.bins = {}
+        self.times = {"ia": [0., 0], "aa": [0., 0]}
+        self.min_samples = min_samples
+
+    @staticmethod
+    def _bin(width) -> int:
+        """Return the exponent of the bin of a box width."""
+        if width <= 0:
+            return -1075
+        if math.isinf(width):
+            return 1024
+        return math.frexp(float(width))[1] - 1
+
+    def record(self, width, accurate: bool):
+        """
+        Record an IA evaluation.
+
+        Args:
+            width (float or mpf): width of the box
+            accurate (bool): True if the IA enclosure was accurate enough
+
+        """
+        counts = self.bins.setdefault(self._bin(width), [0, 0])
+        counts[0] += bool(accurate)
+        counts[1] += 1
+
+    def timing(self, model: str, seconds: float):
+        """
+        Record the time of an evaluation.
+
+        Args:
+            model (str): *ia* or *aa*
+            seconds (float): time of the evaluation
+
+        """
+        t = self.times[model]
+        t[0] += seconds
+        t[1] += 1
+
+    def ratio(self) -> float:
+        """
+        Return the ratio of the mean times of IA and AA, or 0 before
+        both models are measured.
+        """
+        (tia, nia), (taa, naa) = self.times["ia"], self.times["aa"]
+        if not nia or not naa or taa <= 0:
+            return 0.
+        return (tia / nia) / (taa / naa)
+
+    def width(self) -> float:
+        """
+        Return the crossover box width: the upper bound of the bins
+        before the first bin where IA is not worth trying.
+
+        Returns:
+            float: crossover width (inf if IA is always worth trying)
+
+        """
+        ratio = self.ratio()
+        for e in sorted(self.bins):
+            accurate, total = self.bins[e]
+            if total >= self.min_samples and accurate <= ratio * total:
+                return math.ldexp(1., e)
+        return math.inf
+
+    def use_ia(self, width) -> bool:
+        """Return True if IA is worth trying on a box of this width."""
+        return width < self.width()
+
+
+# Crossovers of the functions
+_crossovers = weakref.WeakKeyDictionary()
+
+
+def learned(fn) -> Crossover:
+    """
+    Return the crossover learned for a function, shared by its
+    evaluators.
+
+    Args:
+        fn (function): function
+
+    Returns:
+        Crossover: crossover of the function (not shared if the function
+        cannot be weakly referenced)
+
+    """
+    try:
+        return _crossovers.setdefault(fn, Crossover())
+    except TypeError:
+        return Crossover()
+
+
+def _intersection(x: Interval, y: Interval) -> Interval:
+    """Return the intersection of two enclosures of the same value."""
+    return Interval(max(x.inf, y.inf), min(x.sup, y.sup))
+
+
+class HybridEvaluator:
+    """
+    Evaluate a function over boxes with IA or AA. It contains the fields:
+
+    * **fn**: the evaluated function
+    * **atol**: absolute width of an accurate enclosure
+    * **rtol**: width of an accurate enclosure relative to the width of
+      the box
+    * **explore**: one box in explore wider than the crossover still
+      tries IA
+    * **crossover**: learned crossover (Crossover)
+    * **counts**: number of boxes accepted with IA (*ia*), evaluated with
+      AA after IA (*fallback*), evaluated with AA directly (*aa*)
+
+    """
+
+    def __init__(self, fn, atol=0, rtol=1, explore: int = 16,
+                 crossover: Crossover = None):
+        """
+        Init the evaluator.
+
+        Args:
+            fn (function): evaluated function
+            atol (int or float or mpf): absolute width of an accurate
+                enclosure
+            rtol (int or float or mpf): width of an accurate enclosure
+                relative to the width of the box
+            explore (int): period of the IA trials of the boxes wider
+                than the crossover (0: never)
+            crossover (Crossover): crossover (default: the crossover
+                shared by the evaluators of fn)
+
+        Raises:
+            affapyError: atol, rtol and explore must be positive
+
+        """
+        if atol < 0 or rtol < 0 or explore < 0:
+            raise affapyError("atol, rtol and explore must be positive")
+        self.fn = fn
+        self.atol = atol
+        self.rtol = rtol
+        self.explore = explore
+        self.crossover = crossover or learned(fn)
+        self.counts = {"ia": 0, "fallback": 0, "aa": 0}
+        self._skipped = 0
+
+    def _eval(self, box: tuple, model: str) -> Interval:
+        """Evaluate a box with a model, and record the time."""
+        tstart = perf_counter()
+        itv = affapy.box.bounds(self.fn(*affapy.box.inputs(box, model)))
+        self.crossover.timing(model, perf_counter() - tstart)
+        return itv
+
+    def evaluate_box(self, box) -> tuple:
+        """
+        Evaluate the function over a box with the cheapest model.
+
+        Args:
+            box (list or tuple): box
+
+        Returns:
+            tuple: enclosure (Interval) and model used (*ia* or *aa*)
+
+        """
+        box = affapy.box.normalize(box)
+        width = max(affapy.box.widths(box))
+        tol = self.atol + self.rtol * width
+        trial = self.crossover.use_ia(width)
+        if not trial and self.explore:
+            self._skipped += 1
+            if self._skipped >= self.explore:
+                self._skipped = 0
+                trial = True
+        if trial:
+            ia = self._eval(box, "ia")
+            accurate = ia.width() <= tol
+            self.crossover.record(width, accurate)
+            if accurate:
+                self.counts["ia"] += 1
+                return ia, "ia"
+            self.counts["fallback"] += 1
+            return _intersection(ia, self._eval(box, "aa")), "aa"
+        self.counts["aa"] += 1
+        return self._eval(box, "aa"), "aa"
+
+    def evaluate(self, boxes) -> list:
+        """
+        Evaluate the function over boxes with the cheapest model.
+
+        Args:
+            boxes (iterable): boxes
+
+        Returns:
+            list: list of Interval, the enclosures of the boxes
+
+        """
+        return [self.evaluate_box(box)[0] for box in boxes]
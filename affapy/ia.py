@@ -19,13 +19,86 @@ of the interval:
 where :math:`a \\leq b`.
 
 """
-import affapy.aa
 from affapy.error import affapyError
 import mpmath
 from mpmath import (mp, fadd, fsub, fmul, fdiv, fneg, fabs, floor, ceil,
                     sqrt, exp, ln, cos, fmod)
 from mpmath.ctx_mp_python import _mpf as mpf
+from mpmath.libmp import MPZ, fzero, fnan, finf, fninf
 
+# Types of the scalar operands: the numbers of the backend (see
+# affapy.backend) and of mpmath
+_SCALARS = (int, float, mpf, str)
+
+# Special mpf values, indexed by the exponent of their raw tuple
+_SPECIAL = {v[2]: v for v in (fzero, fnan, finf, fninf)}
+
+
+def _pack(values) -> tuple:
+    """
+    Pack mpf values into a flat tuple of integers, for pickling.
+    Each value is stored as its signed mantissa and its exponent.
+    The special values (0, nan, inf) have a zero mantissa and are
+    identified by their exponent.
+
+    Args:
+        values (iterable of mpf or int or float): values to pack
+
+    Returns:
+        tuple: (man1, exp1, man2, exp2, ...)
+
+    """
+    flat = []
+    for v in values:
+        if not isinstance(v, mpmath.mpf):
+            v = mpmath.mpf(v)
+        sign, man, exp, _ = v._mpf_
+        flat.append(-int(man) if sign else int(man))
+        flat.append(int(exp))
+    return tuple(flat)
+
+
+def _unpack(flat: tuple) -> list:
+    """
+    Unpack mpf values packed by **_pack**.
+
+    Args:
+        flat (tuple): (man1, exp1, man2, exp2, ...)
+
+    Returns:
+        list: list of mpf, or of numbers of the current backend
+
+    """
+    values = []
+    make = mpmath.mp.make_mpf
+    for k in range(0, len(flat), 2):
+        man, exp = flat[k], flat[k + 1]
+        if man == 0:
+            values.append(make(_SPECIAL[exp]))
+        elif man < 0:
+            values.append(make((1, MPZ(-man), exp, (-man).bit_length())))
+        else:
+            values.append(make((0, MPZ(man), exp, man.bit_length())))
+    if mpf is not mpmath.ctx_mp_python._mpf:
+        # Convert to the numbers of the current backend (affapy.backend)
+        values = [mp.mpf(v) for v in values]
+    return values
+
+
+def _unpickleInterval(flat: tuple) -> "Interval":
+    """
+    Rebuild an interval pickled by **Interval.__reduce__**.
+
+    Args:
+        flat (tuple): packed infimum and supremum
+
+    Returns:
+        Interval: interval
+
+    """
+    itv = Interval.__new__(Interval)
+    itv._inf, itv._sup = _unpack(flat)
+    return itv
 
 
 class Interval:
@@ -36,7 +109,11 @@ class Interval:
     * **inf**: the infimum
     * **sup**: the supremum
 
+    The intervals are immutable and hashable: they can be used as keys of
+    dictionaries and as elements of sets.
+
     """
+    __slots__ = ("_inf", "_sup", "_hash")
 
     def __init__(self, inf, sup):
         """
@@ -79,13 +156,25 @@ class Interval:
     # Setter
     @inf.setter
     def inf(self, value):
-        """Set the inf."""
-        self._inf = value
+        """
+        The intervals are immutable.
+
+        Raises:
+            affapyError: Interval is immutable
+
+        """
+        raise affapyError("Interval is immutable")
 
     @sup.setter
     def sup(self, value):
-        """Set the sup."""
-        self._sup = value
+        """
+        The intervals are immutable.
+
+        Raises:
+            affapyError: Interval is immutable
+
+        """
+        raise affapyError("Interval is immutable")
 
     # Methods
     def width(self) -> mpf:
@@ -215,7 +304,7 @@ class Interval:
             inf = fadd(self.inf, other.inf, rounding='f')
             sup = fadd(self.sup, other.sup, rounding='c')
             return Interval(inf, sup)
-        if isinstance(other, (int, float, mpf, str)):
+        if isinstance(other, _SCALARS):
             inf = fadd(self.inf, mp.mpf(other), rounding='f')
             sup = fadd(self.sup, mp.mpf(other), rounding='c')
             return Interval(inf, sup)
@@ -280,7 +369,7 @@ class Interval:
             inf = fsub(self.inf, other.sup, rounding='f')
             sup = fsub(self.sup, other.inf, rounding='c')
             return Interval(inf, sup)
-        if isinstance(other, (int, float, mpf, str)):
+        if isinstance(other, _SCALARS):
             inf = fsub(self.inf, mp.mpf(other), rounding='f')
             sup = fsub(self.sup, mp.mpf(other), rounding='c')
             return Interval(inf, sup)
@@ -351,7 +440,7 @@ class Interval:
             sup = max([fmul(a, c, rounding='c'), fmul(a, d, rounding='c'),
                        fmul(b, c, rounding='c'), fmul(b, d, rounding='c')])
             return Interval(inf, sup)
-        if isinstance(other, (int, float, mpf, str)):
+        if isinstance(other, _SCALARS):
             return Interval(fmul(mp.mpf(other), self.inf, rounding='f'),
                             fmul(mp.mpf(other), self.sup, rounding='c'))
         raise affapyError("other must be Interval, int, float, mpf")
@@ -414,10 +503,10 @@ class Interval:
         if isinstance(other, self.__class__):
             c, d = other.inf, other.sup
             if 0 not in other:
-                return self * Interval(fdiv(1, d, rounding='c'),
-                                       fdiv(1, c, rounding='f'))
+                return self * Interval(fdiv(1, d, rounding='f'),
+                                       fdiv(1, c, rounding='c'))
             return Interval(mp.nan, mp.nan)
-        if isinstance(other, (int, float, mpf, str)):
+        if isinstance(other, _SCALARS):
             if other != 0:
                 return (1 / mp.mpf(other)) * self
             return Interval(mp.nan, mp.nan)
@@ -444,7 +533,7 @@ class Interval:
         """
         if isinstance(other, self.__class__):
             return other / self
-        if isinstance(other, (int, float, mpmath.mpf, str)):
+        if isinstance(other, _SCALARS):
             return mp.mpf(other) * (Interval(1,1) / self)
         raise affapyError("other must be Interval, int, float, mpf")
 
@@ -674,7 +763,7 @@ class Interval:
 
         """
         if self.inf > 0:
-            return Interval(ln(self.inf, roundin='d'),
+            return Interval(ln(self.inf, rounding='f'),
                             ln(self.sup, rounding='c'))
         return Interval(mp.nan, mp.nan)
 
@@ -691,13 +780,15 @@ class Interval:
         """
         inf, sup = self.inf, self.sup
         a = fmod(inf, 2*mp.pi)
-        if inf < 0:
-            a = fneg(a, rounding='f')
+        if a < 0:
+            a = fadd(a, 2*mp.pi, rounding='f')
         if fsub(sup, inf) >= 2*mp.pi:
             b = fadd(a, 2*mp.pi, rounding='c')
         else:
             b = fmod(sup, 2*mp.pi)
-            if b <= a:
+            if b < 0:
+                b = fadd(b, 2*mp.pi, rounding='c')
+            if b < a:
                 b = fadd(b, 2*mp.pi, rounding='c')
         return Interval(a, b)
 
@@ -898,10 +989,7 @@ class Interval:
             other (Interval): second operand
 
         Returns:
-            bool: self == other
-
-        Raises:
-            affapyError: other must be Interval
+            bool: self == other (NotImplemented if other is not Interval)
 
         Examples:
             >>> Interval(1, 2) == Interval(1, 2)
@@ -911,8 +999,9 @@ class Interval:
 
         """
         if isinstance(other, self.__class__):
-            return self.inf == other.inf and self.sup == other.sup
-        raise affapyError("other must be Interval")
+            return self is other or (self._inf == other._inf
+                                     and self._sup == other._sup)
+        return NotImplemented
 
     def __ne__(self, other: "Interval") -> bool:
         """
@@ -925,10 +1014,7 @@ class Interval:
             other (Interval): second operand
 
         Returns:
-            bool: self != other
-
-        Raises:
-            affapyError: other must be Interval
+            bool: self != other (NotImplemented if other is not Interval)
 
         Examples:
             >>> Interval(1, 2) != Interval(1, 2)
@@ -939,7 +1025,7 @@ class Interval:
         """
         if isinstance(other, self.__class__):
             return self.inf != other.inf or self.sup != other.sup
-        raise affapyError("other must be Interval")
+        return NotImplemented
 
     def __ge__(self, other: "Interval | int | float | mpf | str") -> bool:
         """
@@ -967,7 +1053,7 @@ class Interval:
         """
         if isinstance(other, self.__class__):
             return self.inf >= other.sup
-        if isinstance(other, (int, float, mpf, str)):
+        if isinstance(other, _SCALARS):
             return self.inf >= mp.mpf(other)
         raise affapyError("other must be Interval, int, float, mpf")
 
@@ -995,7 +1081,7 @@ class Interval:
         """
         if isinstance(other, self.__class__):
             return self.inf > other.sup
-        if isinstance(other, (int, float, mpf, str)):
+        if isinstance(other, _SCALARS):
             return self.inf > mp.mpf(other)
         raise affapyError("other must be Interval, int, float, mpf")
 
@@ -1025,7 +1111,7 @@ class Interval:
         """
         if isinstance(other, self.__class__):
             return self.sup <= other.inf
-        if isinstance(other, (int, float, mpf, str)):
+        if isinstance(other, _SCALARS):
             return self.sup <= mp.mpf(other)
         raise affapyError("other must be Interval, int, float, mpf")
 
@@ -1053,7 +1139,7 @@ class Interval:
         """
         if isinstance(other, self.__class__):
             return self.sup < other.inf
-        if isinstance(other, (int, float, mpf, str)):
+        if isinstance(other, _SCALARS):
             return self.sup < mp.mpf(other)
         raise affapyError("other must be Interval, int, float, mpf")
 
@@ -1087,9 +1173,11 @@ class Interval:
         """
         if isinstance(other, self.__class__):
             return self.inf <= other.inf and self.sup >= other.sup
-        if isinstance(other, (int, float, mpf, str)):
+        if isinstance(other, _SCALARS):
             return self.inf <= mp.mpf(other) <= self.sup
-        if isinstance(other, affapy.aa.Affine):
+        # affapy.aa imports this module: import it when needed only
+        from affapy.aa import Affine
+        if isinstance(other, Affine):
             return (self.inf <= other.interval.inf
                     and self.sup >= other.interval.sup)
         raise affapyError("other must be Interval, int, float, Affine, mpf")
@@ -1142,18 +1230,54 @@ class Interval:
         """
         return "Interval({}, {})".format(self.inf, self.sup)
 
+    def __reduce__(self) -> tuple:
+        """
+        **Pickle format**
+
+        Pickle an interval as the raw mantissas and exponents of its
+        bounds, without the instance dictionary.
+
+        Args:
+            self (Interval): arg
+
+        Returns:
+            tuple: function rebuilding the interval and its arguments
+
+        """
+        return _unpickleInterval, (_pack((self.inf, self.sup)),)
+
+    def __hash__(self) -> int:
+        """
+        **Hash**
+
+        Return the hash of the bounds. It is computed at the first call.
+
+        Args:
+            self (Interval): arg
+
+        Returns:
+            int: hash
+
+        """
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash = hash((self._inf, self._sup))
+            return self._hash
+
     def copy(self) -> "Interval":
         """
-        Copy an interval.
+        Copy an interval. The intervals are immutable, so it returns the
+        interval itself.
 
         Args:
             self (Interval): arg
 
         Returns:
-            Interval: self copy
+            Interval: self
 
         """
-        return Interval(self.inf, self.sup)
+        return self
 
     def convert(self) -> "affapy.aa.Affine":
         """
@@ -1175,4 +1299,5 @@ class Interval:
             Affine: affine form associated to the interval
 
         """
-        return affapy.aa.Affine(interval=[self.inf, self.sup])
+        from affapy.aa import Affine
+        return Affine(interval=[self.inf, self.sup])
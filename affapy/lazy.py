@@ -0,0 +1,263 @@
+"""
+This module provides a lazy mode for the affine forms.
+
+Each operation of **Affine** computes its result, with a new dictionary
+of noise symbols, even if the result is only used by the next operation.
+In lazy mode, the linear operations (*+*, *-*, and the multiplication and
+the division by a number) return a **LazyAffine**, which records a linear
+combination of affine forms instead of computing it.
+
+The linear combinations are fused: a chain of linear operations gives a
+single linear combination of the affine forms at its leaves. It is
+computed in a single pass over their noise symbols when it is used:
+
+* its fields are accessed (*x0*, *xi*, *interval*, *rad()*, ...)
+* it is printed
+* it is the operand of a nonlinear operation (product of two affine
+  forms, *sqrt*, *exp*, ...)
+
+A **LazyAffine** is an **Affine**: it can be used like the other affine
+forms. A linear combination of more than **MAX_TERMS** affine forms is
+computed at once, so that the combinations stay small.
+
+The lazy mode is enabled with **enable**, or in a portion of code with
+the class **deferred**. The operators of **Affine** are instrumented
+only while the lazy mode is enabled.
+
+**Example**:
+
+.. code-block:: python
+
+    from affapy.lazy import deferred
+
+    with deferred():
+        y = 3 * x - 2 * (x - z) + z / 4 - 1  # no noise symbol visited
+        print(y.interval)  # a single pass over the noise symbols of x, z
+
+"""
+from contextlib import ContextDecorator
+import affapy.aa
+import affapy.stats
+from affapy.aa import Affine
+
+# Maximal number of affine forms of a linear combination
+MAX_TERMS = 64
+
+# Fields computed when a lazy form is used
+_FIELDS = ("_x0", "_xi", "_rad", "_interval")
+
+
+class LazyAffine(Affine):
+    """
+    Affine form defined by a linear combination of affine forms, computed
+    at its first use. Before, it contains the fields:
+
+    * **_terms**: dictionary of the pairs (affine form, coefficient),
+      indexed by the id of the affine forms
+    * **_const**: constant term
+
+    After, *_terms* is None and the form is a usual affine form.
+
+    """
+
+    __slots__ = ("_terms", "_const")
+
+    def __init__(self, terms: dict, const):
+        """
+        Create a lazy affine form. Prefer the operators in lazy mode.
+
+        Args:
+            terms (dict): pairs (Affine, coefficient) indexed by the id of
+                the affine forms
+            const (mpf): constant term
+
+        """
+        self._terms = terms
+        self._const = const
+
+    def __getattr__(self, name: str):
+        """Compute the linear combination at the first use of a field."""
+        if name not in _FIELDS:
+            raise AttributeError(name)
+        self._materialize()
+        return object.__getattribute__(self, name)
+
+    def _materialize(self):
+        """Compute the linear combination."""
+        x = Affine._linear(self._terms.values(), self._const)
+        self._x0, self._xi, self._rad = x._x0, x._xi, x._rad
+        self._interval = None
+        self._terms = None
+
+    def is_lazy(self) -> bool:
+        """Return True if the linear combination is not computed yet."""
+        return self._terms is not None
+
+
+def _isNumber(x) -> bool:
+    """Return True if x is a constant of the affine operators."""
+    return isinstance(x, (int, float, affapy.aa.mpf, str))
+
+
+def _mpf(x):
+    """Convert a number with the current backend."""
+    return affapy.aa.mp.mpf(x)
+
+
+def _split(x: Affine) -> tuple:
+    """Return the terms and the constant of an affine form."""
+    if isinstance(x, LazyAffine) and x._terms is not None:
+        return x._terms, x._const
+    return {id(x): (x, _mpf(1))}, _mpf(0)
+
+
+def _lazy(terms: dict, const) -> LazyAffine:
+    """Create a lazy form, computed at once if it has too many terms."""
+    x = LazyAffine(terms, const)
+    if len(terms) > MAX_TERMS:
+        x._materialize()
+    return x
+
+
+def _scale(x: Affine, alpha) -> LazyAffine:
+    """Return the lazy form alpha * x."""
+    fmul = affapy.aa.fmul
+    terms, const = _split(x)
+    terms = {k: (y, fmul(c, alpha, rounding='u'))
+             for k, (y, c) in terms.items()}
+    return _lazy(terms, const * alpha)
+
+
+def _add(x: Affine, y: Affine, negate: bool) -> LazyAffine:
+    """Return the lazy form x + y, or x - y if negate is True."""
+    fadd = affapy.aa.fadd
+    terms, const = _split(x)
+    other, c0 = _split(y)
+    terms = terms.copy()
+    for k, (z, c) in other.items():
+        if negate:
+            c = -c
+        old = terms.get(k)
+        terms[k] = (z, c) if old is None else (z, fadd(old[1], c,
+                                                       rounding='u'))
+    return _lazy(terms, const - c0 if negate else const + c0)
+
+
+def _shift(x: Affine, value) -> LazyAffine:
+    """Return the lazy form x + value."""
+    terms, const = _split(x)
+    return _lazy(terms, const + value)
+
+
+def _operator(name: str, func):
+    """Wrap an operator of Affine to return lazy forms."""
+    def add(self, other):
+        if isinstance(other, Affine):
+            return _add(self, other, False)
+        if _isNumber(other):
+            return _shift(self, _mpf(other))
+        return func(self, other)
+
+    def sub(self, other):
+        if isinstance(other, Affine):
+            return _add(self, other, True)
+        if _isNumber(other):
+            return _shift(self, -_mpf(other))
+        return func(self, other)
+
+    def rsub(self, other):
+        if _isNumber(other):
+            return _shift(_scale(self, _mpf(-1)), _mpf(other))
+        return func(self, other)
+
+    def mul(self, other):
+        if _isNumber(other):
+            return _scale(self, _mpf(other))
+        return func(self, other)
+
+    def truediv(self, other):
+        if _isNumber(other):
+            return _scale(self, 1 / _mpf(other))
+        return func(self, other)
+
+    def neg(self):
+        return _scale(self, _mpf(-1))
+
+    wrappers = {
+        "__add__": add, "__radd__": add, "__sub__": sub, "__rsub__": rsub,
+        "__mul__": mul, "__rmul__": mul, "__truediv__": truediv,
+        "__neg__": neg}
+    wrapper = wrappers[name]
+    wrapper.__name__ = name
+    wrapper.__doc__ = func.__doc__
+    return wrapper
+
+
+OPERATORS = ("__add__", "__radd__", "__sub__", "__rsub__", "__mul__",
+             "__rmul__", "__truediv__", "__neg__")
+
+_enabled = False
+
+
+def enable():
+    """Enable the lazy mode."""
+    global _enabled
+    if _enabled:
+        return
+    for name in OPERATORS:
+        affapy.stats._install(
+            __name__, Affine, name,
+            lambda func, name=name: _operator(name, func))
+    _enabled = True
+
+
+def disable():
+    """Disable the lazy mode. The lazy forms created before are kept."""
+    global _enabled
+    affapy.stats._uninstall(__name__)
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    """Return True if the lazy mode is enabled."""
+    return _enabled
+
+
+class deferred(ContextDecorator):
+    """
+    Enable the lazy mode in a portion of code. You can use it:
+
+    * As decorator of a function
+    * Using the *with* statement
+
+    The lazy mode is disabled at the exit of the context, unless it was
+    already enabled at the entry.
+
+    **Example**:
+
+    .. code-block:: python
+
+        from affapy.lazy import deferred
+
+        @deferred()
+        def f(x, y):
+            return 2 * x - y + 1
+
+    """
+
+    def __init__(self):
+        """Init the context manager."""
+        self._enabled = False
+
+    def __enter__(self):
+        """Enable the lazy mode."""
+        self._enabled = is_enabled()
+        if not self._enabled:
+            enable()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Restore the previous mode."""
+        if not self._enabled:
+            disable()
+        return False
@@ -0,0 +1,182 @@
+"""
+This module evaluates a function over boxes with several precisions: a
+cheap precision first, and higher precisions only for the boxes which
+need them.
+
+Most boxes of a grid are often easy: their enclosures are tight enough,
+or decide a test, at a low precision. The **evaluate** function runs all
+the boxes at the first level, then re-evaluates at the next level only
+the boxes which are not resolved:
+
+* their enclosure is too wide: its width is greater than
+  :math:`atol + rtol \\cdot \\max(|inf|, |sup|)`
+* or their decision is ambiguous: the function *decide* returns None for
+  their enclosure (for example **sign** when the enclosure straddles 0)
+
+A level is a binary precision (*mp.prec*), or the name of a numeric
+backend (see **affapy.backend**), such as *float64*. The enclosures of all
+the levels are converted to intervals of the current backend, rounded
+outward.
+
+Only the rounding errors depend on the precision: a box whose enclosure
+is wide because of the overestimation of the model (dependency problem
+of IA, nonlinear terms of AA) is not resolved by a higher precision, and
+stays unresolved.
+
+**Example**:
+
+.. code-block:: python
+
+    from affapy.mixed import evaluate, sign
+
+    res = evaluate(fct, boxes, levels=("float64", 113, 256),
+                   decide=sign)
+    print(res.counts, res.unresolved)
+
+"""
+from time import perf_counter
+from affapy.error import affapyError
+from affapy.ia import Interval
+import affapy.backend
+import affapy.parallel
+from mpmath import mp
+
+
+class MixedResult:
+    """
+    Result of the **evaluate** function. It contains the fields:
+
+    * **enclosures**: list of Interval, the enclosures of the boxes at
+      the last level where they were evaluated
+    * **decisions**: list of the decisions of the boxes, or None without
+      decide
+    * **levels**: list of the level where each box was evaluated last
+    * **counts**: number of boxes evaluated at each level
+    * **times**: evaluation time in seconds of each level
+    * **unresolved**: indices of the boxes not resolved at the last level
+
+    """
+
+    def __init__(self, enclosures, decisions, levels, counts, times,
+                 unresolved):
+        self.enclosures = enclosures
+        self.decisions = decisions
+        self.levels = levels
+        self.counts = counts
+        self.times = times
+        self.unresolved = unresolved
+
+    @property
+    def escalated(self) -> list:
+        """Return the number of boxes evaluated again at each level."""
+        return self.counts[1:]
+
+    def __repr__(self) -> str:
+        return ("MixedResult(counts={}, unresolved={})"
+                .format(self.counts, len(self.unresolved)))
+
+
+def sign(itv: Interval):
+    """
+    Decide the sign of an enclosure.
+
+    Args:
+        itv (Interval): enclosure
+
+    Returns:
+        int: -1 if the enclosure is negative, 1 if it is positive, None if
+        it straddles 0
+
+    """
+    if itv.straddles_zero():
+        return None
+    return -1 if itv.sup < 0 else 1
+
+
+def _evalLevel(fn, model: str, boxes: list, level, order: int = 5) -> list:
+    """
+    Evaluate a function over boxes at a level: a binary precision or the
+    name of a backend. Return intervals of the current backend.
+    """
+    if isinstance(level, int):
+        with mp.workprec(level):
+            return affapy.parallel._evalBoxes(fn, model, boxes, order)
+    with affapy.backend.use(level):
+        itvs = affapy.parallel._evalBoxes(fn, model, boxes, order)
+    return [Interval(itv.inf, itv.sup) for itv in itvs]
+
+
+def evaluate(fn, boxes, levels=("float64", 113, 256), model: str = "aa",
+             atol=None, rtol=None, decide=None,
+             order: int = 5) -> MixedResult:
+    """
+    Evaluate a function over boxes, at the first level, then at the next
+    levels for the boxes which are not resolved.
+
+    Args:
+        fn (function): evaluated function
+        boxes (iterable): boxes
+        levels (sequence): binary precisions (int) or names of backends
+            (str), from the cheapest to the most precise
+        model (str): *aa*, *ia* or *tm* (default: *aa*)
+        atol (int or float or mpf): absolute width of a resolved enclosure
+        rtol (int or float or mpf): relative width of a resolved enclosure
+        decide (function): function of an enclosure returning a decision,
+            or None if it is ambiguous (for example **sign**)
+        order (int): order of the Taylor models of the model *tm*
+
+    Returns:
+        MixedResult: enclosures, decisions and number of boxes of each
+        level
+
+    Raises:
+        affapyError: levels must not be empty
+        affapyError: a level must be a precision or a backend
+        affapyError: model must be 'aa', 'ia' or 'tm'
+
+    """
+    if not levels:
+        raise affapyError("levels must not be empty")
+    for level in levels:
+        if isinstance(level, str):
+            affapy.backend.get(level)
+        elif not isinstance(level, int) or level < 2:
+            raise affapyError("a level must be a precision or a backend")
+    if model not in ("aa", "ia", "tm"):
+        raise affapyError("model must be 'aa', 'ia' or 'tm'")
+    boxes = list(boxes)
+    enclosures = [None] * len(boxes)
+    decisions = [None] * len(boxes)
+    last = [None] * len(boxes)
+    counts, times = [], []
+
+    def resolved(k: int) -> bool:
+        itv = enclosures[k]
+        if atol is not None or rtol is not None:
+            bound = atol or 0
+            if rtol is not None:
+                bound = bound + rtol * max(abs(itv.inf), abs(itv.sup))
+            if itv.width() > bound:
+                return False
+        if decide is not None:
+            decisions[k] = decide(itv)
+            return decisions[k] is not None
+        return True
+
+    todo = list(range(len(boxes)))
+    for level in levels:
+        if not todo:
+            break
+        tstart = perf_counter()
+        itvs = _evalLevel(fn, model, [boxes[k] for k in todo], level,
+                          order)
+        times.append(perf_counter() - tstart)
+        counts.append(len(todo))
+        for k, itv in zip(todo, itvs):
+            enclosures[k] = itv
+            last[k] = level
+        todo = [k for k in todo if not resolved(k)]
+    counts += [0] * (len(levels) - len(counts))
+    times += [0.] * (len(levels) - len(times))
+    return MixedResult(enclosures, decisions if decide else None, last,
+                       counts, times, todo)
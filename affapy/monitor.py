@@ -0,0 +1,195 @@
+"""
+This module can monitor the growth of the noise symbols.
+
+In iterative computations, the affine forms can accumulate a lot of noise
+symbols, and each operation becomes slower. The **monitor** class records:
+
+* the histogram of the number of noise symbols of the created affine forms
+* the number of new noise symbols per second
+
+and alerts when a threshold is crossed: a form has too many noise symbols,
+the noise symbols are created too fast, or the global noise symbol counter
+*Affine._weightCount* is too large. An alert emits an
+**affapyNoiseWarning**, or calls a hook if one is given.
+
+The thresholds of the number of symbols per form and of the counter are
+doubled after each alert, so an alert is emitted each time the size
+doubles.
+
+**Example**:
+
+.. code-block:: python
+
+    from affapy.monitor import monitor
+
+    with monitor(max_symbols=1000) as m:
+        for _ in range(10000):
+            x = x * y
+
+    print(m.histogram, m.peak, m.rate)
+
+"""
+import functools
+import warnings
+from contextlib import ContextDecorator
+from time import perf_counter
+from affapy.aa import Affine
+from affapy.error import affapyError, affapyNoiseWarning
+import affapy.stats
+
+
+class monitor(ContextDecorator):
+    """
+    Monitor the noise symbols. You can use it:
+
+    * As decorator of a function
+    * Using the *with* statement
+    * With the methods **start** and **stop**
+
+    It contains the fields:
+
+    * **histogram**: dictionary bucket -> number of created affine forms,
+      where the bucket :math:`2^k` counts the forms with
+      :math:`2^k \\leq n < 2^{k+1}` noise symbols (the bucket 0 counts the
+      forms without noise symbols)
+    * **peak**: peak number of noise symbols of an affine form
+    * **allocated**: number of new noise symbols
+    * **rate**: number of new noise symbols per second during the last
+      complete window
+    * **alerts**: list of the alerts (event, value)
+
+    """
+
+    def __init__(self, max_symbols: int = 10000, max_rate: float = None,
+                 max_counter: int = None, hook=None, window: float = 1.0):
+        """
+        Init the monitor.
+
+        Args:
+            max_symbols (int): alert threshold of the number of noise
+                symbols of an affine form (None to disable)
+            max_rate (float): alert threshold of the number of new noise
+                symbols per second (None to disable)
+            max_counter (int): alert threshold of the global noise symbol
+                counter (None to disable)
+            hook (function): function called by the alerts with the
+                arguments (event, value, monitor), instead of a warning
+            window (float): duration in seconds of the rate measure
+
+        Raises:
+            affapyError: thresholds must be positive
+
+        """
+        for threshold in (max_symbols, max_rate, max_counter):
+            if threshold is not None and threshold <= 0:
+                raise affapyError("thresholds must be positive")
+        self.max_symbols = max_symbols
+        self.max_rate = max_rate
+        self.max_counter = max_counter
+        self.hook = hook
+        self.window = window
+        self.histogram = {}
+        self.peak = 0
+        self.allocated = 0
+        self.rate = 0.
+        self.alerts = []
+        self._symbols_threshold = max_symbols
+        self._counter_threshold = max_counter
+        self._window_start = None
+        self._window_count = 0
+
+    def alert(self, event: str, value):
+        """
+        Emit an alert: call the hook, or emit an affapyNoiseWarning.
+
+        Args:
+            event (str): *symbols*, *rate* or *counter*
+            value (int or float): value which crossed the threshold
+
+        Warns:
+            affapyNoiseWarning: threshold crossed
+
+        """
+        self.alerts.append((event, value))
+        if self.hook is not None:
+            self.hook(event, value, self)
+        else:
+            warnings.warn(
+                "Noise symbols growth -> {} reached {}".format(event, value),
+                affapyNoiseWarning, stacklevel=4)
+
+    def _form(self, n: int):
+        """Record an affine form with n noise symbols."""
+        bucket = 1 << (n.bit_length() - 1) if n else 0
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+        if n > self.peak:
+            self.peak = n
+        threshold = self._symbols_threshold
+        if threshold is not None and n >= threshold:
+            while self._symbols_threshold <= n:
+                self._symbols_threshold *= 2
+            self.alert("symbols", n)
+
+    def _symbol(self, counter: int):
+        """Record a new noise symbol."""
+        self.allocated += 1
+        self._window_count += 1
+        now = perf_counter()
+        elapsed = now - self._window_start
+        if elapsed >= self.window:
+            self.rate = self._window_count / elapsed
+            self._window_start, self._window_count = now, 0
+            if self.max_rate is not None and self.rate > self.max_rate:
+                self.alert("rate", self.rate)
+        threshold = self._counter_threshold
+        if threshold is not None and counter >= threshold:
+            while self._counter_threshold <= counter:
+                self._counter_threshold *= 2
+            self.alert("counter", counter)
+
+    def _init_factory(self, func):
+        """Wrap Affine.__init__ to record the created forms."""
+        @functools.wraps(func)
+        def wrapper(form, *args, **kwargs):
+            func(form, *args, **kwargs)
+            self._form(len(form._xi))
+        return wrapper
+
+    def _make_factory(self, func):
+        """Wrap Affine._make to record the forms built by the operations."""
+        @functools.wraps(func)
+        def wrapper(*args):
+            form = func(*args)
+            self._form(len(form._xi))
+            return form
+        return wrapper
+
+    def _newxi_factory(self, func):
+        """Wrap Affine._getNewXi to record the new noise symbols."""
+        @functools.wraps(func)
+        def wrapper():
+            symbol = func()
+            self._symbol(symbol)
+            return symbol
+        return wrapper
+
+    def start(self):
+        """Start the monitoring."""
+        self._window_start = perf_counter()
+        self._window_count = 0
+        affapy.stats._install(self, Affine, "__init__", self._init_factory)
+        affapy.stats._install(self, Affine, "_make", self._make_factory)
+        affapy.stats._install(self, Affine, "_getNewXi",
+                              self._newxi_factory)
+
+    def stop(self):
+        """Stop the monitoring."""
+        affapy.stats._uninstall(self)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+        return False
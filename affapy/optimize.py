@@ -0,0 +1,201 @@
+"""
+This module can bound the global minimum of a function over a box.
+
+Instead of a uniform subdivision of the box, the **minimize** function
+uses a branch-and-bound algorithm:
+
+* the boxes are kept in a priority queue ordered by the lower bound of
+  the function over the box, computed with AA or IA
+* the function is sampled at the center of each box to get an upper bound
+  of the minimum
+* the boxes whose lower bound is greater than the best upper bound cannot
+  contain the minimum: they are pruned
+* the box with the smallest lower bound is bisected, until the gap between
+  the lower bound and the upper bound is smaller than a tolerance
+
+With AA, the bisected input is the one whose noise symbol has the largest
+coefficient in the affine form of the result, unless the noise symbols
+created by the nonlinear operations dominate. Otherwise, and with IA, it is
+the widest one.
+
+**Example**:
+
+.. code-block:: python
+
+    from affapy.optimize import minimize
+
+    def fct(x):
+        return (x.sin()**2 * x.cos() - 4) / x.sqrt()
+
+    res = minimize(fct, [[1, 6]], tol=1e-6)
+    print(res.lower, res.upper, res.rate)
+
+"""
+import heapq
+from time import perf_counter
+from affapy.error import affapyError
+from affapy.ia import Interval
+import affapy.box
+from mpmath import mp, fabs, fsub, fsum
+
+
+class MinimizeResult:
+    """
+    Result of the **minimize** function. It contains the fields:
+
+    * **lower**: rigorous lower bound of the minimum
+    * **upper**: rigorous upper bound of the minimum
+    * **point**: center of the box where the upper bound was found
+    * **boxes**: number of processed boxes
+    * **time**: elapsed time in seconds
+    * **converged**: True if the tolerance was reached
+
+    """
+
+    def __init__(self, lower, upper, point, boxes, time, converged):
+        self.lower = lower
+        self.upper = upper
+        self.point = point
+        self.boxes = boxes
+        self.time = time
+        self.converged = converged
+
+    @property
+    def rate(self) -> float:
+        """Return the number of boxes processed per second."""
+        if self.time > 0:
+            return self.boxes / self.time
+        return float("inf")
+
+    def __repr__(self) -> str:
+        """
+        **Repr format**
+
+        Make the repr format.
+
+        Returns:
+            string: format
+
+        """
+        return "MinimizeResult([{}, {}], boxes={}, rate={:.1f}/s)".format(
+            self.lower, self.upper, self.boxes, self.rate)
+
+
+def _evaluate(fn, box: tuple, model: str, order: int = 5) -> tuple:
+    """
+    Evaluate a function over a box.
+
+    Args:
+        fn (function): evaluated function
+        box (tuple of Interval): normalized box
+        model (str): *aa*, *ia* or *tm*
+        order (int): order of the Taylor models
+
+    Returns:
+        tuple: lower bound of fn over box and index of the input to split
+
+    """
+    args = affapy.box.inputs(box, model, order)
+    value = fn(*args)
+    lower = affapy.box.bounds(value).inf
+    widths = affapy.box.widths(box)
+    k = max(range(len(box)), key=lambda i: widths[i])
+    if model == "aa" and hasattr(value, "xi"):
+        # The nonlinear part of the result is carried by fresh noise
+        # symbols: when it dominates, bisecting the widest input is better
+        xi = value.xi
+        coefs = [max(fabs(xi.get(s, 0)) for s in arg.xi) for arg in args]
+        if fsum(coefs) > fsub(value.rad(), fsum(coefs)):
+            k = max(range(len(box)), key=lambda i: coefs[i])
+    return lower, k
+
+
+def _sample(fn, box: tuple) -> tuple:
+    """
+    Evaluate a function at the center of a box with degenerate intervals.
+
+    Args:
+        fn (function): evaluated function
+        box (tuple of Interval): normalized box
+
+    Returns:
+        tuple: upper bound of fn at the center and the center
+
+    """
+    point = affapy.box.midpoint(box)
+    value = fn(*[Interval(m, m) for m in point])
+    return affapy.box.bounds(value).sup, point
+
+
+def minimize(fn, box, model: str = "aa", tol=1e-6, xtol=0,
+             maxboxes: int = 100000, order: int = 5) -> MinimizeResult:
+    """
+    Bound the global minimum of a function over a box with a
+    branch-and-bound algorithm.
+
+    The function must accept the inputs of the chosen model (Affine,
+    Interval or TaylorModel) and degenerate intervals, which are used to
+    sample the function at the center of the boxes.
+
+    Args:
+        fn (function): function to minimize
+        box (list or tuple): the box, a sequence of intervals
+        model (str): *aa*, *ia* or *tm* (default: *aa*)
+        tol (int or float or mpf): tolerance on upper - lower
+        xtol (int or float or mpf): the boxes narrower than xtol are
+            not bisected (default: 0)
+        maxboxes (int): maximal number of processed boxes
+        order (int): order of the Taylor models of the model *tm*
+            (default: 5)
+
+    Returns:
+        MinimizeResult: bounds of the minimum and statistics
+
+    Raises:
+        affapyError: model must be 'aa', 'ia' or 'tm'
+
+    Examples:
+        >>> res = minimize(lambda x: x * x - x, [[-1, 2]], tol=1e-3)
+        >>> res.lower <= -0.25 <= res.upper
+        True
+
+    """
+    if model not in ("aa", "ia", "tm"):
+        raise affapyError("model must be 'aa', 'ia' or 'tm'")
+    tstart = perf_counter()
+    box = affapy.box.normalize(box)
+    tol, xtol = mp.mpf(tol), mp.mpf(xtol)
+    upper, point = _sample(fn, box)
+    lower, k = _evaluate(fn, box, model, order)
+    boxes = 1
+    heap = [(lower, 0, box, k)]
+    count = 1
+    floor = mp.inf
+    converged = False
+    while heap:
+        lower, _, box, k = heap[0]
+        if fsub(upper, min(lower, floor), rounding='u') <= tol:
+            converged = True
+            break
+        if boxes >= maxboxes:
+            break
+        heapq.heappop(heap)
+        mid = box[k].mid()
+        if (max(affapy.box.widths(box)) <= xtol
+                or mid == box[k].inf or mid == box[k].sup):
+            floor = min(floor, lower)
+            continue
+        for child in affapy.box.split(box, k):
+            boxes += 1
+            sup, center = _sample(fn, child)
+            if sup < upper:
+                upper, point = sup, center
+            inf, kchild = _evaluate(fn, child, model, order)
+            if inf <= upper:
+                heapq.heappush(heap, (inf, count, child, kchild))
+                count += 1
+    else:
+        converged = fsub(upper, floor, rounding='u') <= tol
+    lower = min(heap[0][0], floor) if heap else min(floor, upper)
+    return MinimizeResult(lower, upper, point, boxes,
+                          perf_counter() - tstart, converged)
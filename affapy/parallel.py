@@ -0,0 +1,456 @@
+"""
+This module can evaluate a function over a large number of boxes using
+several processes.
+
+The arithmetic of *affapy* is written in pure Python with *mpmath*, so a
+single process can only use one core. The **ParallelEvaluator** class
+distributes the boxes between the processes of a
+:class:`concurrent.futures.ProcessPoolExecutor`:
+
+* the function, the model and the precision are sent once to each worker
+  when the pool is created
+* the boxes are sent by chunks, and the enclosures of each chunk are
+  yielded as soon as the chunk is evaluated
+* the chunk size can be tuned automatically from the time needed to
+  evaluate a sample of boxes
+
+The function must be picklable, i.e. defined at the top level of a module.
+
+With *shared=True*, the boxes and the enclosures are not pickled: they are
+written as float64 bounds in a :mod:`multiprocessing.shared_memory` block,
+with a slot per chunk in progress. The workers read the boxes and write
+the enclosures in place, and only a small descriptor (name of the block,
+offset and size of the slot) is sent with each chunk. The bounds are
+rounded outward to float64, so the enclosures stay valid, but they are
+not tighter than float64 even with a higher precision. The shared memory
+needs Python 3.8.
+
+**Example**:
+
+.. code-block:: python
+
+    from affapy.parallel import ParallelEvaluator
+
+    def fct(x1, x2):
+        return 1 + (x1*x1 - 2)*x2 + x1*x2*x2
+
+    boxes = [[[i, i + 1], [i, i + 1]] for i in range(10000)]
+    with ParallelEvaluator(fct, model="aa", workers=4) as ev:
+        for start, itvs in ev.map(boxes):
+            ...
+
+"""
+import importlib.util
+import itertools
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from time import perf_counter
+from affapy.error import affapyError
+from affapy.ia import Interval
+from affapy.backend import _down, _up
+import affapy.box
+import affapy.ia
+import mpmath
+from mpmath import mp
+from mpmath.libmp import dps_to_prec, from_float, to_float, round_floor, \
+    round_ceiling
+
+# Evaluation settings of a worker process, set by _initWorker
+_worker = None
+
+# Shared memory block attached by a worker process, by name
+_blocks = {}
+
+
+def _initWorker(fn, model: str, prec: int, order: int = 5):
+    """
+    Initialize a worker process: store the function and the model and
+    set the precision.
+
+    Args:
+        fn (function): evaluated function
+        model (str): *aa*, *ia* or *tm*
+        prec (int): binary precision
+        order (int): order of the Taylor models
+
+    """
+    global _worker
+    mp.prec = prec
+    _worker = (fn, model, order)
+
+
+def _evalBoxes(fn, model: str, boxes, order: int = 5) -> list:
+    """
+    Evaluate a function over a list of boxes.
+
+    Args:
+        fn (function): evaluated function
+        model (str): *aa*, *ia* or *tm*
+        boxes (list): list of boxes
+        order (int): order of the Taylor models
+
+    Returns:
+        list: list of Interval, the enclosures of fn over the boxes
+
+    """
+    return [affapy.box.bounds(
+        fn(*affapy.box.inputs(affapy.box.normalize(box), model, order)))
+        for box in boxes]
+
+
+def _evalChunk(start: int, boxes: list) -> tuple:
+    """
+    Evaluate a chunk of boxes in a worker process.
+
+    Args:
+        start (int): index of the first box of the chunk
+        boxes (list): list of boxes
+
+    Returns:
+        tuple: start and the list of enclosures
+
+    """
+    fn, model, order = _worker
+    return start, _evalBoxes(fn, model, boxes, order)
+
+
+# Types of the bounds converted without intervals
+_NUMBERS = (int, float)
+
+
+def _floatBox(box) -> list:
+    """
+    Return the bounds of a box (inf and sup of each interval) rounded
+    outward to float64, without creating intervals for the ranges of
+    floats.
+    """
+    if isinstance(box, Interval):
+        box = (box,)
+    if not isinstance(box, (list, tuple)) or not box:
+        raise affapyError("box must be a sequence of intervals")
+    values = []
+    for itv in box:
+        if (isinstance(itv, (list, tuple)) and len(itv) == 2
+                and type(itv[0]) in _NUMBERS and type(itv[1]) in _NUMBERS):
+            a, b = itv if itv[0] <= itv[1] else (itv[1], itv[0])
+            values.append(_down(a))
+            values.append(_up(b))
+            continue
+        if not isinstance(itv, Interval):
+            itv = affapy.box.normalize([itv])[0]
+        values.append(_down(itv.inf))
+        values.append(_up(itv.sup))
+    return values
+
+
+def _intervals(values) -> list:
+    """Build the intervals of a sequence of float64 bounds."""
+    if affapy.ia.mpf is not mpmath.ctx_mp_python._mpf:
+        # Numbers of another backend (affapy.backend)
+        return [Interval(values[j], values[j + 1])
+                for j in range(0, len(values), 2)]
+    make = mp.make_mpf
+    itvs = []
+    for j in range(0, len(values), 2):
+        itv = Interval.__new__(Interval)
+        itv._inf = make(from_float(values[j]))
+        itv._sup = make(from_float(values[j + 1]))
+        itvs.append(itv)
+    return itvs
+
+
+def _floatBounds(itvs) -> list:
+    """Return the bounds of intervals rounded outward to float64."""
+    if affapy.ia.mpf is not mpmath.ctx_mp_python._mpf:
+        return [f for itv in itvs for f in (_down(itv.inf), _up(itv.sup))]
+    values = []
+    for itv in itvs:
+        values.append(to_float(itv.inf._mpf_, rnd=round_floor))
+        values.append(to_float(itv.sup._mpf_, rnd=round_ceiling))
+    return values
+
+
+def _attach(name: str) -> "SharedMemory":
+    """Attach a shared memory block, and detach the previous one."""
+    shm = _blocks.get(name)
+    if shm is None:
+        from multiprocessing.shared_memory import SharedMemory
+        for old in _blocks.values():
+            old.close()
+        _blocks.clear()
+        shm = _blocks[name] = SharedMemory(name=name)
+    return shm
+
+
+def _evalShared(name: str, offset: int, count: int, dim: int) -> int:
+    """
+    Evaluate a chunk of boxes stored in a shared memory block, and write
+    their enclosures after the boxes.
+
+    The slot contains the bounds of the count boxes (inf and sup of each
+    interval), then the bounds of their enclosures, as float64.
+
+    Args:
+        name (str): name of the block
+        offset (int): offset of the slot in bytes
+        count (int): number of boxes
+        dim (int): number of intervals of a box
+
+    Returns:
+        int: count
+
+    """
+    fn, model, order = _worker
+    view = _attach(name).buf[offset:offset + 8 * count * (2 * dim + 2)]
+    data = view.cast("d")
+    try:
+        out = 2 * dim * count
+        itvs = _intervals(data[:out].tolist())
+        boxes = [itvs[dim * i:dim * (i + 1)] for i in range(count)]
+        data[out:] = array(
+            "d", _floatBounds(_evalBoxes(fn, model, boxes, order)))
+    finally:
+        data.release()
+        view.release()
+    return count
+
+
+class ParallelEvaluator:
+    """
+    Evaluate a function over boxes with a pool of processes.
+    It can be used with the *with* statement, which creates and shutdowns
+    the pool.
+
+    It contains the fields:
+
+    * **fn**: the evaluated function
+    * **model**: *aa*, *ia* or *tm*
+    * **workers**: number of processes
+    * **chunksize**: number of boxes sent to a worker at once
+    * **prec**: binary precision used by the workers
+    * **shared**: True if the boxes and the enclosures are exchanged in
+      shared memory
+    * **order**: order of the Taylor models of the model *tm*
+
+    """
+
+    def __init__(self, fn, model: str = "aa", workers: int = None,
+                 chunksize: int = None, dps: int = None, prec: int = None,
+                 shared: bool = False, order: int = 5):
+        """
+        Init the evaluator. The precision is the current *mpmath* precision
+        unless dps or prec is given.
+
+        Args:
+            fn (function): picklable function
+            model (str): *aa*, *ia* or *tm* (default: *aa*)
+            workers (int): number of processes (default: number of cores)
+            chunksize (int): number of boxes per chunk (default: autotuned)
+            dps (int): decimal precision of the workers
+            prec (int): binary precision of the workers
+            shared (bool): exchange the bounds in shared memory
+            order (int): order of the Taylor models of the model *tm*
+                (default: 5)
+
+        Raises:
+            affapyError: model must be 'aa', 'ia' or 'tm'
+            affapyError: shared memory requires Python 3.8
+
+        """
+        if model not in ("aa", "ia", "tm"):
+            raise affapyError("model must be 'aa', 'ia' or 'tm'")
+        if shared and importlib.util.find_spec(
+                "multiprocessing.shared_memory") is None:
+            raise affapyError("shared memory requires Python 3.8")
+        self.fn = fn
+        self.model = model
+        self.workers = workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+        if prec is None:
+            prec = mp.prec
+            if dps is not None:
+                prec = dps_to_prec(dps)
+        self.prec = prec
+        self.shared = shared
+        self.order = order
+        self._pool = None
+
+    def __enter__(self):
+        """Create the pool of processes."""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Shutdown the pool of processes."""
+        self.shutdown()
+        return False
+
+    def start(self):
+        """
+        Create the pool of processes. The function, the model and the
+        precision are sent to the workers at this moment.
+        """
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_initWorker,
+                initargs=(self.fn, self.model, self.prec, self.order))
+
+    def shutdown(self):
+        """Shutdown the pool of processes."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def autotune(self, boxes, target: float = 0.05,
+                 sample: int = 16) -> int:
+        """
+        Choose the chunk size from the time needed to evaluate a sample of
+        boxes in the current process, so that a chunk lasts about target
+        seconds. When the number of boxes is known, **map** also keeps at
+        least four chunks per worker.
+
+        Args:
+            boxes (list): list of boxes
+            target (float): duration of a chunk in seconds
+            sample (int): number of evaluated boxes
+
+        Returns:
+            int: chunk size
+
+        """
+        boxes = list(itertools.islice(boxes, sample))
+        if not boxes:
+            self.chunksize = 1
+            return self.chunksize
+        with mp.workprec(self.prec):
+            tstart = perf_counter()
+            _evalBoxes(self.fn, self.model, boxes, self.order)
+            elapsed = perf_counter() - tstart
+        perbox = max(elapsed / len(boxes), 1e-9)
+        self.chunksize = max(1, int(target / perbox))
+        return self.chunksize
+
+    def map(self, boxes):
+        """
+        Evaluate the function over the boxes. The boxes can be given by
+        an iterator: they are read chunk by chunk. The chunks are yielded
+        as soon as they are evaluated, not in order.
+
+        Args:
+            boxes (iterable): boxes
+
+        Yields:
+            tuple: index of the first box of the chunk and the list of
+            its enclosures (Interval)
+
+        """
+        it = iter(boxes)
+        if self.chunksize is None:
+            sample = list(itertools.islice(it, 16))
+            self.autotune(sample)
+            if hasattr(boxes, "__len__"):
+                count = len(boxes) // (4 * self.workers)
+                self.chunksize = max(1, min(self.chunksize, count))
+            it = itertools.chain(sample, it)
+        owned = self._pool is None
+        self.start()
+        if self.shared:
+            try:
+                yield from self._mapShared(it)
+            finally:
+                if owned:
+                    self.shutdown()
+            return
+        pending = set()
+        try:
+            start = 0
+            while True:
+                while len(pending) < 2 * self.workers:
+                    chunk = list(itertools.islice(it, self.chunksize))
+                    if not chunk:
+                        break
+                    pending.add(self._pool.submit(_evalChunk, start, chunk))
+                    start += len(chunk)
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+            if owned:
+                self.shutdown()
+
+    def _mapShared(self, it):
+        """
+        Evaluate the boxes of an iterator, exchanging the bounds in a
+        shared memory block with a slot per chunk in progress.
+        """
+        from multiprocessing.shared_memory import SharedMemory
+        first = list(itertools.islice(it, 1))
+        if not first:
+            return
+        dim = len(affapy.box.normalize(first[0]))
+        it = itertools.chain(first, it)
+        slots = 2 * self.workers
+        stride = self.chunksize * (2 * dim + 2)
+        shm = SharedMemory(create=True, size=8 * stride * slots)
+        data = shm.buf.cast("d")
+        free = list(range(slots))
+        pending = {}
+        try:
+            start = 0
+            while True:
+                while free:
+                    chunk = list(itertools.islice(it, self.chunksize))
+                    if not chunk:
+                        break
+                    slot = free.pop()
+                    k = slot * stride
+                    for box in chunk:
+                        values = _floatBox(box)
+                        if len(values) != 2 * dim:
+                            raise affapyError(
+                                "the boxes must have the same dimension")
+                        data[k:k + 2 * dim] = array("d", values)
+                        k += 2 * dim
+                    future = self._pool.submit(
+                        _evalShared, shm.name, 8 * slot * stride,
+                        len(chunk), dim)
+                    pending[future] = (slot, start, len(chunk))
+                    start += len(chunk)
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    slot, begin, count = pending.pop(future)
+                    future.result()
+                    k = slot * stride + 2 * dim * count
+                    itvs = _intervals(data[k:k + 2 * count].tolist())
+                    free.append(slot)
+                    yield begin, itvs
+        finally:
+            for future in pending:
+                future.cancel()
+            wait(pending)
+            data.release()
+            shm.close()
+            shm.unlink()
+
+    def evaluate(self, boxes) -> list:
+        """
+        Evaluate the function over the boxes.
+
+        Args:
+            boxes (iterable): boxes
+
+        Returns:
+            list: list of Interval, the enclosures in the order of the boxes
+
+        """
+        result = {}
+        for start, itvs in self.map(boxes):
+            result[start] = itvs
+        return [itv for start in sorted(result) for itv in result[start]]
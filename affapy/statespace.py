@@ -0,0 +1,293 @@
+"""
+This module simulates linear digital filters with affine arithmetic, for
+the range analysis of their fixed-point implementations.
+
+A filter is defined by its state-space matrices:
+
+.. math ::
+    x[n+1] = A x[n] + B u[n]
+
+.. math ::
+    y[n] = C x[n] + D u[n]
+
+or by the coefficients of its transfer function (see
+**StateSpace.from_tf**):
+
+.. math ::
+    y[n] = \\sum_{k=0}^{N} b_k u[n-k] - \\sum_{k=1}^{N} a_k y[n-k]
+
+The input samples are given as ranges: each range gets a new noise
+symbol, so the states keep the dependencies on the past inputs. The
+simulation yields the enclosure (**Interval**) of the outputs of each
+step.
+
+The states are affine forms computed with hardware floating-point
+numbers: each state and each output is computed with a single linear
+combination over the noise symbols, rounded to nearest, and the bound of
+its rounding errors is added to a new noise symbol. The coefficients of
+the matrices are rounded to the nearest float64, so the simulated filter
+is the one with these coefficients.
+
+The number of noise symbols grows with the number of steps: every
+*period* steps, the states are condensed to at most *symbols* noise
+symbols, like **Affine.condense**, so the memory does not depend on the
+number of steps. The oldest inputs of a stable filter have the smallest
+coefficients, so they are the first ones to be merged.
+
+**Example**:
+
+.. code-block:: python
+
+    import itertools
+    from affapy.statespace import StateSpace
+
+    f = StateSpace.from_tf([0.2, 0.4, 0.2], [1, -0.5, 0.3])
+    inputs = itertools.repeat([-1, 1], 100000)
+    peak = max(max(-y.inf, y.sup) for y in f.simulate(inputs))
+
+"""
+import heapq
+import math
+from fractions import Fraction
+from affapy.aa import Affine
+from affapy.ia import Interval
+from affapy.backend import _nextafter, _down, _up
+from affapy.error import affapyError
+
+# Bound of the relative rounding error of float64 (2**-53)
+_EPS = 2. ** -53
+
+# Bound of the absolute error of an underflow
+_ETA = 2. ** -1074
+
+
+def _matrix(m, rows: int, cols: int, name: str) -> tuple:
+    """Check the shape of a matrix and return it as a tuple of rows."""
+    m = tuple(tuple(row) for row in m)
+    if len(m) != rows or any(len(row) != cols for row in m):
+        raise affapyError("{} must be a {}x{} matrix".format(name, rows, cols))
+    return m
+
+
+def _sample(value) -> tuple:
+    """
+    Convert an input sample to a float affine form (x0, xi, rad). A range
+    gets a new noise symbol, the conversion errors of an affine form get
+    a new noise symbol.
+    """
+    if isinstance(value, Affine):
+        x0 = float(value.x0)
+        xi = {i: float(v) for i, v in value._xi.items()}
+        rad = math.fsum(map(abs, xi.values()))
+        err = (abs(x0) + rad) * _EPS + (len(xi) + 1) * _ETA
+        xi[Affine._getNewXi()] = err
+        return x0, xi, _nextafter(rad + err, math.inf)
+    if isinstance(value, (list, tuple)):
+        if len(value) != 2:
+            raise affapyError("a range must be [inf, sup]")
+        if all(isinstance(v, (int, float)) for v in value):
+            return _range(*sorted(value))
+        value = Interval(value[0], value[1])
+    elif isinstance(value, (int, float, Fraction, str)):
+        value = Interval(value, value)
+    if not isinstance(value, Interval):
+        raise affapyError("samples must be Affine, Interval, range or number")
+    return _range(value.inf, value.sup)
+
+
+def _range(inf, sup) -> tuple:
+    """Return the float affine form of the range [inf, sup]."""
+    a, b = _down(inf), _up(sup)
+    if a == b:
+        return a, {}, 0.
+    x0 = (a + b) / 2
+    rad = _nextafter(max(b - x0, x0 - a), math.inf)
+    return x0, {Affine._getNewXi(): rad}, rad
+
+
+def _combine(row: tuple, terms: list) -> tuple:
+    """
+    Return the linear combination of float affine forms (x0, xi, rad)
+    with the coefficients of row, and the bound of its rounding errors on
+    a new noise symbol.
+    """
+    x0, xi, k, bound, count = 0., {}, 0, 0., 1
+    for c, (t0, txi, trad) in zip(row, terms):
+        if c == 0:
+            continue
+        k += 1
+        x0 += c * t0
+        bound += abs(c) * (abs(t0) + trad)
+        count += len(txi) + 1
+        for i, v in txi.items():
+            u = xi.get(i)
+            xi[i] = c * v if u is None else u + c * v
+    rad = math.fsum(map(abs, xi.values()))
+    if k:
+        # Each result is a sum of k products: its error is lower than
+        # gamma_k times the sum of the absolute values of the products.
+        # The factor 1 + 2**-40 covers the rounding of the bound.
+        gamma = k * _EPS / (1 - k * _EPS) * (1 + 2. ** -40)
+        err = bound * gamma + count * _ETA
+        xi[Affine._getNewXi()] = err
+        rad += err
+    return x0, xi, _nextafter(rad, math.inf)
+
+
+def _condense(form: tuple, n: int) -> tuple:
+    """Condense a float affine form to at most n noise symbols."""
+    x0, xi, rad = form
+    if len(xi) <= n:
+        return form
+    kept = dict(heapq.nlargest(n - 1, xi.items(),
+                               key=lambda item: abs(item[1])))
+    delta = math.fsum(abs(v) for i, v in xi.items() if i not in kept)
+    kept[Affine._getNewXi()] = _nextafter(delta, math.inf)
+    return x0, kept, _nextafter(math.fsum(map(abs, kept.values())),
+                                    math.inf)
+
+
+def _enclosure(form: tuple) -> Interval:
+    """Return the interval associated to a float affine form."""
+    x0, xi, rad = form
+    return Interval(_nextafter(x0 - rad, -math.inf),
+                    _nextafter(x0 + rad, math.inf))
+
+
+class StateSpace:
+    """
+    Linear filter in state-space form. It contains the fields:
+
+    * **A**, **B**, **C**, **D**: matrices (tuples of rows)
+    * **states**: number of states *n*
+    * **inputs**: number of inputs *m*
+    * **outputs**: number of outputs *p*
+
+    """
+
+    def __init__(self, A, B, C, D):
+        """
+        Create a filter from its matrices: A is n x n, B is n x m, C is
+        p x n and D is p x m.
+
+        Args:
+            A (list of lists): state matrix
+            B (list of lists): input matrix
+            C (list of lists): output matrix
+            D (list of lists): feedthrough matrix
+
+        Raises:
+            affapyError: the filter needs inputs and outputs
+            affapyError: inconsistent shapes of the matrices
+
+        """
+        n, p = len(A), len(C)
+        m = len(D[0]) if D else 0
+        if p == 0 or m == 0:
+            raise affapyError("the filter needs inputs and outputs")
+        self.A = _matrix(A, n, n, "A")
+        self.B = _matrix(B, n, m, "B")
+        self.C = _matrix(C, p, n, "C")
+        self.D = _matrix(D, p, m, "D")
+        self.states, self.inputs, self.outputs = n, m, p
+
+    @classmethod
+    def from_tf(cls, b, a) -> "StateSpace":
+        """
+        Create a single-input single-output filter from the coefficients
+        of its transfer function, in the transposed direct form II:
+
+        .. math ::
+            H(z) = \\frac{b_0 + b_1 z^{-1} + ... + b_N z^{-N}}
+                        {a_0 + a_1 z^{-1} + ... + a_N z^{-N}}
+
+        The coefficients are divided by a_0 exactly (with fractions).
+
+        Args:
+            b (list of int or float or str): coefficients of the numerator
+            a (list of int or float or str): coefficients of the
+                denominator
+
+        Returns:
+            StateSpace: filter
+
+        Raises:
+            affapyError: a[0] must not be 0
+            affapyError: b must not be empty
+
+        """
+        if not a or a[0] == 0:
+            raise affapyError("a[0] must not be 0")
+        if not b:
+            raise affapyError("b must not be empty")
+        order = max(len(a), len(b)) - 1
+        a0 = Fraction(a[0])
+        b = [Fraction(v) / a0 for v in b] + [0] * (order + 1 - len(b))
+        a = [Fraction(v) / a0 for v in a] + [0] * (order + 1 - len(a))
+        A = [[0] * order for _ in range(order)]
+        for k in range(order):
+            A[k][0] = -a[k + 1]
+            if k + 1 < order:
+                A[k][k + 1] = 1
+        B = [[b[k + 1] - a[k + 1] * b[0]] for k in range(order)]
+        C = [[1] + [0] * (order - 1)] if order else [[]]
+        return cls(A, B, C, [[b[0]]])
+
+    def simulate(self, inputs, state=None, symbols: int = 16,
+                 period: int = 8):
+        """
+        Simulate the filter over a stream of input samples. It is a
+        generator which yields the enclosures of the outputs of each
+        step.
+
+        A sample of a single-input filter is a range [inf, sup], an
+        **Interval**, an **Affine** or a number. A sample of a filter with
+        several inputs is a sequence of such values. The ranges and
+        intervals get a new noise symbol, the noise symbols of the affine
+        forms are kept.
+
+        Args:
+            inputs (iterable): input samples
+            state (list): initial state, with values like the samples
+                (default: zeros)
+            symbols (int): maximal number of noise symbols of a state
+                after a condensation
+            period (int): number of steps between two condensations
+
+        Returns:
+            generator: the enclosure (Interval) of the output of each
+            step, or the tuple of the enclosures if the filter has several
+            outputs
+
+        Raises:
+            affapyError: symbols and period must be positive
+            affapyError: inconsistent state or samples
+
+        """
+        if symbols < 1 or period < 1:
+            raise affapyError("symbols and period must be positive")
+        n, m = self.states, self.inputs
+        if state is None:
+            state = [(0., {}, 0.)] * n
+        else:
+            state = [_sample(v) for v in state]
+            if len(state) != n:
+                raise affapyError("state must have {} values".format(n))
+        rows = [tuple(map(float, a + b)) for a, b in zip(self.A, self.B)]
+        outs = [tuple(map(float, c + d)) for c, d in zip(self.C, self.D)]
+        step = 0
+        for sample in inputs:
+            if m == 1:
+                u = [_sample(sample)]
+            else:
+                u = [_sample(v) for v in sample]
+                if len(u) != m:
+                    raise affapyError("samples must have {} values"
+                                      .format(m))
+            terms = state + u
+            y = tuple(_enclosure(_combine(c, terms)) for c in outs)
+            state = [_combine(r, terms) for r in rows]
+            step += 1
+            if step % period == 0:
+                state = [_condense(x, symbols) for x in state]
+            yield y[0] if len(y) == 1 else y
@@ -0,0 +1,271 @@
+"""
+This module can count the operations performed with *affapy*.
+
+When it is enabled, it records for each operation of **Affine** and
+**Interval**:
+
+* the number of calls
+* the cumulative time (including the nested operations, for example the
+  time of *inv* is included in the time of *__truediv__*)
+
+and also:
+
+* the number of new noise symbols (calls of *Affine._getNewXi*)
+* the peak number of noise symbols of an affine form
+* the number of mpf values held by the results of the operations
+
+The operations are instrumented only while the statistics are enabled:
+when they are disabled, the original methods are restored and there is no
+overhead.
+
+You can enable the statistics globally with **enable** and **disable**, and
+read them with **snapshot**, or use the **collect** class as a context
+manager or a decorator to collect the statistics of a portion of code.
+
+**Example**:
+
+.. code-block:: python
+
+    from affapy.stats import collect
+
+    with collect() as c:
+        x * y + z
+
+    c.stats["calls"]["Affine.__mul__"]
+
+"""
+import functools
+from contextlib import ContextDecorator
+from time import perf_counter
+from affapy.aa import Affine
+from affapy.ia import Interval
+
+AFFINE_OPS = (
+    "__neg__", "__add__", "__radd__", "__sub__", "__rsub__", "__mul__",
+    "__rmul__", "_affineConstructor", "inv", "__truediv__", "__rtruediv__",
+    "sqr", "__pow__", "__abs__", "sqrt", "exp", "log", "sin", "cos", "tan",
+    "cotan", "cosh", "sinh", "tanh", "__eq__", "__ne__", "__contains__",
+    "straddles_zero", "strictly_neg", "rad", "copy")
+
+INTERVAL_OPS = (
+    "width", "mid", "radius", "__neg__", "__add__", "__radd__", "__sub__",
+    "__rsub__", "__mul__", "__rmul__", "__truediv__", "__rtruediv__",
+    "__pow__", "__floor__", "__ceil__", "__abs__", "sqrt", "exp", "log",
+    "minTrigo", "cos", "sin", "tan", "cotan", "cosh", "sinh", "tanh",
+    "__eq__", "__ne__", "__ge__", "__gt__", "__le__", "__lt__",
+    "__contains__", "straddles_zero", "copy", "convert")
+
+# Instrumented methods: (class, name) -> [original, {owner: factory}]
+_patches = {}
+
+
+def _rebuild(cls, name: str):
+    """
+    Set the method name of cls: the original method wrapped by the
+    factories of all the owners.
+    """
+    original, factories = _patches[(cls, name)]
+    if not factories:
+        setattr(cls, name, original)
+        del _patches[(cls, name)]
+        return
+    static = isinstance(original, staticmethod)
+    func = original.__func__ if static else original
+    for factory in factories.values():
+        func = factory(func)
+    setattr(cls, name, staticmethod(func) if static else func)
+
+
+def _install(owner, cls, name: str, factory):
+    """
+    Instrument a method. The factory takes the method and returns the
+    instrumented method. Several owners can instrument the same method.
+
+    Args:
+        owner: owner of the instrumentation
+        cls (class): class of the method
+        name (str): name of the method
+        factory (function): wrapper factory
+
+    """
+    if (cls, name) not in _patches:
+        _patches[(cls, name)] = [cls.__dict__[name], {}]
+    _patches[(cls, name)][1][owner] = factory
+    _rebuild(cls, name)
+
+
+def _uninstall(owner):
+    """
+    Remove all the instrumentations of an owner.
+
+    Args:
+        owner: owner of the instrumentation
+
+    """
+    for key in list(_patches):
+        if owner in _patches[key][1]:
+            del _patches[key][1][owner]
+            _rebuild(*key)
+
+
+class _Counters:
+    """Statistics of a scope."""
+
+    def __init__(self):
+        self.calls = {}
+        self.time = {}
+        self.symbols = 0
+        self.peak = 0
+        self.mpf = 0
+
+    def record(self, key: str, elapsed: float, result):
+        """Record a call of an operation."""
+        self.calls[key] = self.calls.get(key, 0) + 1
+        self.time[key] = self.time.get(key, 0.) + elapsed
+        if isinstance(result, Affine):
+            n = len(result._xi)
+            self.mpf += n + 1
+            if n > self.peak:
+                self.peak = n
+        elif isinstance(result, Interval):
+            self.mpf += 2
+
+    def snapshot(self) -> dict:
+        """Return the statistics as a dictionary."""
+        return {"calls": dict(self.calls), "time": dict(self.time),
+                "symbols": self.symbols, "peak_symbols": self.peak,
+                "mpf": self.mpf}
+
+
+# Global statistics and list of the statistics being recorded
+_global = _Counters()
+_active = []
+
+
+def _timed(key: str, func):
+    """Wrap an operation to count its calls and time."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        tstart = perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = perf_counter() - tstart
+        for counters in _active:
+            counters.record(key, elapsed, result)
+        return result
+    return wrapper
+
+
+def _newXi(func):
+    """Wrap Affine._getNewXi to count the new noise symbols."""
+    @functools.wraps(func)
+    def wrapper():
+        for counters in _active:
+            counters.symbols += 1
+        return func()
+    return wrapper
+
+
+def _refresh():
+    """Instrument the operations if statistics are recorded."""
+    _uninstall(__name__)
+    if not _active:
+        return
+    for cls, ops in ((Affine, AFFINE_OPS), (Interval, INTERVAL_OPS)):
+        for name in ops:
+            key = cls.__name__ + "." + name
+            _install(__name__, cls, name,
+                     functools.partial(_timed, key))
+    _install(__name__, Affine, "_getNewXi", _newXi)
+
+
+def enable():
+    """Enable the global statistics."""
+    if _global not in _active:
+        _active.append(_global)
+        _refresh()
+
+
+def disable():
+    """Disable the global statistics."""
+    if _global in _active:
+        _active.remove(_global)
+        _refresh()
+
+
+def is_enabled() -> bool:
+    """Return True if the global statistics are enabled."""
+    return _global in _active
+
+
+def reset():
+    """Reset the global statistics."""
+    global _global
+    enabled = is_enabled()
+    if enabled:
+        _active.remove(_global)
+    _global = _Counters()
+    if enabled:
+        _active.append(_global)
+
+
+def snapshot() -> dict:
+    """
+    Return the global statistics. The dictionary contains the fields:
+
+    * **calls**: number of calls per operation, e.g. *Affine.__mul__*
+    * **time**: cumulative time per operation in seconds
+    * **symbols**: number of new noise symbols
+    * **peak_symbols**: peak number of noise symbols of an affine form
+    * **mpf**: number of mpf values held by the results
+
+    Returns:
+        dict: statistics
+
+    """
+    return _global.snapshot()
+
+
+class collect(ContextDecorator):
+    """
+    Collect the statistics of a portion of code. You can use it:
+
+    * As decorator of a function
+    * Using the *with* statement
+
+    The statistics are stored in the field **stats** at the exit of the
+    context, with the format of **snapshot**. They are independent from
+    the global statistics.
+
+    **Example**:
+
+    .. code-block:: python
+
+        from affapy.stats import collect
+
+        with collect() as c:
+            x * y
+
+        @collect()
+        def eval_fct(x, y):
+            return x * y
+
+    """
+
+    def __init__(self):
+        """Init the context manager."""
+        self._counters = None
+        self.stats = None
+
+    def __enter__(self):
+        """Start the collection of the statistics."""
+        self._counters = _Counters()
+        _active.append(self._counters)
+        _refresh()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Stop the collection and store the statistics."""
+        _active.remove(self._counters)
+        _refresh()
+        self.stats = self._counters.snapshot()
+        return False
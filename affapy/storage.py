@@ -0,0 +1,407 @@
+"""
+This module can store large collections of affine forms on disk.
+
+The forms are written in bulk in a binary container which is opened with
+:mod:`mmap`: a form, or a slice of forms, can be read without reading the
+rest of the file.
+
+The noise symbols are stored like a CSR sparse matrix: the row *k* of the
+matrix contains the coefficients of the form *k*.
+
+**Format** (little-endian):
+
+* header (32 bytes):
+
+  * magic: ``b"AFFAPY\\x00\\x01"`` (8 bytes)
+  * count: number of forms *n* (uint64)
+  * nnz: total number of noise symbols (uint64)
+  * width: size *w* in bytes of a mantissa (uint32)
+  * reserved (4 bytes)
+
+* index: *n + 1* offsets in the symbols and coefficients columns (uint64),
+  the noise symbols of the form *k* are between index[k] and index[k + 1]
+* centers: *n* numbers
+* symbols: *nnz* noise symbols (int64)
+* coefficients: *nnz* numbers
+
+A number is a record of *8 + w* bytes: the exponent (int64) and the signed
+mantissa (two's complement, *w* bytes). The value is
+:math:`mantissa \\times 2^{exponent}`. The special values have a zero
+mantissa: the exponent is the one of the raw *mpmath* value (0 for zero).
+
+**Example**:
+
+.. code-block:: python
+
+    from affapy.storage import write, AffineFile
+
+    write("forms.aff", forms)
+    with AffineFile("forms.aff") as f:
+        x = f[12]
+        batch = f.batch(1000, 2000)
+
+The forms can also be exported in memory as a CSR sparse matrix for
+vectorized analyses, with *NumPy* and *SciPy* if they are installed:
+
+.. code-block:: python
+
+    from affapy.storage import to_csr
+    from scipy.sparse import csr_matrix
+
+    indptr, symbols, coefs, centers = to_csr(forms)
+    m = csr_matrix((coefs, symbols, indptr))
+
+"""
+import importlib
+import mmap
+import struct
+from array import array
+import affapy.aa
+import affapy.ia
+from affapy.error import affapyError
+from affapy.backend import _away
+
+MAGIC = b"AFFAPY\x00\x01"
+_HEADER = struct.Struct("<8sQQI4x")
+
+
+class AffineBatch:
+    """
+    Batch of affine forms stored as columns, like a CSR sparse matrix.
+    It contains four fields:
+
+    * **centers**: list of the centers (mpf)
+    * **indptr**: list of the offsets of the forms in the two next columns
+    * **symbols**: list of the noise symbols (int)
+    * **coefs**: list of the coefficients of the noise symbols (mpf)
+
+    """
+
+    def __init__(self, centers: list, indptr: list, symbols: list,
+                 coefs: list):
+        """
+        Create a batch from its columns.
+
+        Args:
+            centers (list of mpf): centers
+            indptr (list of int): offsets, with length len(centers) + 1
+            symbols (list of int): noise symbols
+            coefs (list of mpf): coefficients
+
+        Raises:
+            affapyError: inconsistent columns
+
+        """
+        if (len(indptr) != len(centers) + 1 or len(symbols) != len(coefs)
+                or indptr[0] != 0 or indptr[-1] != len(symbols)):
+            raise affapyError("inconsistent columns")
+        self.centers = centers
+        self.indptr = indptr
+        self.symbols = symbols
+        self.coefs = coefs
+
+    @classmethod
+    def fromAffine(cls, forms) -> "AffineBatch":
+        """
+        Create a batch from affine forms.
+
+        Args:
+            forms (iterable of Affine): affine forms
+
+        Returns:
+            AffineBatch: batch
+
+        """
+        centers, indptr, symbols, coefs = [], [0], [], []
+        for x in forms:
+            centers.append(x.x0)
+            xi = x._xi
+            symbols.extend(xi)
+            coefs.extend(xi.values())
+            indptr.append(len(symbols))
+        return cls(centers, indptr, symbols, coefs)
+
+    def toAffine(self) -> list:
+        """
+        Convert the batch into affine forms.
+
+        Returns:
+            list: list of Affine
+
+        """
+        return [self[k] for k in range(len(self))]
+
+    def __len__(self) -> int:
+        """Return the number of forms."""
+        return len(self.centers)
+
+    def __getitem__(self, k: int) -> "affapy.aa.Affine":
+        """
+        Return the affine form k of the batch.
+
+        Args:
+            k (int): index
+
+        Returns:
+            Affine: affine form
+
+        """
+        start, end = self.indptr[k], self.indptr[k + 1]
+        xi = dict(zip(self.symbols[start:end], self.coefs[start:end]))
+        return affapy.aa.Affine(x0=self.centers[k], xi=xi)
+
+
+def _numpy():
+    """Return the module numpy, or None if it is not installed."""
+    try:
+        return importlib.import_module("numpy")
+    except ImportError:
+        return None
+
+
+def to_csr(forms, dtype: str = "float64") -> tuple:
+    """
+    Export affine forms as a CSR sparse matrix: the row *k* contains the
+    coefficients of the form *k*, and the column *i* the coefficients of
+    the noise symbol *i*. The columns (indptr, symbols, coefs) are the
+    arguments of *scipy.sparse.csr_matrix*.
+
+    With the type "float64", the centers are rounded to the nearest
+    float64 and the coefficients away from zero, so that the magnitudes
+    of the noise symbols are not reduced: the columns are NumPy arrays
+    sharing the memory of buffers of the module *array*, or these buffers
+    if NumPy is not installed.
+    With the type "object", the numbers are kept exact in NumPy arrays
+    of objects.
+
+    Args:
+        forms (iterable of Affine or AffineBatch): affine forms
+        dtype (str): type of the numbers, "float64" or "object"
+
+    Returns:
+        tuple: (indptr, symbols, coefs, centers)
+
+    Raises:
+        affapyError: dtype must be float64 or object
+        affapyError: dtype object requires numpy
+
+    """
+    if dtype not in ("float64", "object"):
+        raise affapyError("dtype must be float64 or object")
+    np = _numpy()
+    if dtype == "object" and np is None:
+        raise affapyError("dtype object requires numpy")
+    if isinstance(forms, AffineBatch):
+        indptr, symbols = array("q", forms.indptr), array("q", forms.symbols)
+        centers, coefs = forms.centers, forms.coefs
+    elif dtype == "object":
+        batch = AffineBatch.fromAffine(forms)
+        indptr, symbols = array("q", batch.indptr), array("q", batch.symbols)
+        centers, coefs = batch.centers, batch.coefs
+    else:
+        # The columns are filled directly, without the buffers cached by
+        # Affine.xi_buffers
+        indptr, symbols = array("q", [0]), array("q")
+        centers, coefs = array("d"), array("d")
+        for x in forms:
+            symbols.extend(x._xi)
+            coefs.extend(map(_away, x._xi.values()))
+            centers.append(float(x._x0))
+            indptr.append(len(symbols))
+    if dtype == "object":
+        return (np.frombuffer(indptr, np.int64),
+                np.frombuffer(symbols, np.int64),
+                np.array(coefs, dtype=object), np.array(centers, dtype=object))
+    if not isinstance(coefs, array):
+        centers = array("d", map(float, centers))
+        coefs = array("d", map(_away, coefs))
+    if np is None:
+        return indptr, symbols, coefs, centers
+    return (np.frombuffer(indptr, np.int64), np.frombuffer(symbols, np.int64),
+            np.frombuffer(coefs, np.float64),
+            np.frombuffer(centers, np.float64))
+
+
+def _width(flat: tuple) -> int:
+    """Return the number of bytes of the largest packed mantissa."""
+    width = 1
+    for man in flat[::2]:
+        width = max(width, (man.bit_length() + 8) // 8)
+    return width
+
+
+def _records(flat: tuple, width: int) -> bytes:
+    """Encode packed numbers as records."""
+    out = bytearray()
+    for k in range(0, len(flat), 2):
+        out += struct.pack("<q", flat[k + 1])
+        out += flat[k].to_bytes(width, "little", signed=True)
+    return bytes(out)
+
+
+def write(path: str, forms) -> int:
+    """
+    Write affine forms in a file.
+
+    Args:
+        path (str): path of the file
+        forms (iterable of Affine or AffineBatch): affine forms
+
+    Returns:
+        int: number of written forms
+
+    """
+    if not isinstance(forms, AffineBatch):
+        forms = AffineBatch.fromAffine(forms)
+    centers = affapy.ia._pack(forms.centers)
+    coefs = affapy.ia._pack(forms.coefs)
+    width = max(_width(centers), _width(coefs))
+    n, nnz = len(forms), len(forms.symbols)
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, n, nnz, width))
+        f.write(struct.pack("<%dQ" % (n + 1), *forms.indptr))
+        f.write(_records(centers, width))
+        f.write(struct.pack("<%dq" % nnz, *forms.symbols))
+        f.write(_records(coefs, width))
+    return n
+
+
+class AffineFile:
+    """
+    Read-only access to a file of affine forms written by **write**.
+    The file is mapped in memory and the forms are decoded on demand.
+    It can be used with the *with* statement.
+
+    **Example**:
+
+    .. code-block:: python
+
+        f = AffineFile("forms.aff")
+        len(f)
+        f[0]
+        f[10:20]
+        f.close()
+
+    """
+
+    def __init__(self, path: str):
+        """
+        Open a file of affine forms.
+
+        Args:
+            path (str): path of the file
+
+        Raises:
+            affapyError: not an affapy file
+
+        """
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mm) < _HEADER.size:
+            self._mm.close()
+            raise affapyError("not an affapy file")
+        magic, n, nnz, width = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._mm.close()
+            raise affapyError("not an affapy file")
+        self._n, self._nnz, self._width = n, nnz, width
+        self._rec = 8 + width
+        self._index = _HEADER.size
+        self._centers = self._index + 8 * (n + 1)
+        self._symbols = self._centers + self._rec * n
+        self._coefs = self._symbols + 8 * nnz
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def close(self):
+        """Close the file."""
+        self._mm.close()
+
+    def __len__(self) -> int:
+        """Return the number of forms."""
+        return self._n
+
+    @property
+    def nnz(self) -> int:
+        """Return the total number of noise symbols."""
+        return self._nnz
+
+    def _packed(self, offset: int, count: int) -> tuple:
+        """Decode count records as packed numbers."""
+        flat = []
+        mm, rec, width = self._mm, self._rec, self._width
+        for k in range(count):
+            pos = offset + k * rec
+            flat.append(int.from_bytes(mm[pos + 8:pos + rec], "little",
+                                       signed=True))
+            flat.append(struct.unpack_from("<q", mm, pos)[0])
+        return tuple(flat)
+
+    def _indptr(self, start: int, stop: int) -> tuple:
+        """Return the offsets of the forms start to stop included."""
+        return struct.unpack_from("<%dQ" % (stop - start + 1), self._mm,
+                                  self._index + 8 * start)
+
+    def __getitem__(self, k):
+        """
+        Return the affine form k, or a list of affine forms for a slice.
+
+        Args:
+            k (int or slice): index
+
+        Returns:
+            Affine: affine form
+            list: list of Affine
+
+        Raises:
+            IndexError: index out of range
+
+        """
+        if isinstance(k, slice):
+            return [self[i] for i in range(*k.indices(self._n))]
+        if k < 0:
+            k += self._n
+        if not 0 <= k < self._n:
+            raise IndexError("index out of range")
+        start, end = self._indptr(k, k + 1)
+        ids = struct.unpack_from("<%dq" % (end - start), self._mm,
+                                 self._symbols + 8 * start)
+        return affapy.aa._unpickleAffine(
+            self._packed(self._centers + self._rec * k, 1), ids,
+            self._packed(self._coefs + self._rec * start, end - start))
+
+    def __iter__(self):
+        """Iterate over the affine forms."""
+        for k in range(self._n):
+            yield self[k]
+
+    def batch(self, start: int = 0, stop: int = None) -> AffineBatch:
+        """
+        Read the forms start to stop (excluded) as a batch, without
+        creating the affine forms.
+
+        Args:
+            start (int): index of the first form
+            stop (int): index after the last form (default: end of file)
+
+        Returns:
+            AffineBatch: batch
+
+        """
+        start, stop, _ = slice(start, stop).indices(self._n)
+        stop = max(start, stop)
+        indptr = self._indptr(start, stop)
+        first, last = indptr[0], indptr[-1]
+        symbols = struct.unpack_from("<%dq" % (last - first), self._mm,
+                                     self._symbols + 8 * first)
+        centers = affapy.ia._unpack(self._packed(
+            self._centers + self._rec * start, stop - start))
+        coefs = affapy.ia._unpack(self._packed(
+            self._coefs + self._rec * first, last - first))
+        return AffineBatch(centers, [i - first for i in indptr],
+                           list(symbols), coefs)
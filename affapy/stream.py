@@ -0,0 +1,370 @@
+"""
+This module bounds functions of sensor readings over streams.
+
+Each reading is a measured value with a tolerance, *value* :math:`\\pm`
+*tolerance*: it becomes the interval :math:`[v - t, v + t]` (rounded
+outward), then an affine form (or an interval, or a Taylor model, see
+**affapy.box.inputs**) on which the function is evaluated. A reading of a
+function of several variables is a sequence of such values.
+
+The **StreamEvaluator** class reads the readings by chunks, from an
+iterator (**StreamEvaluator.run**) or an asynchronous iterator
+(**StreamEvaluator.arun**):
+
+* a chunk is evaluated at once, in the current process or by a batched
+  evaluator (**affapy.parallel.ParallelEvaluator**,
+  **affapy.distributed.Coordinator**)
+* the enclosures are yielded in the order of the readings, and the next
+  chunk is only read when the enclosures of the previous one are
+  consumed: the memory is bounded by the size of a chunk, and a slow
+  consumer slows down the reading of the stream
+* the enclosures can be checked against limits: a reading is *ok* if its
+  enclosure is in the limits, *alarm* if it is out of the limits, and
+  *unknown* otherwise
+
+The function can be compiled into a dataflow graph (see
+**affapy.dataflow.trace**) with a single output. The latency and the
+throughput of each chunk are recorded.
+
+**Example**:
+
+.. code-block:: python
+
+    from affapy.stream import StreamEvaluator
+
+    def power(u, i):
+        return u * i
+
+    checker = StreamEvaluator(power, inputs=2, limits=(0, 1500))
+    for result in checker.run(((u, 0.5), (i, 0.01)) for u, i in sensor):
+        if result.status != "ok":
+            print(result.index, result.enclosure)
+    print(checker.stats())
+
+"""
+import asyncio
+from collections import deque, namedtuple
+from time import perf_counter
+from affapy.error import affapyError
+from affapy.ia import Interval
+from affapy.dataflow import Graph
+import affapy.box
+import affapy.parallel
+
+# Enclosure of the function at a reading, and status of the range check
+# (None without limits)
+Result = namedtuple("Result", ["index", "enclosure", "status"])
+
+# Metrics of a chunk: number of readings, time between the arrival of its
+# first reading and its enclosures (latency), evaluation time (compute),
+# and readings evaluated per second
+ChunkMetrics = namedtuple(
+    "ChunkMetrics", ["index", "size", "latency", "compute", "throughput"])
+
+
+class _GraphFunction:
+    """Function evaluating the single output of a dataflow graph."""
+
+    def __init__(self, graph: Graph):
+        if len(graph.outputs) != 1:
+            raise affapyError("the graph must have a single output")
+        self.graph = graph
+
+    def __call__(self, *args):
+        return self.graph.evaluate(*args).outputs[0]
+
+
+def _interval(reading) -> Interval:
+    """Convert a reading (value, tolerance), number or Interval."""
+    if isinstance(reading, Interval):
+        return reading
+    if isinstance(reading, (list, tuple)):
+        if len(reading) != 2:
+            raise affapyError("a reading must be (value, tolerance)")
+        value, tol = reading
+        if tol < 0:
+            raise affapyError("the tolerance must be positive")
+        return Interval(value, value) + Interval(-tol, tol)
+    return Interval(reading, reading)
+
+
+class _AsyncIterator:
+    """Asynchronous iterator over an iterable."""
+
+    def __init__(self, iterable):
+        self._it = iter(iterable)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._it)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class _AsyncResults:
+    """Asynchronous iterator over the results of StreamEvaluator.arun."""
+
+    def __init__(self, evaluator, readings):
+        self._evaluator = evaluator
+        if hasattr(readings, "__aiter__"):
+            self._readings = readings.__aiter__()
+        else:
+            self._readings = _AsyncIterator(readings)
+        self._results = deque()
+        self._task, self._index, self._ended = None, 0, False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while not self._results:
+            if self._ended:
+                raise StopAsyncIteration
+            try:
+                chunk, arrival = await self._read()
+                if chunk:
+                    loop = asyncio.get_event_loop()
+                    self._results.extend(await loop.run_in_executor(
+                        None, self._evaluator._process, self._index, chunk,
+                        arrival))
+                    self._index += len(chunk)
+            except BaseException:
+                self._close()
+                raise
+        return self._results.popleft()
+
+    async def _read(self) -> tuple:
+        """Read the next chunk and the arrival time of its first reading."""
+        chunk, arrival = [], 0.
+        max_delay = self._evaluator.max_delay
+        while len(chunk) < self._evaluator.chunksize:
+            if self._task is None:
+                self._task = asyncio.ensure_future(self._readings.__anext__())
+            timeout = None
+            if chunk and max_delay is not None:
+                timeout = max(0., arrival + max_delay - perf_counter())
+            done, _ = await asyncio.wait({self._task}, timeout=timeout)
+            if not done:
+                break
+            done, self._task = self._task, None
+            try:
+                reading = done.result()
+            except StopAsyncIteration:
+                self._ended = True
+                break
+            if not chunk:
+                arrival = perf_counter()
+            chunk.append(reading)
+        return chunk, arrival
+
+    def _close(self):
+        """Stop reading the stream."""
+        self._ended = True
+        self._results.clear()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def aclose(self):
+        """Stop reading the stream, like the aclose of a generator."""
+        self._close()
+
+
+class StreamEvaluator:
+    """
+    Evaluate a function over a stream of readings. It contains the fields:
+
+    * **fn**: the evaluated function
+    * **inputs**: number of arguments of the function
+    * **model**: *aa*, *ia* or *tm*
+    * **chunksize**: number of readings evaluated at once
+    * **limits**: Interval of the valid values, or None
+    * **evaluator**: batched evaluator, or None
+    * **max_delay**: maximal waiting time of a reading in an incomplete
+      chunk (asynchronous streams only), or None
+    * **order**: order of the Taylor models of the model *tm*
+    * **metrics**: metrics of the last chunks (ChunkMetrics)
+    * **count**: number of evaluated readings
+
+    """
+
+    def __init__(self, fn, inputs: int = 1, model: str = "aa",
+                 chunksize: int = 64, limits=None, evaluator=None,
+                 max_delay: float = None, history: int = 1000,
+                 order: int = 5):
+        """
+        Init the evaluator.
+
+        Args:
+            fn (function or Graph): function of the readings, or dataflow
+                graph with a single output
+            inputs (int): number of arguments of the function
+            model (str): *aa*, *ia* or *tm* (default: *aa*)
+            chunksize (int): number of readings evaluated at once
+            limits (Interval or list): valid values [inf, sup] (default:
+                no check)
+            evaluator (object): object whose method *evaluate* evaluates
+                fn over a list of boxes, like **ParallelEvaluator**
+                (default: evaluation in the current process)
+            max_delay (float): maximal waiting time in seconds before an
+                incomplete chunk is evaluated (asynchronous streams only)
+            history (int): number of chunks kept in metrics
+            order (int): order of the Taylor models of the model *tm*
+
+        Raises:
+            affapyError: model must be 'aa', 'ia' or 'tm'
+            affapyError: inputs and chunksize must be positive
+            affapyError: the graph must have a single output
+
+        """
+        if model not in ("aa", "ia", "tm"):
+            raise affapyError("model must be 'aa', 'ia' or 'tm'")
+        if inputs < 1 or chunksize < 1:
+            raise affapyError("inputs and chunksize must be positive")
+        if isinstance(fn, Graph):
+            fn = _GraphFunction(fn)
+        if limits is not None and not isinstance(limits, Interval):
+            limits = Interval(limits[0], limits[1])
+        self.fn = fn
+        self.inputs = inputs
+        self.model = model
+        self.chunksize = chunksize
+        self.limits = limits
+        self.evaluator = evaluator
+        self.max_delay = max_delay
+        self.order = order
+        self.metrics = deque(maxlen=history)
+        self.count = 0
+        self._chunks = 0
+        self._compute = 0.
+
+    def _box(self, reading) -> tuple:
+        """Convert a reading into a box."""
+        if self.inputs == 1:
+            return (_interval(reading),)
+        if len(reading) != self.inputs:
+            raise affapyError("a reading must have {} values"
+                              .format(self.inputs))
+        return tuple(_interval(r) for r in reading)
+
+    def _status(self, itv: Interval) -> str:
+        """Check an enclosure against the limits."""
+        if self.limits is None:
+            return None
+        if itv in self.limits:
+            return "ok"
+        if itv.sup < self.limits.inf or itv.inf > self.limits.sup:
+            return "alarm"
+        return "unknown"
+
+    def _process(self, index: int, chunk: list, arrival: float) -> list:
+        """
+        Evaluate a chunk of readings and record its metrics.
+
+        Args:
+            index (int): index of the first reading of the chunk
+            chunk (list): readings
+            arrival (float): arrival time of the first reading
+
+        Returns:
+            list: list of Result
+
+        """
+        boxes = [self._box(reading) for reading in chunk]
+        tstart = perf_counter()
+        if self.evaluator is None:
+            itvs = affapy.parallel._evalBoxes(
+                self.fn, self.model, boxes, self.order)
+        else:
+            itvs = self.evaluator.evaluate(boxes)
+        end = perf_counter()
+        compute = end - tstart
+        self.metrics.append(ChunkMetrics(
+            self._chunks, len(chunk), end - arrival, compute,
+            len(chunk) / compute if compute > 0 else float("inf")))
+        self._chunks += 1
+        self._compute += compute
+        self.count += len(chunk)
+        return [Result(index + k, itv, self._status(itv))
+                for k, itv in enumerate(itvs)]
+
+    def run(self, readings):
+        """
+        Evaluate the function over a stream of readings. It is a
+        generator which reads the readings by chunks.
+
+        Args:
+            readings (iterable): readings
+
+        Yields:
+            Result: index of the reading, enclosure of the function and
+            status of the range check
+
+        Raises:
+            affapyError: invalid reading
+
+        """
+        chunk, arrival, index = [], 0., 0
+        for reading in readings:
+            if not chunk:
+                arrival = perf_counter()
+            chunk.append(reading)
+            if len(chunk) == self.chunksize:
+                yield from self._process(index, chunk, arrival)
+                index += len(chunk)
+                chunk = []
+        if chunk:
+            yield from self._process(index, chunk, arrival)
+
+    def arun(self, readings):
+        """
+        Evaluate the function over an asynchronous stream of readings. It
+        returns an asynchronous iterator which reads the readings by
+        chunks. The chunks are evaluated in a thread of the default
+        executor of the event loop. The iterator must be closed with its
+        method *aclose* if it is not consumed entirely.
+
+        With *max_delay*, an incomplete chunk is evaluated when its first
+        reading waited max_delay seconds, so a slow stream still gets its
+        enclosures in time.
+
+        Args:
+            readings (iterable or async iterable): readings
+
+        Returns:
+            async iterator: Result of each reading: index of the reading,
+            enclosure of the function and status of the range check
+
+        Raises:
+            affapyError: invalid reading
+
+        """
+        return _AsyncResults(self, readings)
+
+    def stats(self) -> dict:
+        """
+        Return the statistics of the evaluation. The dictionary contains
+        the fields:
+
+        * **readings**: number of evaluated readings
+        * **chunks**: number of evaluated chunks
+        * **throughput**: readings evaluated per second of computation
+        * **latency**: mean latency of the chunks in metrics
+        * **max_latency**: maximal latency of the chunks in metrics
+
+        Returns:
+            dict: statistics
+
+        """
+        latencies = [m.latency for m in self.metrics]
+        return {
+            "readings": self.count,
+            "chunks": self._chunks,
+            "throughput": (self.count / self._compute
+                           if self._compute > 0 else 0.),
+            "latency": (sum(latencies) / len(latencies)
+                        if latencies else 0.),
+            "max_latency": max(latencies, default=0.)}
@@ -0,0 +1,1061 @@
+"""
+This module can create Taylor models and perform operations.
+
+A Taylor model (TM) of order :math:`n` represents a quantity :math:`x` as a
+polynomial of degree at most :math:`n` in normalized variables
+:math:`t_1, ..., t_m \\in [-1, 1]`, plus an interval remainder :math:`R`:
+
+.. math ::
+    \\hat{x} = P(t_1, ..., t_m) + R
+
+Each input interval :math:`[a, b]` gets its own variable :math:`t_k`:
+
+.. math ::
+    \\hat{x} = \\frac{a + b}{2} + \\frac{b - a}{2} t_k
+
+Like the noise symbols of the affine forms, the variables are shared by all
+the Taylor models, so the dependencies between the quantities are kept.
+But the nonlinear operations keep the terms up to the order :math:`n`,
+where affine arithmetic replaces everything but the linear part by a new
+noise symbol: the enclosures are tighter, and fewer subdivisions of the
+inputs are needed. The expansions of the elementary functions need inputs
+narrow enough for their Taylor series: on wider inputs, they fall back to
+interval arithmetic.
+
+The coefficients are computed with interval arithmetic: the polynomial
+keeps the middles of the coefficients, and their radius is added to the
+remainder, so the Taylor models are rigorous enclosures.
+
+The elementary functions use the Taylor expansion of the function at the
+constant coefficient :math:`c` of the polynomial, with the Lagrange
+remainder:
+
+.. math ::
+    f(c + h) = \\sum_{k=0}^{n} \\frac{f^{(k)}(c)}{k!} h^k +
+    \\frac{f^{(n+1)}(\\xi)}{(n+1)!} h^{n+1}
+
+**Example**:
+
+.. code-block:: python
+
+    from affapy import box
+    from affapy.ia import Interval
+    from affapy.tm import TaylorModel
+
+    x = TaylorModel(Interval(1, 2), order=6)
+    y = (x.sin()**2 * x.cos() - 4) / x.sqrt()
+    print(y.interval)
+
+    box.inputs([[1, 2]], model="tm")
+
+"""
+from fractions import Fraction
+from math import factorial
+from affapy.error import affapyError
+from affapy.ia import Interval
+import affapy.ia
+
+# Bounds of the range of a monomial over [-1, 1]^m: [0, 1] if all its
+# powers are even. The intervals are built at each use, with the numbers
+# of the current backend
+_EVEN = (0, 1)
+_ODD = (-1, 1)
+
+# Number of pieces of [-1, 1] used to bound the univariate terms
+_PIECES = 4
+
+
+def _mulMonomials(m1: tuple, m2: tuple) -> tuple:
+    """Return the product of two monomials ((var, power), ...)."""
+    powers = dict(m1)
+    for v, p in m2:
+        powers[v] = powers.get(v, 0) + p
+    return tuple(sorted(powers.items()))
+
+
+def _degree(m: tuple) -> int:
+    """Return the total degree of a monomial."""
+    return sum(p for _, p in m)
+
+
+def _range(m: tuple) -> Interval:
+    """Return the range of a monomial over [-1, 1]^m."""
+    return Interval(*(_EVEN if all(p % 2 == 0 for _, p in m) else _ODD))
+
+
+def _point(c) -> Interval:
+    """Return the degenerate interval [c, c]."""
+    return Interval(c, c)
+
+
+def _ipow(x: Interval, k: int) -> Interval:
+    """Return x^k for an integer k >= 1, without the dependency of x * x."""
+    if k % 2 == 0:
+        base = abs(x)
+        y = base
+        for _ in range(k - 1):
+            y = y * base
+        return y
+    lo, hi = _point(x.inf), _point(x.sup)
+    ylo, yhi = lo, hi
+    for _ in range(k - 1):
+        ylo, yhi = ylo * lo, yhi * hi
+    return Interval(ylo.inf, yhi.sup)
+
+
+def _univariateRange(coefs: dict) -> Interval:
+    """
+    Return the range over [-1, 1] of a univariate polynomial without
+    constant term, given as a dictionary power -> coefficient. [-1, 1] is
+    split into _PIECES pieces, and the polynomial is evaluated on each
+    piece in centered form.
+    """
+    n = max(coefs)
+    if n == 1:
+        return Interval(*_ODD) * _point(coefs[1])
+    r = 1 / _PIECES
+    lo = hi = None
+    for i in range(_PIECES):
+        m = -1 + (2 * i + 1) * r
+        # Taylor shift: coefficients of p(m + s)
+        a = [Interval(0, 0)] + [_point(coefs.get(k, 0))
+                                for k in range(1, n + 1)]
+        for i in range(n):
+            for j in range(n - 1, i - 1, -1):
+                a[j] = a[j] + a[j + 1] * m
+        b = a[0]
+        rk = 1
+        for k in range(1, n + 1):
+            rk = rk * r
+            b = b + a[k] * (Interval(0, rk) if k % 2 == 0 else
+                            Interval(-rk, rk))
+        lo = b.inf if lo is None else min(lo, b.inf)
+        hi = b.sup if hi is None else max(hi, b.sup)
+    return Interval(lo, hi)
+
+
+def _factorial(k: int) -> Interval:
+    """Return k! as an interval."""
+    return _point(factorial(k))
+
+
+def _binomial(k: int) -> Interval:
+    """Return the binomial coefficient (1/2 k) as an interval."""
+    b = Fraction(1)
+    for j in range(k):
+        b = b * (Fraction(1, 2) - j) / (j + 1)
+    return _point(b.numerator) / _point(b.denominator)
+
+
+class TaylorModel:
+    """
+    Representation of a Taylor model.
+
+    An instance of the class **TaylorModel** is composed of three fields:
+
+    * **poly**: the polynomial, a dictionary monomial -> coefficient where
+      a monomial is a tuple of (variable, power) sorted by variable, and
+      the constant monomial is ()
+    * **rem**: the remainder, an interval
+    * **order**: the maximal degree of the polynomial
+
+    """
+    # Number of variables
+    _varCount = 1
+
+    def __init__(self, interval=None, order: int = 5, poly: dict = None,
+                 rem: Interval = None):
+        """
+        Create a Taylor model. There are three ways to create one:
+
+        * With an interval: a new variable is created
+        * With a polynomial and a remainder
+        * Without argument: the Taylor model 0
+
+        Args:
+            interval (Interval or list or tuple with length 2): interval
+            order (int): maximal degree of the polynomial (default: 5)
+            poly (dict): polynomial, monomial -> coefficient
+            rem (Interval): remainder (default: [0, 0])
+
+        Returns:
+            TaylorModel: Taylor model
+
+        Raises:
+            affapyError: order must be a positive integer
+            affapyError: interval must be list, tuple or Interval
+
+        Examples:
+            >>> from affapy.tm import TaylorModel
+            >>> x = TaylorModel([1, 3])
+            >>> print(x)
+            2.0 + 1.0*t1 + [0.0, 0.0]
+
+        """
+        if not isinstance(order, int) or order < 1:
+            raise affapyError("order must be a positive integer")
+        self._order = order
+        if interval is not None:
+            if isinstance(interval, (list, tuple)) and len(interval) == 2:
+                interval = Interval(min(interval), max(interval))
+            elif not isinstance(interval, Interval):
+                raise affapyError("interval must be list, tuple or Interval")
+            mid = interval.mid()
+            rad = abs(interval - mid).sup
+            self._poly = {(): mid, ((TaylorModel._getNewVar(), 1),): rad}
+            self._rem = Interval(0, 0)
+        elif poly is not None:
+            tm = TaylorModel._build(
+                {m: _point(c) for m, c in poly.items()},
+                Interval(0, 0) if rem is None else rem, order)
+            self._poly, self._rem = tm._poly, tm._rem
+        else:
+            self._poly = {}
+            self._rem = Interval(0, 0) if rem is None else rem.copy()
+
+    # Getter
+    @property
+    def poly(self) -> dict:
+        """Return the polynomial."""
+        return self._poly.copy()
+
+    @property
+    def rem(self) -> Interval:
+        """Return the remainder."""
+        return self._rem.copy()
+
+    @property
+    def order(self) -> int:
+        """Return the order."""
+        return self._order
+
+    @property
+    def interval(self) -> Interval:
+        """
+        Return the interval enclosing the Taylor model: the range of the
+        polynomial over :math:`[-1, 1]^m` plus the remainder.
+        """
+        return self._bound(tight=True) + self._rem
+
+    @staticmethod
+    def _getNewVar() -> int:
+        """Return a new variable."""
+        TaylorModel._varCount += 1
+        return TaylorModel._varCount - 1
+
+    @staticmethod
+    def _make(poly: dict, rem: Interval, order: int) -> "TaylorModel":
+        """Create a Taylor model from its fields, without conversion."""
+        tm = TaylorModel.__new__(TaylorModel)
+        tm._poly, tm._rem, tm._order = poly, rem, order
+        return tm
+
+    @staticmethod
+    def _build(coefs: dict, rem: Interval, order: int) -> "TaylorModel":
+        """
+        Create a Taylor model from interval coefficients: the polynomial
+        keeps their middles and their radius is added to the remainder.
+        """
+        poly = {}
+        for m, c in coefs.items():
+            if c.inf == c.sup:
+                if c.inf != 0:
+                    poly[m] = c.inf
+                continue
+            mid = c.mid()
+            poly[m] = mid
+            err = abs(c - mid).sup
+            rem = rem + Interval(-err, err)
+        return TaylorModel._make(poly, rem, order)
+
+    def _bound(self, tight: bool = False) -> Interval:
+        """
+        Return the range of the polynomial over [-1, 1]^m. The monomials
+        are bounded one by one, except with tight=True, where the
+        univariate terms are bounded together by _univariateRange.
+        """
+        b = _point(self._poly.get((), 0))
+        univariate = {}
+        for m, c in self._poly.items():
+            if not m:
+                continue
+            if tight and len(m) == 1:
+                v, p = m[0]
+                univariate.setdefault(v, {})[p] = c
+            else:
+                b = b + _range(m) * _point(c)
+        for coefs in univariate.values():
+            b = b + _univariateRange(coefs)
+        return b
+
+    def _coefs(self) -> dict:
+        """Return the coefficients as intervals."""
+        return {m: _point(c) for m, c in self._poly.items()}
+
+    def _scale(self, other: Interval) -> "TaylorModel":
+        """Return the product with an interval."""
+        coefs = {m: _point(c) * other for m, c in self._poly.items()}
+        return TaylorModel._build(coefs, self._rem * other, self._order)
+
+    @staticmethod
+    def _fromInterval(itv: Interval, order: int) -> "TaylorModel":
+        """Return the constant Taylor model enclosing an interval."""
+        return TaylorModel._build({(): itv}, Interval(0, 0), order)
+
+    # Affine operations
+    def __neg__(self) -> "TaylorModel":
+        """
+        **Operator -** (unary)
+
+        Return the opposite of a Taylor model.
+
+        Args:
+            self (TaylorModel): operand
+
+        Returns:
+            TaylorModel: -self
+
+        """
+        poly = {m: -c for m, c in self._poly.items()}
+        return TaylorModel._make(poly, -self._rem, self._order)
+
+    def __add__(self, other) -> "TaylorModel":
+        """
+        **Operator +**
+
+        Add a Taylor model and a Taylor model, an interval or a number.
+        The order of the result is the minimal order of the operands.
+
+        Args:
+            self (TaylorModel): first operand
+            other (TaylorModel or Interval or int or float or mpf or str):
+                second operand
+
+        Returns:
+            TaylorModel: self + other
+
+        Raises:
+            affapyError: other must be TaylorModel, Interval, int, float,
+                mpf, str
+
+        Examples:
+            >>> x = TaylorModel([1, 3])
+            >>> print((x + x).interval)
+            [2.0, 6.0]
+
+        """
+        if isinstance(other, TaylorModel):
+            coefs = self._coefs()
+            for m, c in other._poly.items():
+                c = _point(c)
+                coefs[m] = coefs[m] + c if m in coefs else c
+            return TaylorModel._build(coefs, self._rem + other._rem,
+                                      min(self._order, other._order))
+        if (isinstance(other, Interval)
+                or isinstance(other, affapy.ia._SCALARS)):
+            # The middle of the interval goes to the constant coefficient
+            c = other if isinstance(other, Interval) else _point(other)
+            coefs = self._coefs()
+            coefs[()] = coefs[()] + c if () in coefs else c
+            return TaylorModel._build(coefs, self._rem, self._order)
+        raise affapyError(
+            "other must be TaylorModel, Interval, int, float, mpf, str")
+
+    def __radd__(self, other) -> "TaylorModel":
+        """
+        **Reverse operator +**
+
+        Args:
+            self (TaylorModel): second operand
+            other (Interval or int or float or mpf or str): first operand
+
+        Returns:
+            TaylorModel: other + self
+
+        """
+        return self + other
+
+    def __sub__(self, other) -> "TaylorModel":
+        """
+        **Operator -**
+
+        Subtract a Taylor model, an interval or a number.
+
+        Args:
+            self (TaylorModel): first operand
+            other (TaylorModel or Interval or int or float or mpf or str):
+                second operand
+
+        Returns:
+            TaylorModel: self - other
+
+        Raises:
+            affapyError: other must be TaylorModel, Interval, int, float,
+                mpf, str
+
+        """
+        if isinstance(other, (TaylorModel, Interval)):
+            return self + (-other)
+        if isinstance(other, affapy.ia._SCALARS):
+            return self + (-_point(other))
+        raise affapyError(
+            "other must be TaylorModel, Interval, int, float, mpf, str")
+
+    def __rsub__(self, other) -> "TaylorModel":
+        """
+        **Reverse operator -**
+
+        Args:
+            self (TaylorModel): second operand
+            other (Interval or int or float or mpf or str): first operand
+
+        Returns:
+            TaylorModel: other - self
+
+        """
+        return -self + other
+
+    def __mul__(self, other) -> "TaylorModel":
+        """
+        **Operator ***
+
+        Multiply a Taylor model and a Taylor model, an interval or a number.
+        The terms of the product with a degree greater than the order are
+        bounded and added to the remainder:
+
+        .. math ::
+            (P_1 + R_1)(P_2 + R_2) = P_1 P_2 + P_1 R_2 + R_1 P_2 + R_1 R_2
+
+        Args:
+            self (TaylorModel): first operand
+            other (TaylorModel or Interval or int or float or mpf or str):
+                second operand
+
+        Returns:
+            TaylorModel: self * other
+
+        Raises:
+            affapyError: other must be TaylorModel, Interval, int, float,
+                mpf, str
+
+        Examples:
+            >>> x = TaylorModel([-1, 1])
+            >>> print((x * x).interval)
+            [0.0, 1.0]
+
+        """
+        if isinstance(other, TaylorModel):
+            order = min(self._order, other._order)
+            coefs = {}
+            rem = Interval(0, 0)
+            for m1, c1 in self._poly.items():
+                for m2, c2 in other._poly.items():
+                    m = _mulMonomials(m1, m2)
+                    c = _point(c1) * _point(c2)
+                    if _degree(m) > order:
+                        rem = rem + _range(m) * c
+                    elif m in coefs:
+                        coefs[m] = coefs[m] + c
+                    else:
+                        coefs[m] = c
+            b1, b2 = self._bound(), other._bound()
+            rem = (rem + b1 * other._rem + self._rem * b2
+                   + self._rem * other._rem)
+            return TaylorModel._build(coefs, rem, order)
+        if isinstance(other, Interval):
+            return self._scale(other)
+        if isinstance(other, affapy.ia._SCALARS):
+            return self._scale(_point(other))
+        raise affapyError(
+            "other must be TaylorModel, Interval, int, float, mpf, str")
+
+    def __rmul__(self, other) -> "TaylorModel":
+        """
+        **Reverse operator ***
+
+        Args:
+            self (TaylorModel): second operand
+            other (Interval or int or float or mpf or str): first operand
+
+        Returns:
+            TaylorModel: other * self
+
+        """
+        return self * other
+
+    def __truediv__(self, other) -> "TaylorModel":
+        """
+        **Operator /**
+
+        Divide a Taylor model by a Taylor model, an interval or a number.
+        It uses the identity:
+
+        .. math ::
+            \\frac{x}{y} = x \\times \\frac{1}{y}
+
+        Args:
+            self (TaylorModel): first operand
+            other (TaylorModel or Interval or int or float or mpf or str):
+                second operand
+
+        Returns:
+            TaylorModel: self / other
+
+        Raises:
+            affapyError: other must be TaylorModel, Interval, int, float,
+                mpf, str
+
+        """
+        if isinstance(other, TaylorModel):
+            return self * other.inv()
+        if isinstance(other, Interval):
+            return self._scale(Interval(1, 1) / other)
+        if isinstance(other, affapy.ia._SCALARS):
+            return self._scale(Interval(1, 1) / _point(other))
+        raise affapyError(
+            "other must be TaylorModel, Interval, int, float, mpf, str")
+
+    def __rtruediv__(self, other) -> "TaylorModel":
+        """
+        **Reverse operator /**
+
+        Args:
+            self (TaylorModel): second operand
+            other (Interval or int or float or mpf or str): first operand
+
+        Returns:
+            TaylorModel: other / self
+
+        """
+        return self.inv() * other
+
+    def sqr(self) -> "TaylorModel":
+        """
+        **Function sqr**
+
+        Return the square of a Taylor model.
+
+        Args:
+            self (TaylorModel): operand
+
+        Returns:
+            TaylorModel: self * self
+
+        """
+        return self * self
+
+    def __pow__(self, n: "TaylorModel | int") -> "TaylorModel":
+        """
+        **Operator ****
+
+        Return the power of a Taylor model with an integer or a Taylor
+        model. With a Taylor model, it uses the identity:
+
+        .. math ::
+            x^n = exp(n \\times log(x))
+
+        Args:
+            self (TaylorModel): first operand
+            n (TaylorModel or int): second operand (exponent)
+
+        Returns:
+            TaylorModel: self ** n
+
+        Raises:
+            affapyError: type error: n must be TaylorModel or int
+
+        """
+        if isinstance(n, int):
+            if n < 0:
+                return self.inv() ** -n
+            y = TaylorModel._build({(): Interval(1, 1)}, Interval(0, 0),
+                                   self._order)
+            x = self
+            while n:
+                if n % 2:
+                    y = y * x
+                n //= 2
+                if n:
+                    x = x * x
+            return y
+        if isinstance(n, TaylorModel):
+            return (n * self.log()).exp()
+        raise affapyError("type error: n must be TaylorModel or int")
+
+    def __abs__(self) -> "TaylorModel":
+        """
+        **Function abs**
+
+        Return the absolute value of a Taylor model. If the Taylor model
+        straddles 0, the result is the constant Taylor model enclosing the
+        absolute value of its interval.
+
+        Args:
+            self (TaylorModel): operand
+
+        Returns:
+            TaylorModel: abs(self)
+
+        """
+        x = self.interval
+        if x >= 0:
+            return self.copy()
+        if x <= 0:
+            return -self
+        return TaylorModel._fromInterval(abs(x), self._order)
+
+    # Non-affine operations
+    def _series(self, coefs: list, remcoef: Interval,
+                fallback: Interval) -> "TaylorModel":
+        """
+        Return the Taylor expansion of a function at the constant
+        coefficient c of the polynomial:
+
+        .. math ::
+            \\sum_{k=0}^{n} a_k h^k + r h^{n+1}
+
+        where :math:`h` is the Taylor model minus c.
+
+        If the Lagrange remainder is wider than the interval evaluation of
+        the function (the interval of the Taylor model is too wide for the
+        expansion), the result is the constant Taylor model enclosing the
+        interval evaluation.
+
+        Args:
+            coefs (list of Interval): :math:`a_k = f^{(k)}(c) / k!`
+            remcoef (Interval): enclosure of :math:`f^{(n+1)} / (n+1)!`
+                over the interval of the Taylor model
+            fallback (Interval): interval evaluation of the function
+
+        Returns:
+            TaylorModel: f(self)
+
+        """
+        n = self._order
+        poly = self._poly.copy()
+        poly.pop((), None)
+        h = TaylorModel._make(poly, self._rem, n)
+        rem = remcoef * _ipow(h.interval, n + 1)
+        if not rem.width() <= fallback.width():
+            return TaylorModel._fromInterval(fallback, n)
+        result = TaylorModel._build({(): coefs[0]}, Interval(0, 0), n)
+        hk = h
+        for k in range(1, n + 1):
+            result = result + hk._scale(coefs[k])
+            if k < n:
+                hk = hk * h
+        return TaylorModel._make(result._poly, result._rem + rem, n)
+
+    def _center(self) -> Interval:
+        """Return the constant coefficient as an interval."""
+        return _point(self._poly.get((), 0))
+
+    def inv(self) -> "TaylorModel":
+        """
+        **Inverse**
+
+        Return the inverse of a Taylor model, with:
+
+        .. math ::
+            \\frac{f^{(k)}(c)}{k!} = \\frac{(-1)^k}{c^{k+1}}
+
+        Args:
+            self (TaylorModel): operand
+
+        Returns:
+            TaylorModel: 1 / self
+            TaylorModel: NaN if the interval of the Taylor model contains 0
+
+        """
+        x = self.interval
+        if 0 in x:
+            return TaylorModel._nan(self._order)
+        n = self._order
+        ic = Interval(1, 1) / self._center()
+        coefs = [ic]
+        for k in range(1, n + 1):
+            coefs.append(-(coefs[-1] * ic))
+        ix = Interval(1, 1) / x
+        remcoef = _ipow(ix, n + 2)
+        if n % 2 == 0:
+            remcoef = -remcoef
+        return self._series(coefs, remcoef, ix)
+
+    def sqrt(self) -> "TaylorModel":
+        """
+        **Function sqrt**
+
+        Return the square root of a Taylor model, with:
+
+        .. math ::
+            \\frac{f^{(k)}(c)}{k!} = \\binom{1/2}{k} c^{1/2 - k}
+
+        If the interval of the Taylor model contains 0, the result is the
+        constant Taylor model enclosing the square root of its interval.
+
+        Args:
+            self (TaylorModel): operand
+
+        Returns:
+            TaylorModel: sqrt(self)
+            TaylorModel: NaN if the interval of the Taylor model contains
+            negative numbers
+
+        """
+        x = self.interval
+        if not x >= 0:
+            return TaylorModel._nan(self._order)
+        if x.inf == 0:
+            return TaylorModel._fromInterval(x.sqrt(), self._order)
+        n = self._order
+        c = self._center()
+        ic = Interval(1, 1) / c
+        sc, icpow = c.sqrt(), Interval(1, 1)
+        coefs = []
+        for k in range(n + 1):
+            coefs.append(_binomial(k) * sc * icpow)
+            icpow = icpow * ic
+        ix = Interval(1, 1) / x
+        remcoef = _binomial(n + 1) * x.sqrt() * _ipow(ix, n + 1)
+        return self._series(coefs, remcoef, x.sqrt())
+
+    def exp(self) -> "TaylorModel":
+        """
+        **Function exp**
+
+        Return the exponential of a Taylor model, with:
+
+        .. math ::
+            \\frac{f^{(k)}(c)}{k!} = \\frac{exp(c)}{k!}
+
+        Args:
+            self (TaylorModel): operand
+
+        Returns:
+            TaylorModel: exp(self)
+
+        """
+        n = self._order
+        ec = self._center().exp()
+        coefs = [ec / _factorial(k) for k in range(n + 1)]
+        ex = self.interval.exp()
+        remcoef = ex / _factorial(n + 1)
+        return self._series(coefs, remcoef, ex)
+
+    def log(self) -> "TaylorModel":
+        """
+        **Function log**
+
+        Return the logarithm of a Taylor model, with:
+
+        .. math ::
+            \\frac{f^{(k)}(c)}{k!} = \\frac{(-1)^{k+1}}{k c^k}, k \\geq 1
+
+        Args:
+            self (TaylorModel): operand
+
+        Returns:
+            TaylorModel: log(self)
+            TaylorModel: NaN if the interval of the Taylor model contains
+            numbers <= 0
+
+        """
+        x = self.interval
+        if not x > 0:
+            return TaylorModel._nan(self._order)
+        n = self._order
+        c = self._center()
+        ic = Interval(1, 1) / c
+        coefs, icpow = [c.log()], Interval(1, 1)
+        for k in range(1, n + 1):
+            icpow = icpow * ic
+            a = icpow / _point(k)
+            coefs.append(a if k % 2 else -a)
+        remcoef = _ipow(Interval(1, 1) / x, n + 1) / _point(n + 1)
+        if n % 2:
+            remcoef = -remcoef
+        return self._series(coefs, remcoef, x.log())
+
+    # Trigo
+    @staticmethod
+    def _trigo(x: Interval, k: int, shift: int) -> Interval:
+        """Return the k-th derivative of sin (shift 0) or cos (shift 1)."""
+        k = (k + shift) % 4
+        if k == 0:
+            return x.sin()
+        if k == 1:
+            return x.cos()
+        if k == 2:
+            return -x.sin()
+        return -x.cos()
+
+    def _sincos(self, shift: int) -> "TaylorModel":
+        """Return sin(self) (shift 0) or cos(self) (shift 1)."""
+        n = self._order
+        c = self._center()
+        coefs = [TaylorModel._trigo(c, k, shift) / _factorial(k)
+                 for k in range(n + 1)]
+        x = self.interval
+        remcoef = TaylorModel._trigo(x, n + 1, shift) / _factorial(n + 1)
+        return self._series(coefs, remcoef, TaylorModel._trigo(x, 0, shift))
+
+    def sin(self) -> "TaylorModel":
+        """
+        **Function sin**
+
+        Return the sinus of a Taylor model.
+
+        Args:
+            self (TaylorModel): operand
+
+        Returns:
+            TaylorModel: sin(self)
+
+        """
+        return self._sincos(0)
+
+    def cos(self) -> "TaylorModel":
+        """
+        **Function cos**
+
+        Return the cosinus of a Taylor model.
+
+        Args:
+            self (TaylorModel): operand
+
+        Returns:
+            TaylorModel: cos(self)
+
+        """
+        return self._sincos(1)
+
+    def tan(self) -> "TaylorModel":
+        """
+        **Function tan**
+
+        Return the tangent of a Taylor model. It uses the identity:
+
+        .. math ::
+            tan(x) = \\frac{sin(x)}{cos(x)}
+
+        Args:
+            self (TaylorModel): operand
+
+        Returns:
+            TaylorModel: tan(self)
+
+        """
+        return self.sin() / self.cos()
+
+    def cotan(self) -> "TaylorModel":
+        """
+        **Function cotan**
+
+        Return the cotangent of a Taylor model. It uses the identity:
+
+        .. math ::
+            cotan(x) = \\frac{cos(x)}{sin(x)}
+
+        Args:
+            self (TaylorModel): operand
+
+        Returns:
+            TaylorModel: cotan(self)
+
+        """
+        return self.cos() / self.sin()
+
+    # Hyperbolic functions
+    def cosh(self) -> "TaylorModel":
+        """
+        **Function cosh**
+
+        Return the hyperbolic cosine of a Taylor model. It uses the
+        identity:
+
+        .. math ::
+            cosh(x) = \\frac{exp(x) + exp(-x)}{2}
+
+        Args:
+            self (TaylorModel): operand
+
+        Returns:
+            TaylorModel: cosh(self)
+
+        """
+        return (self.exp() + (-self).exp()) * 0.5
+
+    def sinh(self) -> "TaylorModel":
+        """
+        **Function sinh**
+
+        Return the hyperbolic sine of a Taylor model. It uses the identity:
+
+        .. math ::
+            sinh(x) = \\frac{exp(x) - exp(-x)}{2}
+
+        Args:
+            self (TaylorModel): operand
+
+        Returns:
+            TaylorModel: sinh(self)
+
+        """
+        return (self.exp() - (-self).exp()) * 0.5
+
+    def tanh(self) -> "TaylorModel":
+        """
+        **Function tanh**
+
+        Return the hyperbolic tangent of a Taylor model. It uses the
+        identity:
+
+        .. math ::
+            tanh(x) = \\frac{sinh(x)}{cosh(x)}
+
+        Args:
+            self (TaylorModel): operand
+
+        Returns:
+            TaylorModel: tanh(self)
+
+        """
+        return self.sinh() / self.cosh()
+
+    @staticmethod
+    def _nan(order: int) -> "TaylorModel":
+        """Return the Taylor model NaN."""
+        nan = affapy.ia.mp.nan
+        return TaylorModel._make({}, Interval(nan, nan), order)
+
+    # Comparison operators
+    def __eq__(self, other: "TaylorModel") -> bool:
+        """
+        **Operator ==**
+
+        Compare the polynomials and the remainders of two Taylor models.
+
+        Args:
+            self (TaylorModel): first operand
+            other (TaylorModel): second operand
+
+        Returns:
+            bool: self == other (NotImplemented if other is not
+            TaylorModel)
+
+        """
+        if isinstance(other, TaylorModel):
+            return self._poly == other._poly and self._rem == other._rem
+        return NotImplemented
+
+    def __ne__(self, other: "TaylorModel") -> bool:
+        """
+        **Operator !=**
+
+        Args:
+            self (TaylorModel): first operand
+            other (TaylorModel): second operand
+
+        Returns:
+            bool: self != other (NotImplemented if other is not
+            TaylorModel)
+
+        """
+        eq = self.__eq__(other)
+        return eq if eq is NotImplemented else not eq
+
+    def __contains__(self, other) -> bool:
+        """
+        **Operator in**
+
+        Return True if other is included in the interval of the Taylor
+        model.
+
+        Args:
+            self (TaylorModel): first operand
+            other (TaylorModel or Interval or int or float or mpf or str):
+                second operand
+
+        Returns:
+            bool: other in self
+
+        """
+        if isinstance(other, TaylorModel):
+            return other.interval in self.interval
+        return other in self.interval
+
+    def straddles_zero(self) -> bool:
+        """
+        Return True if the interval of the Taylor model contains 0.
+
+        Args:
+            self (TaylorModel): operand
+
+        Returns:
+            bool: 0 in self.interval
+
+        """
+        return self.interval.straddles_zero()
+
+    # Formats
+    def __str__(self) -> str:
+        """
+        Return the Taylor model as a string: the terms of the polynomial,
+        where *tk* is the variable k, and the remainder.
+
+        Args:
+            self (TaylorModel): operand
+
+        Returns:
+            str: Taylor model
+
+        """
+        terms = []
+        for m, c in sorted(self._poly.items(),
+                           key=lambda t: (_degree(t[0]), t[0])):
+            mono = "*".join("t{}".format(v) if p == 1 else
+                            "t{}^{}".format(v, p) for v, p in m)
+            terms.append("{}*{}".format(c, mono) if mono else str(c))
+        terms.append(str(self._rem))
+        return " + ".join(terms)
+
+    def __repr__(self) -> str:
+        """
+        Return the representation of a Taylor model.
+
+        Args:
+            self (TaylorModel): operand
+
+        Returns:
+            str: TaylorModel(poly, rem, order)
+
+        """
+        return "TaylorModel({}, {}, {})".format(self._poly, self._rem,
+                                                self._order)
+
+    def copy(self) -> "TaylorModel":
+        """
+        Copy a Taylor model.
+
+        Args:
+            self (TaylorModel): operand
+
+        Returns:
+            TaylorModel: copy of self
+
+        """
+        return TaylorModel._make(self._poly.copy(), self._rem.copy(),
+                                 self._order)
+
+    def convert(self) -> Interval:
+        """
+        Convert a Taylor model into an interval.
+
+        Args:
+            self (TaylorModel): operand
+
+        Returns:
+            Interval: interval of the Taylor model
+
+        """
+        return self.interval
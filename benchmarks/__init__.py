@@ -0,0 +1,15 @@
+"""
+Benchmarks of the *affapy* library.
+
+* **ops**: time of each operator and function of Affine and Interval
+* **compare**: comparison of two result files of **ops**
+
+Usage:
+
+.. code-block:: bash
+
+    python3 -m benchmarks.ops --out before.json
+    python3 -m benchmarks.ops --out after.json
+    python3 -m benchmarks.compare before.json after.json
+
+"""
@@ -0,0 +1,111 @@
+"""
+Compare the numeric backends on the function of **example2**:
+
+.. math::
+    x_1, x_2 \\mapsto 1 + (x_1^2 - 2)x_2 + x_1x_2^2
+
+The function is evaluated with AA and IA on boxn boxes of
+:math:`[10, 100]^2`, with each available backend (see
+**affapy.backend**). The time of an evaluation and the width of the
+results are reported for each backend and model.
+
+Usage:
+
+.. code-block:: bash
+
+    python3 -m benchmarks.backends [--out FILE] [--boxn N] [--repeat N]
+
+"""
+import argparse
+import json
+import platform
+import time
+from timeit import Timer
+import mpmath
+from affapy import backend
+from affapy.aa import Affine
+from affapy.ia import Interval
+
+
+def eval_fct(x1, x2):
+    return 1 + (x1*x1 - 2)*x2 + x1*x2*x2
+
+
+def boxes(boxn: int, lbound: float = 10, ubound: float = 100) -> list:
+    """Return the boxes of example2."""
+    width = (ubound - lbound) / boxn
+    return [(lbound + i * width, lbound + (i + 1) * width)
+            for i in range(boxn)]
+
+
+def evaluate(model: str, grid: list) -> list:
+    """Evaluate the function on the boxes, return the results."""
+    results = []
+    for a, b in grid:
+        if model == "aa":
+            x1, x2 = Affine([a, b]), Affine([a, b])
+            results.append(eval_fct(x1, x2).interval)
+        else:
+            results.append(eval_fct(Interval(a, b), Interval(a, b)))
+    return results
+
+
+def run(boxn: int = 1000, repeat: int = 3, verbose: bool = False) -> dict:
+    """
+    Run the comparison with the available backends.
+
+    Args:
+        boxn (int): number of boxes
+        repeat (int): number of measures (the best one is kept)
+        verbose (bool): print the results
+
+    Returns:
+        dict: results with the fields *meta* and *results*
+
+    """
+    grid = boxes(boxn)
+    results = []
+    counter = Affine._weightCount
+
+    def reset():
+        # The cost of Affine.__mul__ depends on the noise symbol counter:
+        # all the measures start from the same counter
+        Affine._weightCount = counter
+
+    for name in backend.available():
+        with backend.use(name):
+            for model in ("aa", "ia"):
+                t = min(Timer(lambda: evaluate(model, grid), reset).repeat(
+                    repeat, 1)) / boxn
+                width = sum(float(r.width()) for r in evaluate(model, grid))
+                results.append({"backend": name, "model": model,
+                                "time": t, "width": width / boxn})
+                if verbose:
+                    print(f"{name:8} {model:3} {t * 1e6:10.2f} us/box "
+                          f"mean width {width / boxn:.6g}")
+    meta = {
+        "python": platform.python_version(),
+        "mpmath": mpmath.__version__,
+        "mpmath_backend": mpmath.libmp.BACKEND,
+        "platform": platform.platform(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "boxn": boxn,
+    }
+    return {"meta": meta, "results": results}
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(
+        description="Compare the numeric backends on example2")
+    parser.add_argument("--out", help="JSON result file")
+    parser.add_argument("--boxn", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+    data = run(args.boxn, args.repeat, verbose=True)
+    if args.out is not None:
+        with open(args.out, "w") as f:
+            json.dump(data, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Compare two result files of **benchmarks.ops** and list the operations
+which are slower in the second file.
+
+Usage:
+
+.. code-block:: bash
+
+    python3 -m benchmarks.compare BEFORE AFTER [--threshold RATIO]
+
+The exit status is 1 if an operation is slower than threshold times
+(default: 1.2) its time in the first file.
+
+"""
+import argparse
+import json
+import sys
+
+
+def key(record: dict) -> tuple:
+    """Return the identifier of a benchmark record."""
+    return (record["class"], record["op"], record["symbols"],
+            record["prec"], record["counter"])
+
+
+def compare(before: dict, after: dict, threshold: float = 1.2) -> list:
+    """
+    Compare two benchmark results.
+
+    Args:
+        before (dict): reference results
+        after (dict): new results
+        threshold (float): minimal ratio of a regression
+
+    Returns:
+        list: list of (key, time before, time after, ratio) for the
+        benchmarks slower than threshold, sorted by decreasing ratio
+
+    """
+    ref = {key(r): r["time"] for r in before["results"]}
+    slower = []
+    for r in after["results"]:
+        k = key(r)
+        if k in ref and ref[k] > 0:
+            ratio = r["time"] / ref[k]
+            if ratio >= threshold:
+                slower.append((k, ref[k], r["time"], ratio))
+    return sorted(slower, key=lambda s: -s[3])
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare two benchmark result files")
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=1.2)
+    args = parser.parse_args(argv)
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+    slower = compare(before, after, args.threshold)
+    for (cls, op, n, prec, counter), t0, t1, ratio in slower:
+        print(f"{cls:8} {op:10} symbols={n!s:6} prec={prec:<5} "
+              f"counter={counter!s:9} {t0 * 1e6:10.2f} us -> "
+              f"{t1 * 1e6:10.2f} us (x{ratio:.2f})")
+    return 1 if slower else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+Import time of the *affapy* modules.
+
+Each statement is run in a new Python interpreter, and the import time is
+measured with the ``-X importtime`` option of the interpreter: the time of
+a statement is the sum of the cumulative times of the top-level imports.
+
+The results are written as JSON: a dictionary with the field **meta**
+(versions, date) and the field **results**, a list of records with the
+fields *statement*, *time* (median import time in seconds) and *modules*
+(number of imported modules).
+
+Usage:
+
+.. code-block:: bash
+
+    python3 -m benchmarks.imports [--out FILE] [--runs N]
+
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+STATEMENTS = [
+    "import affapy",
+    "from affapy import affapyError",
+    "from affapy.ia import Interval",
+    "from affapy import Affine, Interval",
+    "import affapy.aa",
+    "import mpmath",
+]
+
+
+def importtime(statement: str) -> tuple:
+    """
+    Measure the import time of a statement in a new interpreter.
+
+    Args:
+        statement (str): Python statement
+
+    Returns:
+        tuple: import time in seconds and number of imported modules,
+        (None, None) if the statement fails
+
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        stderr=subprocess.PIPE, stdout=subprocess.DEVNULL,
+        universal_newlines=True)
+    if proc.returncode:
+        return None, None
+    out = proc.stderr
+    total, modules = 0, 0
+    for line in out.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        if not fields[0].strip().isdigit():
+            continue
+        modules += 1
+        name = fields[2]
+        # Top-level imports are not indented
+        if len(name) - len(name.lstrip()) == 1:
+            total += int(fields[1])
+    return total * 1e-6, modules
+
+
+def run(statements: list = STATEMENTS, runs: int = 10,
+        verbose: bool = False) -> dict:
+    """
+    Measure the import time of statements.
+
+    Args:
+        statements (list): Python statements
+        runs (int): number of runs of each statement
+        verbose (bool): print the results
+
+    Returns:
+        dict: results with the fields *meta* and *results*
+
+    """
+    # The interpreter modules imported at startup are not counted
+    base = importtime("pass")[1]
+    results = []
+    for statement in statements:
+        measures = [importtime(statement) for _ in range(runs)]
+        if measures[0][0] is None:
+            results.append({"statement": statement, "time": None,
+                            "modules": None})
+            if verbose:
+                print(f"{statement:40}   failed")
+            continue
+        t = statistics.median(m[0] for m in measures)
+        modules = measures[0][1] - base
+        results.append({"statement": statement, "time": t,
+                        "modules": modules})
+        if verbose:
+            print(f"{statement:40} {t * 1e3:8.2f} ms {modules:5} modules")
+    meta = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    return {"meta": meta, "results": results}
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(
+        description="Measure the import time of affapy")
+    parser.add_argument("--out", help="JSON result file")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args(argv)
+    data = run(runs=args.runs, verbose=True)
+    if args.out is not None:
+        with open(args.out, "w") as f:
+            json.dump(data, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Micro-benchmarks of the operators and functions of Affine and Interval.
+
+Each operation is timed while one parameter varies, the others keeping
+their default value:
+
+* **symbols**: number of noise symbols of the operands (default: 10)
+* **prec**: binary precision (default: 53)
+* **counter**: value of the global noise symbol counter
+  Affine._weightCount when the operands were created, i.e. their noise
+  symbols are numbered from counter (default: numbered from 1)
+
+The Interval operations only depend on the precision.
+
+The results are written as JSON: a dictionary with the field **meta**
+(versions, date) and the field **results**, a list of records with the
+fields *class*, *op*, *symbols*, *prec*, *counter* and *time*, the best
+time of a call in seconds.
+
+Usage:
+
+.. code-block:: bash
+
+    python3 -m benchmarks.ops [--out FILE] [--quick] [--mintime SECONDS]
+
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from timeit import Timer
+import mpmath
+from mpmath import mp
+from affapy.aa import Affine
+from affapy.ia import Interval
+
+SYMBOLS = [1, 10, 100, 1000, 10000]
+PRECS = [53, 113, 256, 1000]
+COUNTERS = [10**3, 10**5, 10**6]
+
+QUICK_SYMBOLS = [1, 10, 100]
+QUICK_PRECS = [53, 256]
+QUICK_COUNTERS = [10**3, 10**5]
+
+# Operations on two positive affine forms x, y or two intervals x, y
+OPS = {
+    "neg": lambda x, y: -x,
+    "add": lambda x, y: x + y,
+    "sub": lambda x, y: x - y,
+    "mul": lambda x, y: x * y,
+    "truediv": lambda x, y: x / y,
+    "add_scalar": lambda x, y: x + 3,
+    "mul_scalar": lambda x, y: x * 3,
+    "pow": lambda x, y: x ** 3,
+    "abs": lambda x, y: abs(x),
+    "sqrt": lambda x, y: x.sqrt(),
+    "exp": lambda x, y: x.exp(),
+    "log": lambda x, y: x.log(),
+    "sin": lambda x, y: x.sin(),
+    "cos": lambda x, y: x.cos(),
+    "tan": lambda x, y: x.tan(),
+    "cosh": lambda x, y: x.cosh(),
+    "sinh": lambda x, y: x.sinh(),
+    "tanh": lambda x, y: x.tanh(),
+    "eq": lambda x, y: x == y,
+    "contains": lambda x, y: x in y,
+}
+
+AFFINE_OPS = dict(OPS, **{
+    "inv": lambda x, y: x.inv(),
+    "rad": lambda x, y: x.rad(),
+    "interval": lambda x, y: x.interval,
+})
+
+INTERVAL_OPS = dict(OPS, **{
+    "width": lambda x, y: x.width(),
+    "mid": lambda x, y: x.mid(),
+})
+
+
+def affine(n: int, shift: int = 0) -> Affine:
+    """
+    Build an affine form with n noise symbols included in [1.5, 2.5].
+
+    Args:
+        n (int): number of noise symbols
+        shift (int): first noise symbol
+
+    Returns:
+        Affine: affine form
+
+    """
+    coef = mp.mpf(1) / (2 * n)
+    return Affine(x0=2, xi={shift + i: coef if i % 2 else -coef
+                            for i in range(n)})
+
+
+def measure(stmt, mintime: float, repeat: int = 3) -> float:
+    """
+    Return the best time of a call of stmt.
+
+    Args:
+        stmt (function): timed function
+        mintime (float): minimal duration of a measure in seconds
+        repeat (int): number of measures
+
+    Returns:
+        float: time of a call in seconds
+
+    """
+    timer = Timer(stmt)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= mintime or number >= 10**6:
+            break
+        number *= 10 if elapsed < mintime / 10 else 2
+    best = elapsed
+    for _ in range(repeat - 1):
+        best = min(best, timer.timeit(number))
+    return best / number
+
+
+def bench_affine(op: str, symbols: int, prec: int, counter: int,
+                 mintime: float) -> float:
+    """Time an operation of Affine."""
+    fct = AFFINE_OPS[op]
+    old_prec, old_counter = mp.prec, Affine._weightCount
+    try:
+        mp.prec = prec
+        shift = 1 if counter is None else counter
+        x = affine(symbols, shift)
+        y = affine(symbols, shift + symbols // 2)
+        if counter is not None:
+            Affine._weightCount = shift + 2 * symbols
+
+        def stmt():
+            fct(x, y)
+        return measure(stmt, mintime)
+    finally:
+        mp.prec, Affine._weightCount = old_prec, old_counter
+
+
+def bench_interval(op: str, prec: int, mintime: float) -> float:
+    """Time an operation of Interval."""
+    fct = INTERVAL_OPS[op]
+    old_prec = mp.prec
+    try:
+        mp.prec = prec
+        x, y = Interval(1.5, 2.5), Interval(1.25, 3)
+
+        def stmt():
+            fct(x, y)
+        return measure(stmt, mintime)
+    finally:
+        mp.prec = old_prec
+
+
+def run(symbols: list = SYMBOLS, precs: list = PRECS,
+        counters: list = COUNTERS, mintime: float = 0.05,
+        verbose: bool = False) -> dict:
+    """
+    Run all the benchmarks.
+
+    Args:
+        symbols (list): swept numbers of noise symbols
+        precs (list): swept binary precisions
+        counters (list): swept values of the noise symbol counter
+        mintime (float): minimal duration of a measure in seconds
+        verbose (bool): print the results
+
+    Returns:
+        dict: results with the fields *meta* and *results*
+
+    """
+    results = []
+
+    def record(cls, op, n, prec, counter, t):
+        results.append({"class": cls, "op": op, "symbols": n, "prec": prec,
+                        "counter": counter, "time": t})
+        if verbose:
+            print(f"{cls:8} {op:10} symbols={n!s:6} prec={prec:<5} "
+                  f"counter={counter!s:9} {t * 1e6:12.2f} us")
+
+    for op in AFFINE_OPS:
+        for n in symbols:
+            record("Affine", op, n, 53, None,
+                   bench_affine(op, n, 53, None, mintime))
+        for prec in precs:
+            if prec != 53:
+                record("Affine", op, 10, prec, None,
+                       bench_affine(op, 10, prec, None, mintime))
+        for counter in counters:
+            record("Affine", op, 10, 53, counter,
+                   bench_affine(op, 10, 53, counter, mintime))
+    for op in INTERVAL_OPS:
+        for prec in precs:
+            record("Interval", op, None, prec, None,
+                   bench_interval(op, prec, mintime))
+    meta = {
+        "python": platform.python_version(),
+        "mpmath": mpmath.__version__,
+        "mpmath_backend": mpmath.libmp.BACKEND,
+        "platform": platform.platform(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    return {"meta": meta, "results": results}
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark the operations of Affine and Interval")
+    parser.add_argument("--out", help="JSON result file (default: stdout)")
+    parser.add_argument("--quick", action="store_true",
+                        help="smaller sweeps")
+    parser.add_argument("--mintime", type=float, default=0.05,
+                        help="minimal duration of a measure in seconds")
+    args = parser.parse_args(argv)
+    if args.quick:
+        sweeps = (QUICK_SYMBOLS, QUICK_PRECS, QUICK_COUNTERS)
+    else:
+        sweeps = (SYMBOLS, PRECS, COUNTERS)
+    data = run(*sweeps, mintime=args.mintime, verbose=args.out is not None)
+    if args.out is None:
+        json.dump(data, sys.stdout, indent=1)
+    else:
+        with open(args.out, "w") as f:
+            json.dump(data, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
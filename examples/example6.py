@@ -0,0 +1,68 @@
+"""
+Example 6
+---------
+
+**Scaling of the parallel evaluator**
+
+This example evaluates the function of example 2:
+
+.. math::
+    x_1, x_2 \\mapsto 1 + (x_1^2 - 2)x_2 + x_1x_2^2
+
+over a grid of boxes with the **ParallelEvaluator** class, using 1, 2, 4...
+processes up to the number of cores, and prints the speedup.
+
+Usage:
+
+.. code-block:: bash
+
+    python3 example6.py [boxn] [model]
+
+* boxn: number of boxes (default: 2000)
+* model: *aa* or *ia* (default: aa)
+
+"""
+from affapy.parallel import ParallelEvaluator
+from time import perf_counter
+import os
+import sys
+
+
+def eval_fct(x1, x2):
+    return 1 + (x1*x1 - 2)*x2 + x1*x2*x2
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 1:
+        boxn = 2000
+        model = "aa"
+
+    elif len(sys.argv) != 3:
+        print("Usage:", sys.argv[0])
+        print("BOXN MODEL")
+        exit()
+
+    else:
+        boxn = int(sys.argv[1])
+        model = sys.argv[2]
+
+    width = 90 / boxn
+    boxes = [[[10 + i*width, 10 + (i+1)*width],
+              [10 + i*width, 10 + (i+1)*width]] for i in range(boxn)]
+
+    print("Scaling of the parallel evaluator")
+
+    workers = [1]
+    while workers[-1] * 2 <= (os.cpu_count() or 1):
+        workers.append(workers[-1] * 2)
+
+    reference = None
+    for n in workers:
+        evaluator = ParallelEvaluator(eval_fct, model=model, workers=n)
+        tstart = perf_counter()
+        evaluator.evaluate(boxes)
+        total = perf_counter() - tstart
+        if reference is None:
+            reference = total
+        print(f"{n} workers (chunksize {evaluator.chunksize}): {total:.3f} s,"
+              f" speedup {reference / total:.2f}, {boxn / total:.1f} boxes/s")
@@ -0,0 +1,112 @@
+"""Defining test cases for the ad module"""
+
+from affapy import ad
+from affapy.ad import Dual
+from affapy.aa import Affine
+from affapy.ia import Interval
+from affapy.error import affapyError
+import mpmath
+import unittest
+
+
+def example4(x):
+    return (x.sin()**2 * x.cos() - 4) / x.sqrt()
+
+
+def reference(t):
+    return (mpmath.sin(t)**2 * mpmath.cos(t) - 4) / mpmath.sqrt(t)
+
+
+class TestDual(unittest.TestCase):
+    """Test case used to test the class Dual"""
+
+    def test_operators(self):
+        """Test the derivatives of the operators"""
+        x = Dual(Interval(1, 2), 1)
+        self.assertEqual((x * x).der, (Interval(2, 4),))
+        self.assertEqual((3 - 2 * x).der[0], Interval(-2, -2))
+        self.assertIn(Interval(-1, -0.25), (1 / x).der[0])
+        self.assertIn(Interval(3, 12), (x ** 3).der[0])
+        self.assertEqual((x ** 0).der, ())
+        y = Dual(Interval(3, 4), (0, 1))
+        self.assertEqual((x * y).der, (Interval(3, 4), Interval(1, 2)))
+        with self.assertRaises(affapyError):
+            x + "1"
+        with self.assertRaises(affapyError):
+            Dual("1")
+
+    def test_functions(self):
+        """Test that the derivatives enclose the derivatives"""
+        functions = [
+            ("exp", mpmath.exp, 0, 1), ("log", lambda t: 1 / t, 1, 2),
+            ("sqrt", lambda t: 1 / (2 * mpmath.sqrt(t)), 1, 2),
+            ("sin", mpmath.cos, 0, 2), ("cos", lambda t: -mpmath.sin(t), 0, 2),
+            ("tan", lambda t: 1 / mpmath.cos(t)**2, 0, 1),
+            ("cosh", mpmath.sinh, -1, 1), ("sinh", mpmath.cosh, -1, 1),
+            ("tanh", lambda t: 1 / mpmath.cosh(t)**2, -1, 1)]
+        for name, der, a, b in functions:
+            x = Dual(Interval(a, b), 1)
+            # The trigonometric functions of Interval round to nearest
+            d = getattr(x, name)().der[0] + Interval(-1e-15, 1e-15)
+            for i in range(11):
+                with mpmath.workdps(40):
+                    t = mpmath.mpf(a) + (mpmath.mpf(b) - a) * i / 10
+                    self.assertIn(der(t), d, name)
+
+    def test_abs(self):
+        """Test the derivative of abs"""
+        x = Dual(Interval(-1, 2), 1)
+        self.assertEqual(abs(x).der, (Interval(-1, 1),))
+        self.assertEqual(abs(-Dual(Interval(1, 2), 1)).der, (1,))
+
+    def test_affine(self):
+        """Test dual numbers with affine forms"""
+        x = Dual(Affine([1, 2]), 1)
+        y = x * x - 2 * x
+        self.assertIsInstance(y.der[0], Affine)
+        self.assertEqual(y.der[0].interval, Interval(0, 2))
+
+
+class TestEnclosures(unittest.TestCase):
+    """Test case used to test the mean value forms"""
+
+    def test_gradient(self):
+        """Test the gradient of a function over a box"""
+        value, der = ad.gradient(lambda x, y: x * y + 1, [[1, 2], [3, 4]])
+        self.assertEqual(value, Interval(4, 9))
+        self.assertEqual(der, (Interval(3, 4), Interval(1, 2)))
+        self.assertEqual(ad.gradient(lambda x: 2, [[1, 2]]),
+                         (Interval(2, 2), (Interval(0, 0),)))
+        with self.assertRaises(affapyError):
+            ad.gradient(lambda x: x, [[1, 2]], model="tm")
+
+    def test_mean_value(self):
+        """Test that the mean value form is tighter on narrow boxes"""
+        box = [[1.5, 1.6]]
+        natural = ad.gradient(example4, box)[0]
+        mv = ad.mean_value(example4, box)
+        self.assertIn(mv, natural)
+        self.assertLess(mv.width(), natural.width() / 5)
+        for t in (1.5, 1.55, 1.6):
+            self.assertIn(reference(t), mv)
+
+    def test_monotonic(self):
+        """Test the endpoint evaluation of the monotonic functions"""
+        for model in ("ia", "aa"):
+            res = ad.enclosure(example4, [[1.5, 1.6]], model)
+            self.assertIn(res, Interval(reference(1.5) - 1e-12,
+                                        reference(1.6) + 1e-12))
+        res = ad.enclosure(lambda x, y: x.exp() - y * y, [[0, 1], [1, 2]])
+        self.assertIn(Interval(-3, mpmath.e - 1), res)
+        self.assertLess(res.width(), mpmath.e + 2 + 1e-12)
+
+    def test_not_monotonic(self):
+        """Test the enclosure of a function which is not monotonic"""
+        f = lambda x: x * x - x
+        res = ad.enclosure(f, [[0, 1]])
+        self.assertIn(Interval(-0.25, 0), res)
+        self.assertEqual(res, ad.mean_value(f, [[0, 1]]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,7 +5,9 @@ print(sys.executable)
 from affapy.aa import Affine
 from affapy.ia import Interval
 from affapy.precision import precision
+from affapy.error import affapyError
 import unittest
+import pickle
 from mpmath import mp
 
 
@@ -114,6 +116,105 @@ class TestAffine(unittest.TestCase):
         self.assertTrue(Interval(0, mp.sqrt(10)) in x.sqrt().interval)
         self.assertTrue(Interval(mp.sqrt(8), mp.sqrt(32)) in y.sqrt().interval)
 
+    def test_log_affine(self):
+        """Test 'log' function from class Affine"""
+        x = Affine([1, 2])
+        y = Affine([2, 5])
+        self.assertTrue(Interval(0, mp.log(2)) in x.log().interval)
+        self.assertTrue(Interval(mp.log(2), mp.log(5)) in y.log().interval)
+
+    def test_degenerate_affine(self):
+        """Test the elementary functions of a degenerate affine form"""
+        x = Affine([2, 2])
+        self.assertEqual(x.exp().interval, Interval(mp.exp(2), mp.exp(2)))
+        self.assertEqual(x.log().interval, Interval(mp.log(2), mp.log(2)))
+        self.assertEqual(x.sin().interval, Interval(mp.sin(2), mp.sin(2)))
+
+    def test_rad_affine(self):
+        """Test that the radius is maintained by the operations"""
+        x = Affine([1, 3])
+        y = Affine([-2, mp.pi])
+        forms = [x, -x, x + y, x - y, y - x, x + 1, x - 1, x * y, 3 * x,
+                 x - x, x.exp(), x.sqrt(), abs(y), (x * y).copy(),
+                 x + y - y, Affine(x0=1, xi={1: -2, 2: 3})]
+        for z in forms:
+            rad = mp.fsum(z.xi.values(), absolute=True)
+            self.assertTrue(z.rad() >= rad)
+            self.assertTrue(z.rad() - rad <= 1e-14 * max(rad, 1))
+        self.assertEqual((x - x).rad(), 0)
+        for z in (x - x, Affine(x0=1, xi={}), 2 * Affine(x0=1, xi={}),
+                  Affine(x0=1, xi={}) * Affine(x0=2, xi={})):
+            self.assertIsInstance(z.rad(), mp.mpf)
+        # The cancellation of a large coefficient keeps the radius tight
+        z = (Affine(x0=0, xi={1: 1e20, 2: 1})
+             - Affine(x0=0, xi={1: 1e20}))
+        self.assertEqual(z.xi, {2: 1})
+        self.assertEqual(z.rad(), 1)
+        self.assertEqual(z.interval, Interval(-1, 1))
+        z = Affine(x0=0, xi={1: 1e20, 2: 1}) + Affine(x0=0, xi={1: -1e20})
+        self.assertEqual(z.rad(), 1)
+        self.assertTrue(Interval(1, 3) in x.interval)
+
+    def test_mul_symbols_affine(self):
+        """Test the product of forms with large noise symbols"""
+        x = Affine(x0=1, xi={10**9: 1})
+        y = Affine(x0=2, xi={10**9: 1, 10**9 + 1: 1})
+        z = x * y
+        self.assertEqual(z.xi[10**9], 3)
+        self.assertEqual(z.xi[10**9 + 1], 1)
+        self.assertTrue(Interval(-1, 6) in z.interval)
+
+    def test_hash_affine(self):
+        """Test the hash and the immutability of class Affine"""
+        x = Affine(x0=1, xi={1: 2, 2: 3})
+        y = Affine(x0=1, xi={2: 3, 1: 2})
+        z = Affine(x0=1, xi={1: 2, 2: 4})
+        self.assertEqual(hash(x), hash(y))
+        self.assertEqual(len({x, y, z}), 2)
+        self.assertEqual({x: 1}[pickle.loads(pickle.dumps(y))], 1)
+        self.assertTrue(x == x and x == y and x != z)
+        # Other types are different, as for the built-in types
+        self.assertFalse(x == 3)
+        self.assertTrue(x != "x")
+        self.assertFalse(x == Interval(1, 1))
+        self.assertTrue(x in [0, x])
+        self.assertEqual(len({x, 3, hash(x)}), 3)
+        self.assertTrue(x.copy() is x)
+        with self.assertRaises(affapyError):
+            x.x0 = 0
+        with self.assertRaises(affapyError):
+            x.xi = {}
+
+    def test_condense_affine(self):
+        """Test the condensation of the noise symbols"""
+        x = Affine(x0=1, xi={1: 3, 2: -1, 3: 0.5, 4: -2})
+        y = x.condense(3)
+        self.assertEqual(len(y.xi), 3)
+        self.assertEqual((y.xi[1], y.xi[4]), (3, -2))
+        self.assertEqual(y.interval, x.interval)
+        self.assertEqual(y.rad(), x.rad())
+        self.assertIs(x.condense(4), x)
+        self.assertEqual(len({x, y}), 2)
+        with self.assertRaises(affapyError):
+            x.condense(0)
+
+    def test_xi_buffers_affine(self):
+        """Test the export of the noise symbols as buffers"""
+        x = Affine(x0=1, xi={3: 2, 1: mp.mpf(1) / 3})
+        ids, coefs = x.xi_buffers()
+        self.assertEqual(ids.format, "q")
+        self.assertEqual(ids.tolist(), [3, 1])
+        self.assertEqual(coefs.tolist(), [2.0, 1 / 3])
+        self.assertTrue(ids.readonly and coefs.readonly)
+        self.assertIs(x.xi_buffers()[1], coefs)
+        self.assertEqual(Affine().xi_buffers()[0].nbytes, 0)
+        # The magnitudes are rounded upward
+        with mp.workprec(100):
+            third = mp.mpf(1) / 3
+            x = Affine(x0=0, xi={1: third, 2: -third})
+        coefs = x.xi_buffers()[1].tolist()
+        self.assertTrue(coefs[0] > third and coefs[1] < -third)
+
     def test_eq_affine(self):
         """Test 'eq' function from class Affine"""
         x = Affine(xi={1: 10}, x0=0)
@@ -205,6 +306,19 @@ class TestAffine(unittest.TestCase):
         self.assertTrue('0.5' in x)
         self.assertFalse('2.0' in x)
 
-        
+
+    @precision(dps=50)
+    def test_pickle_affine(self):
+        """Test pickling of class Affine"""
+        x = Affine([1, 3]) * Affine([-2, mp.pi]) - 1
+        y = pickle.loads(pickle.dumps(x))
+        self.assertEqual(x, y)
+        self.assertEqual(x.interval, y.interval)
+        self.assertEqual(list(y.xi), sorted(x.xi))
+        self.assertEqual(pickle.loads(pickle.dumps(Affine())), Affine())
+        self.assertTrue(mp.isnan(pickle.loads(pickle.dumps(
+            Affine([-1, 1]).inv())).x0))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,185 @@
+"""Defining test cases for the aio module"""
+
+from affapy.parallel import _evalBoxes
+from affapy.error import affapyError
+from mpmath import mp
+import asyncio
+import sys
+import time
+import unittest
+
+if sys.version_info >= (3, 7):
+    from affapy.aio import AsyncPool
+    import affapy.aio
+
+
+def fct(x1, x2):
+    return 1 + (x1*x1 - 2)*x2 + x1*x2*x2
+
+
+def slow(x):
+    time.sleep(0.02)
+    return x
+
+
+BOXES = [[[1 + i / 10, 1 + (i + 1) / 10], [2, 2.5]] for i in range(40)]
+
+
+@unittest.skipIf(sys.version_info < (3, 7), "requires Python 3.7")
+class TestAio(unittest.TestCase):
+    """Test case used to test the asynchronous evaluations"""
+
+    def test_evaluate(self):
+        """Test concurrent requests with their own precisions"""
+        async def main(pool):
+            return await asyncio.gather(
+                pool.evaluate(fct, BOXES, model="ia", chunksize=7),
+                pool.evaluate(fct, BOXES, chunksize=5, dps=40))
+
+        with mp.workdps(40):
+            expected = _evalBoxes(fct, "aa", BOXES)
+        pool = AsyncPool(workers=2)
+        try:
+            ia, aa = asyncio.run(main(pool))
+            self.assertEqual(ia, _evalBoxes(fct, "ia", BOXES))
+            self.assertEqual(aa, expected)
+            # The pool can be used by another event loop
+            self.assertEqual(asyncio.run(pool.evaluate(fct, BOXES[:3])),
+                             _evalBoxes(fct, "aa", BOXES[:3]))
+        finally:
+            pool.shutdown()
+
+    def test_map(self):
+        """Test the chunks yielded by the default pool"""
+        async def main():
+            chunks = []
+            async for chunk in affapy.aio.map(fct, iter(BOXES), model="ia",
+                                              chunksize=6):
+                chunks.append(chunk)
+            return chunks
+
+        affapy.aio.configure(workers=2)
+        try:
+            chunks = asyncio.run(main())
+        finally:
+            affapy.aio.shutdown()
+        self.assertEqual(sorted(start for start, _ in chunks),
+                         list(range(0, 40, 6)))
+        self.assertEqual(sum(len(itvs) for _, itvs in chunks), len(BOXES))
+        self.assertEqual(
+            asyncio.run(affapy.aio.evaluate(fct, BOXES[:2], "ia")),
+            _evalBoxes(fct, "ia", BOXES[:2]))
+        affapy.aio.shutdown()
+
+    def test_order(self):
+        """Test the order of the Taylor models"""
+        async def main():
+            pool = await affapy.aio.aconfigure(workers=1)
+            try:
+                itvs = await affapy.aio.evaluate(fct, BOXES[:2], "tm",
+                                                 order=1)
+            finally:
+                await affapy.aio.ashutdown()
+            return itvs, pool._pool
+
+        itvs, pool = asyncio.run(main())
+        self.assertEqual(itvs, _evalBoxes(fct, "tm", BOXES[:2], 1))
+        self.assertIsNone(pool)
+        self.assertNotEqual(_evalBoxes(fct, "tm", BOXES[:2], 1),
+                            _evalBoxes(fct, "tm", BOXES[:2]))
+
+    def test_fairness(self):
+        """Test that a small request is not stalled by a large one"""
+        boxes = [[[0, 1]]] * 200
+
+        async def main(pool):
+            large = asyncio.ensure_future(
+                pool.evaluate(slow, boxes, chunksize=2))
+            await asyncio.sleep(0.1)
+            small = await pool.evaluate(slow, boxes[:2], chunksize=2)
+            return small, large.done(), await large
+
+        async def cancel(pool):
+            task = asyncio.ensure_future(
+                pool.evaluate(slow, boxes, chunksize=2))
+            await asyncio.sleep(0.1)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            tstart = time.perf_counter()
+            await pool.evaluate(slow, boxes[:2], chunksize=2)
+            return time.perf_counter() - tstart
+
+        pool = AsyncPool(workers=2, window=2)
+        try:
+            small, done, large = asyncio.run(main(pool))
+            self.assertFalse(done)
+            self.assertEqual(len(small), 2)
+            self.assertEqual(len(large), 200)
+            # The chunks of a cancelled request are not evaluated
+            self.assertTrue(asyncio.run(cancel(pool)) < 1)
+        finally:
+            pool.shutdown()
+
+    def test_slots(self):
+        """Test that a cancelled request keeps the slots of its chunks"""
+        boxes = [[[0, 1]]] * 10
+
+        async def main(pool):
+            task = asyncio.ensure_future(
+                pool.evaluate(slow, boxes, chunksize=10))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            # The chunk still runs in its process
+            locked = pool._slots.locked()
+            await pool.evaluate(slow, boxes[:1])
+            return locked
+
+        pool = AsyncPool(workers=1, concurrency=1)
+        try:
+            self.assertTrue(asyncio.run(main(pool)))
+        finally:
+            pool.shutdown()
+
+    def test_aclose(self):
+        """Test the shutdown of the pool from a coroutine"""
+        boxes = [[[0, 1]]] * 40
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+
+        async def main():
+            async with AsyncPool(workers=1, window=2) as pool:
+                task = asyncio.ensure_future(
+                    pool.evaluate(slow, boxes, chunksize=10))
+                await asyncio.sleep(0.1)
+                clock = asyncio.ensure_future(ticker())
+                tstart = time.perf_counter()
+            elapsed = time.perf_counter() - tstart
+            clock.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            return elapsed
+
+        # The chunks in progress are awaited while the event loop runs
+        self.assertTrue(asyncio.run(main()) > 0.05)
+        self.assertTrue(len(ticks) > 2)
+
+    def test_errors(self):
+        """Test the invalid arguments"""
+        self.assertRaises(affapyError, AsyncPool, window=-1)
+        pool = AsyncPool(workers=1)
+        with self.assertRaises(affapyError):
+            asyncio.run(pool.evaluate(fct, BOXES, model="xx"))
+        with self.assertRaises(affapyError):
+            asyncio.run(pool.evaluate(fct, BOXES, chunksize=0))
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
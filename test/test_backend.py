@@ -0,0 +1,124 @@
+"""Defining test cases for the backend module"""
+
+from affapy import backend
+from affapy.aa import Affine
+from affapy.ia import Interval
+from affapy.error import affapyError
+from affapy.tm import TaylorModel
+from affapy import box
+from fractions import Fraction
+import mpmath
+import affapy.ia
+import math
+import pickle
+import random
+import unittest
+
+
+class TestBackend(unittest.TestCase):
+    """Test case used to test the numeric backends"""
+
+    def tearDown(self):
+        backend.set_backend("mpmath")
+
+    def test_use(self):
+        """Test the selection and the restoration of a backend"""
+        fadd = affapy.ia.fadd
+        with backend.use("float64") as b:
+            self.assertEqual(backend.current().name, "float64")
+            self.assertIs(b.backend, backend.current())
+            self.assertIsInstance(Interval(1, 2).inf, float)
+            self.assertIsInstance(Affine([1, 2]).exp().x0, float)
+        self.assertEqual(backend.current().name, "mpmath")
+        self.assertIs(affapy.ia.fadd, fadd)
+        self.assertRaises(affapyError, backend.use, "unknown")
+        self.assertIn("float64", backend.available())
+
+    def test_float64_rounding(self):
+        """Test the directed rounding of the float64 backend"""
+        b = backend.get("float64")
+        rnd = random.Random(0)
+        for _ in range(500):
+            x = rnd.uniform(-10, 10) * 10 ** rnd.randint(-5, 5)
+            y = rnd.uniform(-10, 10) * 10 ** rnd.randint(-5, 5)
+            fx, fy = Fraction(x), Fraction(y)
+            for op, exact in ((b.fadd, fx + fy), (b.fsub, fx - fy),
+                              (b.fmul, fx * fy), (b.fdiv, fx / fy)):
+                lo, hi = op(x, y, rounding='f'), op(x, y, rounding='c')
+                self.assertTrue(Fraction(lo) <= exact <= Fraction(hi))
+                self.assertTrue(hi == lo
+                                or backend._nextafter(lo, math.inf) == hi)
+                self.assertTrue(abs(Fraction(op(x, y, rounding='d')))
+                                <= abs(exact)
+                                <= abs(Fraction(op(x, y, rounding='u'))))
+            x = abs(x)
+            lo, hi = b.sqrt(x, rounding='f'), b.sqrt(x, rounding='c')
+            self.assertTrue(Fraction(lo)**2 <= Fraction(x) <= Fraction(hi)**2)
+        self.assertEqual(b.fadd(1, 2, rounding='f'), 3)
+        self.assertEqual(b.mpf("0.1", rounding='c'), 0.1)
+        self.assertEqual(b.mpf("0.1", rounding='f'),
+                         backend._nextafter(0.1, -math.inf))
+        self.assertEqual(b.mpf(2**53 + 1, rounding='c'), 2.**53 + 2)
+        self.assertEqual(b.fmul(1e300, 1e300, rounding='f'),
+                         backend._nextafter(math.inf, 0))
+
+    def test_next_float(self):
+        """Test the portable next float"""
+        cases = [(1., math.inf, 1. + 2.**-52), (1., 0., 1. - 2.**-53),
+                 (-1., math.inf, -1. + 2.**-53), (-1., -2., -1. - 2.**-52),
+                 (0., -1., -5e-324), (5e-324, 0., 0.), (2., 2., 2.),
+                 (math.inf, 0., 1.7976931348623157e308),
+                 (1.7976931348623157e308, math.inf, math.inf)]
+        for x, y, expected in cases:
+            self.assertEqual(backend._nextFloat(x, y), expected)
+            self.assertEqual(backend._nextafter(x, y), expected)
+        self.assertTrue(math.isnan(backend._nextFloat(math.nan, 1.)))
+
+    def test_float64_inclusion(self):
+        """Test that the float64 results include the mpmath results"""
+        x, y = Interval("0.1", "0.3"), Interval("2", "2.7")
+        ref = [x * y + x / y, (x + y).exp(), y.log(), y.sqrt(), x.cos()]
+        with backend.use("float64"):
+            x, y = Interval("0.1", "0.3"), Interval("2", "2.7")
+            res = [x * y + x / y, (x + y).exp(), y.log(), y.sqrt(), x.cos()]
+        for r, f in zip(ref, res):
+            self.assertTrue(f.inf <= r.inf and r.sup <= f.sup)
+
+    def test_pickle(self):
+        """Test that the unpickled values use the current backend"""
+        with backend.use("float64"):
+            x = Affine([1, 2]).exp()
+            y = pickle.loads(pickle.dumps(x))
+            self.assertIsInstance(y.x0, float)
+            self.assertEqual(x.interval, y.interval)
+
+    def test_mpmath_operands(self):
+        """Test the numbers of mpmath as operands of all the backends"""
+        for name in backend.available():
+            with backend.use(name):
+                x = Interval(1, 2) + mpmath.mpf(1)
+                self.assertIn(Interval(2, 3), x)
+                self.assertIn(Interval(mpmath.pi, 2 * mpmath.pi),
+                              Interval(1, 2) * mpmath.pi)
+                y = Affine([1, 2]) * mpmath.mpf(2)
+                self.assertIn(Interval(2, 4), y.interval)
+                z = TaylorModel(Interval(1, 2)) - mpmath.mpf(1)
+                self.assertIn(Interval(0, 1), z.interval)
+                self.assertIn(Interval(1, 1),
+                              box.bounds(backend.current().mp.mpf(1)))
+
+    @unittest.skipUnless("gmpy2" in backend.available(), "requires gmpy2")
+    def test_gmpy2(self):
+        """Test the gmpy2 backend"""
+        x, y = Affine([1, 2]), Affine([3, 4])
+        ref = (x * y + x.sqrt()).interval
+        with backend.use("gmpy2"):
+            x, y = Affine([1, 2]), Affine([3, 4])
+            res = (x * y + x.sqrt()).interval
+            self.assertIsInstance(res.inf, backend.current().type)
+        self.assertTrue(abs(res.inf - ref.inf) < 1e-14)
+        self.assertTrue(abs(res.sup - ref.sup) < 1e-14)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+"""Defining test cases for the cache module"""
+
+from affapy import cache
+from affapy.aa import Affine
+from affapy.ia import Interval
+from affapy.error import affapyError
+from mpmath import mp
+import unittest
+
+
+class TestCache(unittest.TestCase):
+    """Test case used to test the memoization of the elementary functions"""
+
+    def tearDown(self):
+        cache.disable()
+
+    def test_affine(self):
+        """Test that the cached triples give the same affine forms"""
+        x = Affine([1, 2])
+        ref = [x.exp(), x.log(), x.sqrt(), x.sin(), x.inv()]
+        with cache.memoize() as m:
+            for _ in range(2):
+                res = [x.exp(), x.log(), x.sqrt(), x.sin(), x.inv()]
+                for r, f in zip(ref, res):
+                    self.assertEqual(r.x0, f.x0)
+                    self.assertEqual(r.interval, f.interval)
+        self.assertEqual(m.info["misses"], 5)
+        self.assertEqual(m.info["hits"], 5)
+        self.assertFalse(cache.is_enabled())
+
+    def test_new_symbol(self):
+        """Test that a cached result gets a new noise symbol"""
+        x = Affine([1, 2])
+        with cache.memoize() as m:
+            y, z = x.exp(), x.exp()
+        self.assertEqual(m.info["hits"], 1)
+        self.assertNotEqual(set(y.xi), set(z.xi))
+        self.assertEqual(len(set(y.xi) - set(z.xi)), 1)
+
+    def test_key(self):
+        """Test that the key depends on the interval and the precision"""
+        cache.enable()
+        x, y = Affine([1, 2]), Affine([1, 2])
+        x.exp()
+        y.exp()
+        self.assertEqual(cache.info()["hits"], 1)
+        x.exp() + Affine([1, 3]).exp()
+        self.assertEqual(cache.info()["misses"], 2)
+        with mp.workprec(100):
+            x.exp()
+        self.assertEqual(cache.info()["misses"], 3)
+
+    def test_interval(self):
+        """Test the cache of the functions of Interval"""
+        x = Interval(1, 2)
+        ref = x.exp()
+        with cache.memoize() as m:
+            y = x.exp()
+            z = Interval(1, 2).exp()
+            with self.assertRaises(affapyError):
+                z.inf = 0
+            t = x.exp()
+        self.assertEqual(m.info["hits"], 2)
+        self.assertEqual(ref, y)
+        self.assertEqual(ref, t)
+
+    def test_bound(self):
+        """Test the size bound and the LRU order"""
+        c = cache.LRUCache(2)
+        c.put(1, "a")
+        c.put(2, "b")
+        c.get(1)
+        c.put(3, "c")
+        self.assertEqual(c.get(2), None)
+        self.assertEqual(c.get(1), "a")
+        self.assertEqual(len(c), 2)
+        c.resize(1)
+        self.assertEqual(c.info(),
+                         {"hits": 2, "misses": 1, "size": 1, "maxsize": 1})
+        self.assertRaises(affapyError, cache.LRUCache, 0)
+
+    def test_restore(self):
+        """Test that the functions are restored when disabled"""
+        exp = Interval.exp
+        cache.enable(10)
+        self.assertIsNot(Interval.exp, exp)
+        cache.enable(20)
+        self.assertEqual(cache.info()["maxsize"], 20)
+        cache.disable()
+        self.assertIs(Interval.exp, exp)
+        self.assertEqual(cache.info()["size"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
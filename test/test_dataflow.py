@@ -0,0 +1,112 @@
+"""Defining test cases for the dataflow module"""
+
+from affapy.dataflow import trace, Graph
+from affapy.aa import Affine
+from affapy.ia import Interval
+from affapy.error import affapyError
+import unittest
+
+
+class TestDataflow(unittest.TestCase):
+    """Test case used to test the dataflow graphs"""
+
+    def test_trace(self):
+        """Test the nodes of a traced function"""
+        graph = trace(lambda x, y: ((x * y + 1) / 2).sqrt() - 3 * x, 2)
+        self.assertEqual(len(graph), 8)
+        self.assertEqual([n.op for n in graph.inputs], ["input", "input"])
+        self.assertEqual(repr(graph.nodes[2]), "n2 = mul(n0, n1)")
+        self.assertEqual(graph.nodes[6].args, (graph.inputs[0], 3))
+        self.assertEqual(graph.outputs, [graph.nodes[7]])
+        self.assertEqual(graph.inputs[0].users,
+                         [graph.nodes[2], graph.nodes[6]])
+        const = trace(lambda x: (x, 2), 1)
+        self.assertEqual(const.outputs[1].op, "const")
+
+    def test_errors(self):
+        """Test the functions which cannot be traced"""
+        with self.assertRaises(affapyError):
+            trace(lambda x: x if x > 0 else -x, 1)
+        other = Graph().input()
+        with self.assertRaises(affapyError):
+            trace(lambda x: x + other, 1)
+        with self.assertRaises(affapyError):
+            trace(lambda x: x, 1).evaluate(1, 2)
+
+    def test_evaluate(self):
+        """Test the evaluation with affine forms and intervals"""
+        fn = lambda x, y: (x * y - 2 * x, x.exp())
+        graph = trace(fn, 2)
+        x, y = Affine([1, 2]), Affine([3, 4])
+        ev = graph.evaluate(x, y)
+        self.assertEqual(ev.outputs[0].interval, fn(x, y)[0].interval)
+        self.assertIs(ev[graph.inputs[0]], x)
+        ev = graph.evaluate(Interval(1, 2), Interval(3, 4))
+        self.assertEqual(ev.outputs[0], Interval(-1, 6))
+        self.assertEqual(ev.outputs[1], Interval(1, 2).exp())
+
+    def test_refresh(self):
+        """Test that only the downstream nodes are computed again"""
+        graph = trace(lambda x, y: x * x + y.exp() * 2, 2)
+        calls = []
+        ev = graph.evaluate(Affine([1, 2]), Affine([0, 1]),
+                            hook=lambda node, v: calls.append(node) or v)
+        self.assertEqual(len(calls), len(graph))
+        self.assertEqual(ev.computed, len(graph))
+        exp = graph.nodes[3]
+        kept = ev[graph.nodes[2]]
+        calls.clear()
+        self.assertEqual(ev.refresh([exp]), 3)
+        self.assertEqual([n.op for n in calls], ["exp", "__mul__", "__add__"])
+        self.assertIs(ev[graph.nodes[2]], kept)
+        self.assertEqual(graph.downstream([graph.inputs[0]]),
+                         [graph.nodes[0], graph.nodes[2], graph.nodes[5]])
+        # An unchanged interval stops the propagation
+        ev = graph.evaluate(Interval(1, 2), Interval(0, 1))
+        kept = ev[exp]
+        self.assertEqual(ev.refresh([exp]), 1)
+        self.assertIs(ev[exp], kept)
+
+    def test_update(self):
+        """Test the change of some inputs"""
+        fn = lambda x, y, z: (x * y + z.exp(), (z * 2).sqrt() - x)
+        graph = trace(fn, 3)
+        x, y, z = Affine([1, 2]), Affine([3, 4]), Affine([1, 3])
+        ev = graph.evaluate(x, y, z)
+        self.assertEqual((ev.computed, ev.total), (len(graph), len(graph)))
+        mul = ev[graph.nodes[3]]
+        exp = ev[graph.nodes[4]]
+        y = Affine([3, 5])
+        self.assertEqual(ev.update({1: y}), 3)
+        self.assertEqual(ev.computed, 3)
+        self.assertEqual(ev.total, len(graph) + 3)
+        self.assertIsNot(ev[graph.nodes[3]], mul)
+        sqrt = ev[graph.nodes[7]]
+        self.assertEqual(ev.outputs[0].interval, fn(x, y, z)[0].interval)
+        # The nodes which do not depend on y are kept, with their symbols
+        self.assertIs(ev[graph.nodes[4]], exp)
+        self.assertIs(ev[graph.nodes[7]], sqrt)
+        x = Affine([0, 1])
+        self.assertEqual(ev.update({graph.inputs[0]: x}), 4)
+        self.assertIs(ev[graph.nodes[7]], sqrt)
+        self.assertEqual(ev.outputs[1].interval, fn(x, y, z)[1].interval)
+        # Same value: nothing is computed
+        self.assertEqual(ev.update({0: x, 1: y}), 0)
+        self.assertEqual(ev.update({}), 0)
+        with self.assertRaises(affapyError):
+            ev.update({graph.nodes[3]: x})
+        with self.assertRaises(IndexError):
+            ev.update({3: x})
+
+    def test_update_interval(self):
+        """Test that unchanged intervals stop the propagation"""
+        graph = trace(lambda x, y: abs(x) * y + 1, 2)
+        ev = graph.evaluate(Interval(-2, 1), Interval(1, 3))
+        # |x| is still [0, 2]: the product and the sum are kept
+        self.assertEqual(ev.update({0: Interval(-1, 2)}), 2)
+        self.assertEqual(ev.outputs[0], Interval(1, 7))
+        self.assertEqual(ev.update({1: Interval(0, 1)}), 3)
+        self.assertEqual(ev.outputs[0], Interval(1, 3))
+
+if __name__ == "__main__":
+    unittest.main()
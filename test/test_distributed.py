@@ -0,0 +1,100 @@
+"""Defining test cases for the distributed module"""
+
+from affapy.distributed import Coordinator, run_worker, _connect
+from affapy.parallel import _evalBoxes
+from affapy.error import affapyError
+from mpmath import mp
+import threading
+import unittest
+
+
+def fct(x1, x2):
+    return 1 + (x1*x1 - 2)*x2 + x1*x2*x2
+
+
+def fail(x):
+    if x.interval.inf < 0:
+        raise ValueError("negative box")
+    return x
+
+
+BOXES = [[[1 + i / 10, 1 + (i + 1) / 10], [2, 2.5]] for i in range(40)]
+
+
+class TestDistributed(unittest.TestCase):
+    """Test case used to test the coordinator and the workers"""
+
+    def test_evaluate(self):
+        """Test the evaluation with local workers"""
+        expected = _evalBoxes(fct, "aa", BOXES)
+        with Coordinator(fct, chunksize=6) as coord:
+            self.assertNotEqual(coord.address[1], 0)
+            coord.spawn(2)
+            self.assertEqual(coord.evaluate(BOXES), expected)
+            self.assertEqual(coord.evaluate(iter(BOXES[:5])), expected[:5])
+            stats = coord.stats()
+        self.assertEqual(stats["workers"], 2)
+        self.assertEqual(stats["pending"], 0)
+
+    def test_order(self):
+        """Test the order of the Taylor models sent to the workers"""
+        expected = _evalBoxes(fct, "tm", BOXES[:4], order=2)
+        self.assertNotEqual(expected, _evalBoxes(fct, "tm", BOXES[:4]))
+        with Coordinator(fct, model="tm", order=2, chunksize=2) as coord:
+            coord.spawn(1)
+            self.assertEqual(coord.evaluate(BOXES[:4]), expected)
+
+    def test_run_worker(self):
+        """Test a worker stopped by the shutdown of the coordinator"""
+        coord = Coordinator(fct, model="ia", chunksize=10, dps=30)
+        coord.start()
+        counts = []
+        thread = threading.Thread(target=lambda: counts.append(
+            run_worker(coord.address, coord.authkey, "local", poll=0.1)))
+        thread.start()
+        result = coord.evaluate(BOXES)
+        coord.shutdown()
+        thread.join(10)
+        with mp.workdps(30):
+            self.assertEqual(result, _evalBoxes(fct, "ia", BOXES))
+        self.assertEqual(counts, [4])
+
+    def test_lost_worker(self):
+        """Test that the chunks of a lost worker are given again"""
+        with Coordinator(fct, chunksize=8, lease=0.3) as coord:
+            taken = threading.Event()
+
+            def ghost():
+                # Takes a chunk and disappears without renewing its lease
+                scheduler = _connect(coord.address, coord.authkey)
+                while scheduler.take("ghost", 0.1) is None:
+                    pass
+                taken.set()
+
+            result = []
+            threading.Thread(target=ghost).start()
+            thread = threading.Thread(
+                target=lambda: result.extend(coord.evaluate(BOXES)))
+            thread.start()
+            self.assertTrue(taken.wait(10))
+            coord.spawn(2)
+            thread.join(30)
+            self.assertEqual(result, _evalBoxes(fct, "aa", BOXES))
+            self.assertGreaterEqual(coord.stats()["requeued"], 1)
+
+    def test_errors(self):
+        """Test the errors of the coordinator"""
+        self.assertRaises(affapyError, Coordinator, fct, "xx")
+        self.assertRaises(affapyError, Coordinator, fct, chunksize=0)
+        self.assertRaises(affapyError, Coordinator, lambda x: x)
+        with Coordinator(fail) as coord:
+            coord.spawn(1)
+            with self.assertRaises(affapyError):
+                coord.evaluate([[[1, 2]], [[-2, -1]]])
+        with Coordinator(fct, timeout=0.2) as coord:
+            with self.assertRaises(affapyError):
+                coord.evaluate(BOXES)
+
+
+if __name__ == "__main__":
+    unittest.main()
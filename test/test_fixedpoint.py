@@ -0,0 +1,94 @@
+"""Defining test cases for the fixedpoint module"""
+
+from affapy.dataflow import trace
+from affapy.fixedpoint import FixedPoint, msb, search
+from affapy.ia import Interval
+from affapy.error import affapyError
+import itertools
+import math
+import unittest
+
+
+def quantize(v, frac):
+    """Round v to frac fractional bits"""
+    return round(v * 2 ** frac) / 2 ** frac
+
+
+def simulate(graph, frac, inputs):
+    """Evaluate a graph with floats rounded to their formats"""
+    values = []
+    for node in graph.nodes:
+        args = [values[a.index] if a in graph.nodes else a
+                for a in node.args]
+        if node.op == "input":
+            v = inputs[graph.inputs.index(node)]
+        elif node.op == "sqr":
+            v = args[0] ** 2
+        elif node.op == "sqrt":
+            v = math.sqrt(args[0])
+        else:
+            v = getattr(float(args[0]), node.op)(*args[1:])
+        if node in frac:
+            v = quantize(v, frac[node])
+        values.append(v)
+    return [values[node.index] for node in graph.outputs]
+
+
+class TestFixedPoint(unittest.TestCase):
+    """Test case used to test the fixed-point formats"""
+
+    def test_msb(self):
+        """Test the number of integer bits of a range"""
+        self.assertEqual(msb(Interval(-4, 3.5)), 2)
+        self.assertEqual(msb(Interval(-4, 4)), 3)
+        self.assertEqual(msb(Interval(0, 0.3)), -1)
+        self.assertEqual(msb(Interval(-0.25, 0)), -2)
+        self.assertIsNone(msb(Interval(0, 0)))
+        with self.assertRaises(affapyError):
+            msb(Interval(0, math.inf))
+
+    def test_error(self):
+        """Test that the errors enclose the errors of the rounding"""
+        fn = lambda x, y: (x * y - 2 * x + y.sqr() / 4, (x + 2).sqrt())
+        graph = trace(fn, 2)
+        box = [[-1, 1], [0, 4]]
+        fp = FixedPoint(graph, box, 4)
+        errors = [fp.error(node) for node in graph.outputs]
+        self.assertGreater(errors[0], 0.05)
+        for x, y in itertools.product([-1, -0.3, 0.55, 1],
+                                      [0, 1.1, 2.9, 4]):
+            exact = simulate(graph, {}, [x, y])
+            quantized = simulate(graph, fp.frac, [x, y])
+            for e, q, bound, node in zip(exact, quantized, errors,
+                                         graph.outputs):
+                self.assertLessEqual(abs(q - e), bound)
+                self.assertIn(q, fp.range(node))
+
+    def test_update(self):
+        """Test the incremental update of the formats"""
+        graph = trace(lambda x: (x * 3).exp() + x.sqr(), 1)
+        fp = FixedPoint(graph, [[0, 1]], {graph.nodes[1]: 8})
+        self.assertEqual(fp.error(graph.nodes[0]), 0)
+        self.assertEqual(fp.update({graph.nodes[1]: 4}), 3)
+        self.assertEqual(fp.update({graph.nodes[1]: 4}), 0)
+        self.assertEqual(fp.update({graph.inputs[0]: 10}), len(graph))
+        self.assertEqual(fp.error(graph.inputs[0]), 2 ** -11)
+        self.assertEqual(fp.formats()[graph.nodes[1]], (2, 4))
+
+    def test_search(self):
+        """Test the search of the word lengths"""
+        graph = trace(lambda x, y: x * y - 2 * x, 2)
+        fp = search(graph, [[-1, 1], [0, 4]], error=1e-3)
+        self.assertLessEqual(fp.error(graph.outputs[0]), 1e-3)
+        uniform = FixedPoint(graph, [[-1, 1], [0, 4]], max(fp.frac.values()))
+        self.assertLessEqual(fp.bits(), uniform.bits())
+        for node in fp.signals():
+            fp.update({node: fp.frac[node] - 1})
+            self.assertGreater(fp.error(graph.outputs[0]), 1e-3)
+            fp.update({node: fp.frac[node] + 1})
+        with self.assertRaises(affapyError):
+            search(graph, [[-1, 1], [0, 4]], error=1e-30, max_frac=20)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+"""Defining test cases for the hybrid module"""
+
+from affapy.hybrid import HybridEvaluator, Crossover, learned
+from affapy.aa import Affine
+from affapy.ia import Interval
+from affapy.error import affapyError
+import math
+import unittest
+
+
+def fct(x):
+    return x*x - 2*x
+
+
+# Boxes centered at 1 with half widths from 1e-6 to 1e-2
+BOXES = [[[1 - w, 1 + w]] for w in [10 ** (-6 + k / 50) for k in range(200)]]
+
+
+class TestHybrid(unittest.TestCase):
+    """Test case used to test the hybrid IA/AA evaluation"""
+
+    def test_evaluate(self):
+        """Test the learned crossover and the enclosures"""
+        # IA width ~ 4 * box width, AA width ~ box width ** 2 / 2: IA is
+        # accurate for the boxes narrower than 2.5e-4
+        ev = HybridEvaluator(fct, atol=1e-3, rtol=0,
+                             crossover=Crossover())
+        itvs = ev.evaluate(BOXES)
+        width = ev.crossover.width()
+        self.assertTrue(1e-4 < width < 1e-3)
+        self.assertEqual(sum(ev.counts.values()), len(BOXES))
+        self.assertTrue(ev.counts["aa"] > ev.counts["fallback"] > 0)
+        self.assertTrue(ev.counts["ia"] > 0)
+        for box, itv in zip(BOXES, itvs):
+            lo, hi = box[0]
+            self.assertTrue(fct(lo) in itv and -1 in itv)
+            self.assertTrue(itv.width() <= 1e-3)
+        itv, model = ev.evaluate_box([[1 - 1e-6, 1 + 1e-6]])
+        self.assertEqual(model, "ia")
+        self.assertEqual(ev.evaluate_box([[0, 2]])[1], "aa")
+
+    def test_shared(self):
+        """Test the crossover shared by the evaluators of a function"""
+        ev = HybridEvaluator(fct, atol=1e-3, rtol=0)
+        self.assertIs(ev.crossover, learned(fct))
+        self.assertIs(HybridEvaluator(fct).crossover, ev.crossover)
+        self.assertIsNot(learned(abs), learned(fct))
+
+    def test_explore(self):
+        """Test the IA trials of the boxes wider than the crossover"""
+        crossover = Crossover(min_samples=1)
+        crossover.record(1e-9, False)
+        self.assertEqual(crossover.width(), math.ldexp(1, -30))
+        ev = HybridEvaluator(fct, crossover=crossover, explore=4)
+        for _ in range(8):
+            ev.evaluate_box([[1, 1.5]])
+        # IA is not accurate on [1, 1.5] (width 2.25 > 0.5)
+        self.assertEqual(ev.counts, {"ia": 0, "fallback": 2, "aa": 6})
+        self.assertEqual(crossover.bins[-1], [0, 2])
+        # IA is accurate again on the small boxes: the crossover moves
+        for _ in range(12):
+            crossover.record(1e-9, True)
+        self.assertEqual(crossover.width(), 0.5)
+        ev = HybridEvaluator(fct, crossover=Crossover(), explore=0)
+        self.assertEqual(ev.evaluate([[[1, 2]], [[1, 1]]]),
+                         [fct(Affine([1, 2])).interval, Interval(-1, -1)])
+        self.assertEqual(ev.counts, {"ia": 1, "fallback": 1, "aa": 0})
+
+    def test_crossover(self):
+        """Test the statistics of a crossover"""
+        crossover = Crossover()
+        self.assertEqual(crossover.ratio(), 0)
+        crossover.timing("ia", 1)
+        crossover.timing("aa", 4)
+        crossover.timing("aa", 2)
+        self.assertEqual(crossover.ratio(), 1 / 3)
+        for k in range(4):
+            crossover.record(0.3, k == 0)
+            crossover.record(0.01, True)
+        self.assertEqual(crossover.bins, {-2: [1, 4], -7: [4, 4]})
+        self.assertEqual(crossover.width(), 0.25)
+        self.assertTrue(crossover.use_ia(0.2))
+        self.assertFalse(crossover.use_ia(0.25))
+        crossover.record(0.3, True)
+        self.assertEqual(crossover.width(), math.inf)
+
+    def test_errors(self):
+        """Test the invalid arguments"""
+        self.assertRaises(affapyError, HybridEvaluator, fct, atol=-1)
+        self.assertRaises(affapyError, HybridEvaluator, fct, explore=-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
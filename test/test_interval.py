@@ -3,7 +3,9 @@
 from affapy.ia import Interval
 from affapy.aa import Affine
 from affapy.precision import precision
+from affapy.error import affapyError
 import unittest
+import pickle
 from mpmath import sqrt, log, exp, sin, cos, mp, pi
 from math import ceil, floor
 
@@ -191,12 +193,44 @@ class TestInterval(unittest.TestCase):
         """Test 'minTrigo' function from class Interval"""
         self.assertTrue(Interval(pi, 2 * pi)
                         in Interval(5 * pi, 6 * pi).minTrigo())
-        self.assertTrue(Interval(-pi, 2 * pi).minTrigo() in Interval(-pi, pi))
+        self.assertTrue(Interval(-pi, 2 * pi).minTrigo()
+                        in Interval(pi, 3 * pi))
         self.assertTrue(Interval(0, 2 * pi)
                         in Interval(0, 3 * pi).minTrigo())
         self.assertTrue(Interval(0, 2 * pi)
                         in Interval(-2 * pi, 2 * pi).minTrigo())
 
+    def test_hash_interval(self):
+        """Test the hash and the immutability of class Interval"""
+        x = Interval(1, 2)
+        y = Interval("1.0", "2.0")
+        self.assertEqual(hash(x), hash(y))
+        self.assertEqual(len({x, y, Interval(1, 3)}), 2)
+        # Other types are different, as for the built-in types
+        self.assertFalse(x == 1)
+        self.assertTrue(x != "x")
+        self.assertTrue(x in [0, x])
+        self.assertEqual(len({x, hash(x)}), 2)
+        self.assertEqual({x: 1}[pickle.loads(pickle.dumps(y))], 1)
+        self.assertTrue(x.copy() is x)
+        with self.assertRaises(affapyError):
+            x.inf = 0
+        with self.assertRaises(affapyError):
+            x.sup = 3
+
+    def test_truediv_rounding(self):
+        """Test the outward rounding of the inverse of an interval"""
+        x = Interval(1, 1) / Interval(3, 6)
+        with mp.workdps(40):
+            self.assertTrue(x.inf < mp.mpf(1) / 6)
+            self.assertTrue(mp.mpf(1) / 3 < x.sup)
+
+    def test_trigo_negative_interval(self):
+        """Test 'cos' and 'sin' functions on negative intervals"""
+        self.assertTrue(1 in Interval(-1, 0.5).cos())
+        self.assertTrue(Interval(-4, -4).sin().width() < 1e-10)
+        self.assertTrue(sin(-4) in Interval(-4, -4).sin())
+
     @precision(dps=50)
     def test_cos_interval(self):
         """Test 'cos' function from class Interval"""
@@ -422,6 +456,14 @@ class TestInterval(unittest.TestCase):
         self.assertTrue('0.5' in x)
         self.assertFalse('2.0' in x)
 
+    @precision(dps=50)
+    def test_pickle_interval(self):
+        """Test pickling of class Interval"""
+        for x in (Interval(-pi, mp.e), Interval(0, 0), Interval(-3, -1),
+                  Interval(-mp.inf, mp.inf)):
+            self.assertEqual(pickle.loads(pickle.dumps(x)), x)
+        x = pickle.loads(pickle.dumps(Interval(mp.nan, mp.nan)))
+        self.assertTrue(mp.isnan(x.inf) and mp.isnan(x.sup))
 
 
 if __name__ == "__main__":
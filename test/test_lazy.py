@@ -0,0 +1,72 @@
+"""Defining test cases for the lazy module"""
+
+from affapy import lazy
+from affapy.lazy import deferred, LazyAffine
+from affapy.aa import Affine
+from affapy.ia import Interval
+import pickle
+import unittest
+
+
+class TestLazy(unittest.TestCase):
+    """Test case used to test the lazy mode of the affine forms"""
+
+    def tearDown(self):
+        lazy.disable()
+
+    def test_fusion(self):
+        """Test that the linear operations are fused"""
+        x, z = Affine([1, 2]), Affine([3, 5])
+        ref = 3 * x - 2 * (x - z) + z / 4 - 1
+        with deferred():
+            y = 3 * x - 2 * (x - z) + z / 4 - 1
+            self.assertIsInstance(y, LazyAffine)
+            self.assertTrue(y.is_lazy())
+            self.assertEqual(len(y._terms), 2)
+            self.assertEqual(y.interval, ref.interval)
+            self.assertFalse(y.is_lazy())
+            self.assertEqual(y, ref)
+            self.assertEqual(hash(y), hash(ref))
+            self.assertEqual((x - x).interval, Interval(0, 0))
+            self.assertEqual(str(-x + 1), str(1 - x))
+        self.assertFalse(lazy.is_enabled())
+        self.assertNotIsInstance(x + z, LazyAffine)
+
+    def test_nonlinear(self):
+        """Test the nonlinear operations with lazy operands"""
+        x = Affine([1, 2])
+        ref = ((2 * x + 1) * (x - 3)).interval
+        with deferred():
+            y = 2 * x + 1
+            self.assertEqual((y * (x - 3)).interval, ref)
+            self.assertEqual(y.sqrt().interval, (2 * Affine([1, 2]) + 1)
+                             .sqrt().interval)
+            self.assertFalse(y.is_lazy())
+            z = pickle.loads(pickle.dumps(y - 1))
+            self.assertIs(type(z), Affine)
+            self.assertEqual(z.interval, Interval(2, 4))
+
+    def test_max_terms(self):
+        """Test that the large combinations are computed at once"""
+        forms = [Affine([0, k]) for k in range(1, lazy.MAX_TERMS + 2)]
+        with deferred():
+            s = Affine()
+            for x in forms:
+                s = s + x
+                if s.is_lazy():
+                    self.assertLessEqual(len(s._terms), lazy.MAX_TERMS)
+            self.assertEqual(len(s._terms), 2)
+        self.assertEqual(s.rad(), sum(range(1, lazy.MAX_TERMS + 2)) / 2)
+
+    def test_nested(self):
+        """Test the nested contexts"""
+        lazy.enable()
+        with deferred():
+            pass
+        self.assertTrue(lazy.is_enabled())
+        lazy.disable()
+        self.assertFalse(lazy.is_enabled())
+
+
+if __name__ == "__main__":
+    unittest.main()
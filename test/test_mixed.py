@@ -0,0 +1,82 @@
+"""Defining test cases for the mixed module"""
+
+from affapy.mixed import evaluate, sign
+from affapy.parallel import _evalBoxes
+from affapy.ia import Interval
+from affapy.error import affapyError
+from mpmath import mp
+import unittest
+
+
+def shift(x):
+    # The rounding of x + 1e17 in float64 hides x
+    return (x + 1e17) - 1e17
+
+
+BOXES = [[[1, 2]], [[100, 200]], [[3, 4]], [[-1, 1]], [[500, 600]]]
+
+
+class TestMixed(unittest.TestCase):
+    """Test case used to test the mixed-precision evaluation"""
+
+    def test_sign(self):
+        """Test the escalation of the ambiguous signs"""
+        res = evaluate(shift, BOXES, model="ia", decide=sign)
+        self.assertEqual(res.counts, [5, 3, 1])
+        self.assertEqual(res.escalated, [3, 1])
+        self.assertEqual(res.decisions, [1, 1, 1, None, 1])
+        self.assertEqual(res.levels, [113, "float64", 113, 256, "float64"])
+        self.assertEqual(res.unresolved, [3])
+        self.assertEqual(len(res.times), 3)
+        with mp.workprec(113):
+            self.assertEqual(res.enclosures[0],
+                             _evalBoxes(shift, "ia", BOXES[:1])[0])
+        for box, itv in zip(BOXES, res.enclosures):
+            self.assertTrue(isinstance(itv.inf, mp.mpf))
+            self.assertTrue(Interval(*box[0]) in itv)
+        self.assertEqual(sign(Interval(-2, -1)), -1)
+
+    def test_width(self):
+        """Test the escalation of the wide enclosures"""
+        boxes = [[[1, 1]], [[1e6, 1e6]], [[0.5, 0.5]]]
+        res = evaluate(shift, boxes, levels=(24, "float64", 80),
+                       model="ia", atol=1e-6)
+        self.assertEqual(res.counts, [3, 3, 2])
+        self.assertIsNone(res.decisions)
+        self.assertEqual(res.unresolved, [])
+        self.assertEqual(res.enclosures[1], Interval(1e6, 1e6))
+        res = evaluate(shift, boxes, levels=("float64", 80), model="ia",
+                       rtol=1e-3)
+        self.assertEqual(res.counts, [3, 2])
+        res = evaluate(lambda x: x * x, boxes, levels=(53, 80, 120))
+        self.assertEqual(res.counts, [3, 0, 0])
+        self.assertEqual(res.times[1:], [0., 0.])
+
+    def test_order(self):
+        """Test the order of the Taylor models"""
+        def fn(x):
+            return x.exp()
+
+        boxes = [[[0, 1]]]
+        for order in (1, 4):
+            res = evaluate(fn, boxes, levels=(53,), model="tm", order=order)
+            with mp.workprec(53):
+                self.assertEqual(res.enclosures,
+                                 _evalBoxes(fn, "tm", boxes, order))
+        self.assertNotEqual(
+            evaluate(fn, boxes, levels=(53,), model="tm",
+                     order=1).enclosures,
+            evaluate(fn, boxes, levels=(53,), model="tm").enclosures)
+
+    def test_errors(self):
+        """Test the invalid levels"""
+        self.assertRaises(affapyError, evaluate, shift, BOXES, levels=())
+        self.assertRaises(affapyError, evaluate, shift, BOXES,
+                          levels=("nope",))
+        self.assertRaises(affapyError, evaluate, shift, BOXES,
+                          levels=(1.5,))
+        self.assertRaises(affapyError, evaluate, shift, BOXES, model="xx")
+
+
+if __name__ == "__main__":
+    unittest.main()
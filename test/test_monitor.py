@@ -0,0 +1,61 @@
+"""Defining test cases for the monitor class"""
+
+from affapy.monitor import monitor
+from affapy.aa import Affine
+from affapy.error import affapyError, affapyNoiseWarning
+import unittest
+import warnings
+
+
+class TestMonitor(unittest.TestCase):
+    """Test case used to test the monitor of the noise symbols"""
+
+    def test_histogram(self):
+        """Test the histogram and the peak"""
+        with monitor() as m:
+            x, y = Affine([1, 2]), Affine([3, 4])
+            z = x * y
+        self.assertEqual(m.histogram, {1: 2, 2: 1})
+        self.assertEqual(m.peak, len(z.xi))
+        self.assertEqual(m.allocated, 3)
+        self.assertFalse(m.alerts)
+
+    def test_warning(self):
+        """Test the warning when a form has too many noise symbols"""
+        x = Affine([1, 2])
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            with monitor(max_symbols=4) as m:
+                for _ in range(10):
+                    x = x * Affine([0, 1])
+        self.assertEqual([a[0] for a in m.alerts], ["symbols"] * 3)
+        self.assertEqual(len(w), 3)
+        self.assertTrue(issubclass(w[0].category, affapyNoiseWarning))
+
+    def test_hook(self):
+        """Test the hook called by the alerts"""
+        events = []
+        counter = Affine._weightCount
+        with monitor(max_counter=counter + 5, max_rate=1, window=0,
+                     hook=lambda e, v, m: events.append(e)):
+            for _ in range(6):
+                Affine([0, 1])
+        self.assertIn("counter", events)
+        self.assertIn("rate", events)
+
+    def test_restore(self):
+        """Test that the methods are restored"""
+        init = Affine.__init__
+        m = monitor()
+        m.start()
+        self.assertIsNot(Affine.__init__, init)
+        m.stop()
+        self.assertIs(Affine.__init__, init)
+
+    def test_threshold(self):
+        """Test invalid thresholds"""
+        self.assertRaises(affapyError, monitor, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
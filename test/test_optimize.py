@@ -0,0 +1,57 @@
+"""Defining test cases for the minimize function"""
+
+from affapy.optimize import minimize
+from affapy.error import affapyError
+import unittest
+from mpmath import mp
+
+
+def fct(x):
+    return (x.sin()**2 * x.cos() - 4) / x.sqrt()
+
+
+def fct2(x, y):
+    return (x - 1) * (x - 1) + (y + 0.5) * (y + 0.5) + x * y
+
+
+class TestMinimize(unittest.TestCase):
+    """Test case used to test the minimize function"""
+
+    def test_minimize_affine(self):
+        """Test 'minimize' with the AA model"""
+        res = minimize(fct, [[1, 6]], model="aa", tol=1e-6)
+        exact = (mp.sin(1)**2 * mp.cos(1) - 4) / mp.sqrt(1)
+        self.assertTrue(res.converged)
+        self.assertTrue(res.lower <= exact <= res.upper)
+        self.assertTrue(res.upper - res.lower <= 1e-6)
+
+    def test_minimize_interval(self):
+        """Test 'minimize' with the IA model"""
+        res = minimize(fct, [[1, 6]], model="ia", tol=1e-6)
+        exact = (mp.sin(1)**2 * mp.cos(1) - 4) / mp.sqrt(1)
+        self.assertTrue(res.converged)
+        self.assertTrue(res.lower <= exact <= res.upper)
+
+    def test_minimize_2d(self):
+        """Test 'minimize' with two inputs"""
+        res = minimize(fct2, [[-3, 3], [-3, 3]], tol=1e-3)
+        exact = mp.mpf(-13) / 12
+        self.assertTrue(res.converged)
+        self.assertTrue(res.lower <= exact <= res.upper)
+        self.assertTrue(res.rate > 0)
+
+    def test_minimize_maxboxes(self):
+        """Test 'minimize' when the number of boxes is limited"""
+        res = minimize(fct2, [[-3, 3], [-3, 3]], model="ia", tol=0,
+                       maxboxes=50)
+        self.assertFalse(res.converged)
+        self.assertTrue(res.boxes <= 51)
+        self.assertTrue(res.lower <= mp.mpf(-13) / 12 <= res.upper)
+
+    def test_minimize_model(self):
+        """Test 'minimize' with an invalid model"""
+        self.assertRaises(affapyError, minimize, fct, [[1, 6]], "xx")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+"""Defining test cases for ParallelEvaluator class"""
+
+from affapy.parallel import ParallelEvaluator, _evalBoxes, _floatBox
+from affapy.ia import Interval
+from affapy.error import affapyError
+from mpmath import mp
+import sys
+import unittest
+
+
+def fct(x1, x2):
+    return 1 + (x1*x1 - 2)*x2 + x1*x2*x2
+
+
+BOXES = [[[1 + i / 10, 1 + (i + 1) / 10], [2, 2.5]] for i in range(40)]
+
+
+class TestParallelEvaluator(unittest.TestCase):
+    """Test case used to test ParallelEvaluator class"""
+
+    def test_evaluate(self):
+        """Test 'evaluate' against a sequential evaluation"""
+        expected = _evalBoxes(fct, "ia", BOXES)
+        evaluator = ParallelEvaluator(fct, model="ia", workers=2,
+                                      chunksize=7)
+        self.assertEqual(evaluator.evaluate(BOXES), expected)
+
+    def test_map(self):
+        """Test 'map' with an iterator of boxes"""
+        with ParallelEvaluator(fct, model="aa", workers=2) as evaluator:
+            chunks = list(evaluator.map(iter(BOXES)))
+        self.assertTrue(evaluator.chunksize >= 1)
+        starts = sorted(start for start, _ in chunks)
+        self.assertEqual(starts[0], 0)
+        self.assertEqual(sum(len(itvs) for _, itvs in chunks), len(BOXES))
+        for start, itvs in chunks:
+            for i, itv in enumerate(itvs):
+                self.assertTrue(isinstance(itv, Interval))
+                x1 = BOXES[start + i][0][0]
+                self.assertTrue(fct(x1, 2) in itv)
+
+    @unittest.skipIf(sys.version_info < (3, 8),
+                     "shared memory requires Python 3.8")
+    def test_shared(self):
+        """Test the exchange of the bounds in shared memory"""
+        expected = _evalBoxes(fct, "ia", BOXES)
+        evaluator = ParallelEvaluator(fct, model="ia", workers=2,
+                                      chunksize=7, shared=True)
+        self.assertEqual(evaluator.evaluate(BOXES), expected)
+        with ParallelEvaluator(fct, workers=2, chunksize=5, dps=40,
+                               shared=True) as evaluator:
+            result = evaluator.evaluate(iter(BOXES))
+            self.assertEqual(evaluator.evaluate([]), [])
+            with self.assertRaises(affapyError):
+                evaluator.evaluate([[[1, 2], [3, 4]], [[1, 2]]])
+        with mp.workdps(40):
+            expected = _evalBoxes(fct, "aa", BOXES)
+        for itv, exact in zip(result, expected):
+            self.assertTrue(itv.inf <= exact.inf and exact.sup <= itv.sup)
+            self.assertTrue(itv.width() < exact.width() + 1e-12)
+
+    def test_float_box(self):
+        """Test the outward rounding of the bounds of a box"""
+        self.assertEqual(_floatBox([[2, 1], (0.5, 0.75)]), [1, 2, 0.5, 0.75])
+        inf, sup = _floatBox([["0.1", "0.1"]])
+        with mp.workdps(30):
+            self.assertTrue(inf < mp.mpf("0.1") < sup)
+        self.assertEqual(_floatBox(Interval(1, 2)), [1, 2])
+        self.assertRaises(affapyError, _floatBox, [[1, 2, 3]])
+
+    def test_precision(self):
+        """Test the precision sent to the workers"""
+        evaluator = ParallelEvaluator(fct, dps=50, workers=1)
+        self.assertTrue(evaluator.prec > 160)
+
+    def test_model(self):
+        """Test the model checking"""
+        self.assertRaises(affapyError, ParallelEvaluator, fct, "xx")
+
+
+if __name__ == "__main__":
+    unittest.main()
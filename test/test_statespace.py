@@ -0,0 +1,95 @@
+"""Defining test cases for the statespace module"""
+
+from affapy.statespace import StateSpace
+from affapy.aa import Affine
+from affapy.ia import Interval
+from affapy.error import affapyError
+import itertools
+import random
+import unittest
+
+
+def recurrence(b, a, us):
+    """Return the outputs of the difference equation of a filter"""
+    ys = []
+    for n in range(len(us)):
+        y = sum(b[k] * us[n - k] for k in range(len(b)) if n >= k)
+        y -= sum(a[k] * ys[n - k] for k in range(1, len(a)) if n >= k)
+        ys.append(y)
+    return ys
+
+
+class TestStateSpace(unittest.TestCase):
+    """Test case used to test the class StateSpace"""
+
+    def test_from_tf(self):
+        """Test the state-space form of a transfer function"""
+        f = StateSpace.from_tf([1, 2], [2, -1, 0.5])
+        self.assertEqual(f.A, ((0.5, 1), (-0.25, 0)))
+        self.assertEqual(f.B, ((1.25,), (-0.125,)))
+        self.assertEqual(f.C, ((1, 0),))
+        self.assertEqual(f.D, ((0.5,),))
+        self.assertEqual(StateSpace.from_tf([3], [1]).states, 0)
+        with self.assertRaises(affapyError):
+            StateSpace.from_tf([1], [0, 1])
+        with self.assertRaises(affapyError):
+            StateSpace([[1]], [[1]], [[1, 0]], [[0]])
+
+    def test_enclosure(self):
+        """Test that the outputs enclose the outputs of the recurrence"""
+        b, a = [0.2, 0.4, 0.2], [1, -0.5, 0.3]
+        f = StateSpace.from_tf(b, a)
+        outputs = list(f.simulate(itertools.repeat([-1, 1], 200),
+                                  symbols=4, period=3))
+        random.seed(0)
+        for _ in range(20):
+            us = [random.choice([-1, 1, random.uniform(-1, 1)])
+                  for _ in range(200)]
+            for y, ref in zip(outputs, recurrence(b, a, us)):
+                self.assertIn(ref, y)
+        self.assertLess(outputs[-1].sup, 1.5)
+        # The dependencies are kept: the peak is the l1 norm of the
+        # impulse response (1.3248...)
+        y = list(f.simulate(itertools.repeat([-1, 1], 200)))[-1]
+        self.assertIn(y, Interval(-1.3249, 1.3249))
+
+    def test_samples(self):
+        """Test the different types of samples"""
+        f = StateSpace.from_tf([1, -1], [1])
+        x = Affine([1, 2])
+        ys = list(f.simulate([x, x, Interval(0, 1), 2, "0.5"]))
+        self.assertIn(ys[0], Interval(1 - 1e-14, 2 + 1e-14))
+        self.assertIn(ys[1], Interval(-1e-14, 1e-14))
+        self.assertIn(Interval(-2, 0), ys[2])
+        self.assertIn(ys[3], Interval(1 - 1e-14, 2 + 1e-14))
+        self.assertIn(-1.5, ys[4])
+        with self.assertRaises(affapyError):
+            list(f.simulate([[1, 2, 3]]))
+        with self.assertRaises(affapyError):
+            list(f.simulate([[1, 2]], symbols=0))
+
+    def test_mimo(self):
+        """Test a filter with two inputs and two outputs"""
+        f = StateSpace([[0.5]], [[1, -1]], [[1], [2]], [[0, 0], [1, 0]])
+        ys = list(f.simulate([([0, 1], 1)] * 3, state=[2]))
+        self.assertIn(ys[0][0], Interval(2 - 1e-14, 2 + 1e-14))
+        self.assertIn(ys[0][1], Interval(4 - 1e-14, 5 + 1e-14))
+        self.assertIn(Interval(0, 1), ys[1][0])
+        with self.assertRaises(affapyError):
+            list(f.simulate([[1]]))
+
+    def test_bounded_symbols(self):
+        """Test that the states keep a bounded number of noise symbols"""
+        f = StateSpace.from_tf([0.5], [1, -0.9])
+        count = Affine._weightCount
+        for y in f.simulate(itertools.repeat([-1, 1], 2000), symbols=8,
+                            period=4):
+            pass
+        self.assertIn(Interval(-5, 5), y)
+        self.assertLess(y.sup, 5.01)
+        # An input and the rounding errors of the state and the output
+        self.assertLess(Affine._weightCount - count, 2000 * 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+"""Defining test cases for the stats module"""
+
+from affapy import stats
+from affapy.aa import Affine
+from affapy.ia import Interval
+import unittest
+
+
+class TestStats(unittest.TestCase):
+    """Test case used to test the statistics of the operations"""
+
+    def tearDown(self):
+        stats.disable()
+        stats.reset()
+
+    def test_collect(self):
+        """Test the statistics collected with the 'collect' class"""
+        x, y = Affine([1, 2]), Affine([3, 4])
+        with stats.collect() as c:
+            z = x * y + x
+            Interval(1, 2).exp()
+        self.assertEqual(c.stats["calls"]["Affine.__mul__"], 1)
+        self.assertEqual(c.stats["calls"]["Affine.__add__"], 1)
+        self.assertEqual(c.stats["calls"]["Interval.exp"], 1)
+        self.assertEqual(c.stats["symbols"], 1)
+        self.assertEqual(c.stats["peak_symbols"], len(z.xi))
+        self.assertTrue(c.stats["mpf"] >= 2 + len(z.xi))
+        self.assertTrue(c.stats["time"]["Affine.__mul__"] > 0)
+
+    def test_restore(self):
+        """Test that the methods are restored when disabled"""
+        mul, newxi = Affine.__mul__, Affine.__dict__["_getNewXi"]
+        with stats.collect():
+            self.assertIsNot(Affine.__mul__, mul)
+        self.assertIs(Affine.__mul__, mul)
+        self.assertIs(Affine.__dict__["_getNewXi"], newxi)
+
+    def test_global(self):
+        """Test the global statistics and nested collections"""
+        stats.enable()
+        self.assertTrue(stats.is_enabled())
+        x = Affine([1, 2])
+        with stats.collect() as c:
+            x.sqrt()
+        x.exp()
+        stats.disable()
+        x.log()
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot["calls"]["Affine.sqrt"], 1)
+        self.assertEqual(snapshot["calls"]["Affine.exp"], 1)
+        self.assertNotIn("Affine.log", snapshot["calls"])
+        self.assertNotIn("Affine.exp", c.stats["calls"])
+        self.assertEqual(snapshot["symbols"], 3)
+        stats.reset()
+        self.assertEqual(stats.snapshot()["calls"], {})
+
+    def test_decorator(self):
+        """Test the 'collect' class as a decorator"""
+        c = stats.collect()
+
+        @c
+        def fct(x):
+            return x * x
+
+        fct(Interval(1, 2))
+        self.assertEqual(c.stats["calls"]["Interval.__mul__"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
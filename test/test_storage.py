@@ -0,0 +1,104 @@
+"""Defining test cases for the storage module"""
+
+from affapy.storage import write, AffineFile, AffineBatch, to_csr
+from affapy.aa import Affine
+from affapy.error import affapyError
+from affapy.precision import precision
+import importlib.util
+import os
+import tempfile
+import unittest
+from mpmath import mp
+
+
+class TestStorage(unittest.TestCase):
+    """Test case used to test the storage of affine forms"""
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".aff")
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    @precision(dps=40)
+    def test_write_read(self):
+        """Test 'write' and the access to the forms of 'AffineFile'"""
+        x, y = Affine([1, 2]), Affine([mp.pi, 4])
+        forms = [x * y - 7, Affine(), x, Affine(x0=-5, xi={3: 0.25}),
+                 (x * y).inv() + 1e300]
+        self.assertEqual(write(self.path, forms), len(forms))
+        with AffineFile(self.path) as f:
+            self.assertEqual(len(f), len(forms))
+            self.assertEqual(f.nnz, sum(len(x.xi) for x in forms))
+            for form, read in zip(forms, f):
+                self.assertEqual(form, read)
+            self.assertEqual(f[-1], forms[-1])
+            self.assertEqual(f[1:3], forms[1:3])
+            self.assertRaises(IndexError, f.__getitem__, len(forms))
+
+    def test_batch(self):
+        """Test the conversions between affine forms and batches"""
+        forms = [Affine([i, i + 1]) * Affine([0, i]) for i in range(10)]
+        write(self.path, AffineBatch.fromAffine(forms))
+        with AffineFile(self.path) as f:
+            batch = f.batch(3, 7)
+            self.assertEqual(len(batch), 4)
+            self.assertEqual(batch.indptr[0], 0)
+            self.assertEqual(batch.toAffine(), forms[3:7])
+            self.assertEqual(len(f.batch(8, 100)), 2)
+            self.assertEqual(len(f.batch(5, 2)), 0)
+
+    def test_nan(self):
+        """Test the storage of special values"""
+        write(self.path, [Affine([-1, 1]).inv()])
+        with AffineFile(self.path) as f:
+            self.assertTrue(mp.isnan(f[0].x0))
+
+    def test_invalid_file(self):
+        """Test the opening of a file which is not an affapy file"""
+        with open(self.path, "wb") as f:
+            f.write(b"0" * 64)
+        self.assertRaises(affapyError, AffineFile, self.path)
+
+    def test_invalid_batch(self):
+        """Test the creation of an inconsistent batch"""
+        self.assertRaises(affapyError, AffineBatch, [1], [0, 2], [1], [1])
+
+    def test_to_csr(self):
+        """Test the export of affine forms as a CSR matrix"""
+        forms = [Affine(x0=1, xi={2: 0.5, 7: -3}), Affine(),
+                 Affine(x0=-4, xi={7: 1.25})]
+        for arg in (forms, AffineBatch.fromAffine(forms)):
+            indptr, symbols, coefs, centers = to_csr(arg)
+            self.assertEqual(list(indptr), [0, 2, 2, 3])
+            self.assertEqual(list(symbols), [2, 7, 7])
+            self.assertEqual(list(coefs), [0.5, -3.0, 1.25])
+            self.assertEqual(list(centers), [1.0, 0.0, -4.0])
+        self.assertRaises(affapyError, to_csr, forms, "float32")
+        # The magnitudes are rounded upward, and not cached by the forms
+        with mp.workprec(100):
+            third = mp.mpf(1) / 3
+            x = Affine(x0=0, xi={1: third, 2: -third})
+        for arg in ([x], AffineBatch.fromAffine([x])):
+            coefs = list(to_csr(arg)[2])
+            self.assertTrue(coefs[0] > third and coefs[1] < -third)
+        with self.assertRaises(AttributeError):
+            x._buffers
+
+    @unittest.skipUnless(importlib.util.find_spec("numpy"),
+                         "numpy is not installed")
+    def test_to_csr_numpy(self):
+        """Test the NumPy arrays of the CSR export"""
+        import numpy
+        x = Affine(x0=1, xi={2: mp.mpf(1) / 3})
+        indptr, symbols, coefs, centers = to_csr([x, x])
+        self.assertEqual(coefs.dtype, numpy.float64)
+        self.assertEqual(symbols.dtype, numpy.int64)
+        coefs = to_csr([x], "object")[2]
+        self.assertEqual(coefs.dtype, object)
+        self.assertEqual(coefs[0], mp.mpf(1) / 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
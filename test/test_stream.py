@@ -0,0 +1,156 @@
+"""Defining test cases for the stream module"""
+
+from affapy.stream import StreamEvaluator
+from affapy.parallel import ParallelEvaluator
+from affapy.dataflow import trace
+from affapy.aa import Affine
+from affapy.ia import Interval
+from affapy.error import affapyError
+import affapy.parallel
+import asyncio
+import unittest
+
+
+def power(u, i):
+    return u * i - i * i
+
+
+READINGS = [((230 + k / 10, 0.5), (2 + k / 100, 0.01)) for k in range(50)]
+
+
+class Sensor:
+    """Asynchronous stream of 5 readings with a pause after the third"""
+
+    def __init__(self):
+        self.k = 0
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.k == 5:
+            raise StopAsyncIteration
+        if self.k == 3:
+            await asyncio.sleep(0.2)
+        self.k += 1
+        return (self.k - 1, 0.5)
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class TestStreamEvaluator(unittest.TestCase):
+    """Test case used to test the StreamEvaluator class"""
+
+    def test_run(self):
+        """Test the enclosures and the range checks"""
+        checker = StreamEvaluator(lambda x: x * x - x, chunksize=4,
+                                  limits=(0, 1))
+        results = list(checker.run([(1, 0.1), 1.5, (0.1, 0.2),
+                                    Interval(2, 3), (5, 0)]))
+        self.assertEqual([r.index for r in results], list(range(5)))
+        x = Affine(interval=Interval(1, 1) + Interval(-0.1, 0.1))
+        self.assertEqual(results[0].enclosure, (x * x - x).interval)
+        self.assertEqual([r.status for r in results],
+                         ["unknown", "ok", "unknown", "alarm", "alarm"])
+        self.assertEqual([m.size for m in checker.metrics], [4, 1])
+        stats = checker.stats()
+        self.assertEqual((stats["readings"], stats["chunks"]), (5, 2))
+        self.assertTrue(stats["throughput"] > 0)
+        self.assertTrue(stats["max_latency"] >= stats["latency"] > 0)
+        self.assertIsNone(next(StreamEvaluator(abs).run([1])).status)
+
+    def test_inputs(self):
+        """Test a function of several readings, compiled or batched"""
+        expected = [power(Interval(230 + k / 10, 230 + k / 10)
+                          + Interval(-0.5, 0.5),
+                          Interval(2 + k / 100, 2 + k / 100)
+                          + Interval(-0.01, 0.01))
+                    for k in range(50)]
+        checker = StreamEvaluator(power, inputs=2, model="ia",
+                                  chunksize=8, history=3)
+        results = [r.enclosure for r in checker.run(iter(READINGS))]
+        self.assertEqual(results, expected)
+        self.assertEqual(len(checker.metrics), 3)
+        self.assertEqual(checker.metrics[-1].index, 6)
+        graph = trace(power, 2)
+        checker = StreamEvaluator(graph, inputs=2, model="ia")
+        self.assertEqual([r.enclosure for r in checker.run(READINGS)],
+                         expected)
+        with ParallelEvaluator(power, model="ia", workers=1,
+                               chunksize=4) as evaluator:
+            checker = StreamEvaluator(power, inputs=2, chunksize=16,
+                                      evaluator=evaluator)
+            self.assertEqual([r.enclosure for r in checker.run(READINGS)],
+                             expected)
+
+    def test_arun(self):
+        """Test an asynchronous stream with a maximal delay"""
+        async def collect(readings, checker):
+            results = []
+            async for r in checker.arun(readings):
+                results.append(r)
+            return results
+
+        checker = StreamEvaluator(lambda x: 2 * x, chunksize=10,
+                                  max_delay=0.05)
+        results = _run(collect(Sensor(), checker))
+        self.assertEqual([r.enclosure for r in results],
+                         [Interval(2 * k - 1, 2 * k + 1) for k in range(5)])
+        self.assertEqual([m.size for m in checker.metrics], [3, 2])
+        self.assertTrue(checker.metrics[0].latency < 0.2)
+        checker = StreamEvaluator(lambda x: 2 * x, chunksize=2)
+        results = _run(collect(range(5), checker))
+        self.assertEqual([r.index for r in results], list(range(5)))
+        self.assertEqual(checker.stats()["chunks"], 3)
+
+    def test_aclose(self):
+        """Test an asynchronous stream closed before its end"""
+        async def first(checker):
+            results = checker.arun(Sensor())
+            result = await results.__anext__()
+            await results.aclose()
+            rest = []
+            async for r in results:
+                rest.append(r)
+            return result, rest
+
+        checker = StreamEvaluator(lambda x: 2 * x, chunksize=2)
+        result, rest = _run(first(checker))
+        self.assertEqual(result.enclosure, Interval(-1, 1))
+        self.assertEqual(rest, [])
+
+    def test_order(self):
+        """Test the order of the Taylor models"""
+        def fn(x):
+            return x.exp()
+
+        box = (Interval(0, 1),)
+        for order in (1, 4):
+            checker = StreamEvaluator(fn, model="tm", order=order)
+            self.assertEqual(next(checker.run([Interval(0, 1)])).enclosure,
+                             affapy.parallel._evalBoxes(fn, "tm", [box],
+                                                        order)[0])
+
+    def test_errors(self):
+        """Test the invalid arguments and readings"""
+        self.assertRaises(affapyError, StreamEvaluator, abs, model="xx")
+        self.assertRaises(affapyError, StreamEvaluator, abs, chunksize=0)
+        self.assertRaises(affapyError, StreamEvaluator,
+                          trace(lambda x: (x, x), 1))
+        checker = StreamEvaluator(power, inputs=2)
+        with self.assertRaises(affapyError):
+            list(checker.run([((1, 0.1),)]))
+        with self.assertRaises(affapyError):
+            list(checker.run([((1, -0.1), (1, 0.1))]))
+        with self.assertRaises(affapyError):
+            list(checker.run([((1, 0.1, 2), (1, 0.1))]))
+
+
+if __name__ == "__main__":
+    unittest.main()
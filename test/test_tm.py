@@ -0,0 +1,123 @@
+"""Defining test cases for the tm module"""
+
+from affapy.tm import TaylorModel
+from affapy.aa import Affine
+from affapy.ia import Interval
+from affapy.error import affapyError
+from affapy.optimize import minimize
+from affapy.parallel import ParallelEvaluator, _evalBoxes
+from affapy import box
+import mpmath
+import unittest
+
+
+def example4(x):
+    return (x.sin()**2 * x.cos() - 4) / x.sqrt()
+
+
+class TestTaylorModel(unittest.TestCase):
+    """Test case used to test the class TaylorModel"""
+
+    def assertEncloses(self, fn, ref, a, b, order=6, n=50):
+        """Check that fn encloses ref at sampled points of [a, b]"""
+        res = fn(TaylorModel(Interval(a, b), order=order)).interval
+        for i in range(n + 1):
+            x = mpmath.mpf(a) + (mpmath.mpf(b) - a) * i / n
+            self.assertIn(ref(x), res)
+        return res
+
+    def test_init(self):
+        """Test the constructor"""
+        x = TaylorModel([1, 3])
+        self.assertEqual(x.poly[()], 2)
+        self.assertEqual(x.interval, Interval(1, 3))
+        self.assertEqual(x.order, 5)
+        y = TaylorModel(poly={(): 2}, rem=Interval(-1, 1))
+        self.assertEqual(y.interval, Interval(1, 3))
+        self.assertEqual(TaylorModel().interval, Interval(0, 0))
+        self.assertNotEqual(set(x.poly), set(TaylorModel([1, 3]).poly))
+        with self.assertRaises(affapyError):
+            TaylorModel([1, 3], order=0)
+        with self.assertRaises(affapyError):
+            TaylorModel(3)
+
+    def test_dependency(self):
+        """Test that the dependencies are kept"""
+        x = TaylorModel([1, 2])
+        self.assertEqual((x - x).interval, Interval(0, 0))
+        self.assertEqual((x * x - x.sqr()).interval, Interval(0, 0))
+        self.assertIn(Interval(3, 3), (x * x - 2 * x + 4).interval
+                      + Interval(-1e-10, 1e-10))
+
+    def test_arithmetic(self):
+        """Test the operators with scalars and intervals"""
+        x = TaylorModel([1, 2])
+        self.assertEqual((x + 1).interval, Interval(2, 3))
+        self.assertEqual((1 - x).interval, Interval(-1, 0))
+        self.assertIn(Interval(1, 4), (x * Interval(1, 2)).interval)
+        self.assertIn(Interval(0.5, 1), (1 / x).interval)
+        self.assertIn(Interval(1, 8), (x ** 3).interval)
+        self.assertIn(1, abs(-x))
+        with self.assertRaises(affapyError):
+            x + Affine([1, 2])
+        self.assertFalse(x == 1)
+        self.assertTrue(x != Interval(1, 2))
+        self.assertTrue(x == x and x != x + 1)
+        self.assertTrue(x in [0, x])
+
+    def test_functions(self):
+        """Test that the elementary functions enclose their values"""
+        self.assertEncloses(lambda x: x.exp(), mpmath.exp, -1, 2)
+        self.assertEncloses(lambda x: x.log(), mpmath.log, 1, 3)
+        self.assertEncloses(lambda x: x.sqrt(), mpmath.sqrt, 1, 4)
+        self.assertEncloses(lambda x: x.inv(), lambda t: 1 / t, 1, 2)
+        self.assertEncloses(lambda x: x.sin(), mpmath.sin, -1, 2)
+        self.assertEncloses(lambda x: x.cos(), mpmath.cos, -1, 2)
+        self.assertEncloses(lambda x: x.tan(), mpmath.tan, 0, 1)
+        self.assertEncloses(lambda x: x.tanh(), mpmath.tanh, -1, 1)
+        self.assertEncloses(
+            example4,
+            lambda t: (mpmath.sin(t)**2 * mpmath.cos(t) - 4) / mpmath.sqrt(t),
+            1, 6)
+
+    def test_domain(self):
+        """Test the functions outside of their domain"""
+        self.assertTrue(mpmath.isnan(
+            TaylorModel([-1, 1]).log().interval.inf))
+        self.assertTrue(mpmath.isnan(
+            TaylorModel([-1, 1]).inv().interval.inf))
+        self.assertIn(Interval(0, 1), TaylorModel([0, 1]).sqrt().interval)
+
+    def test_tighter(self):
+        """Test that the Taylor models are tighter than affine forms"""
+        tm = example4(TaylorModel([1, 2], order=10)).interval
+        aa = example4(Affine([1, 2])).interval
+        self.assertIn(tm, aa)
+        self.assertLess(tm.width(), aa.width())
+        self.assertLess(tm.width(), 0.546)
+
+    def test_box(self):
+        """Test the model tm of the box module"""
+        args = box.inputs(box.normalize([[1, 2], [3, 4]]), "tm")
+        self.assertIsInstance(args[0], TaylorModel)
+        self.assertIn(Interval(3, 8), box.bounds(args[0] * args[1]))
+
+    def test_order(self):
+        """Test the order of the Taylor models of the box evaluations"""
+        args = box.inputs(box.normalize([[1, 2]]), "tm", order=8)
+        self.assertEqual(args[0].order, 8)
+        res = minimize(lambda x: x * x - x, [[-1, 2]], model="tm",
+                       tol=1e-3, order=2)
+        self.assertTrue(res.lower <= -0.25 <= res.upper)
+        self.assertRaises(affapyError, minimize, example4, [[1, 2]],
+                          model="tm", order=0)
+        boxes = [[[1, 2]], [[2, 3]]]
+        with ParallelEvaluator(example4, model="tm", workers=1,
+                               order=2) as evaluator:
+            itvs = evaluator.evaluate(boxes)
+        self.assertEqual(itvs, _evalBoxes(example4, "tm", boxes, order=2))
+        self.assertNotEqual(itvs, _evalBoxes(example4, "tm", boxes))
+
+
+if __name__ == "__main__":
+    unittest.main()